@@ -5,11 +5,12 @@ Contains all API endpoint modules
 """
 
 from flask import Blueprint
-from app.api.internships import get_internships, get_internship_by_id
+from app.api.internships import get_internships, get_internship_by_id, search_internships
 from app.api.recommendations import (
     get_candidate_recommendations,
     get_internship_recommendations,
     get_candidate_internship_match,
+    get_candidate_internship_matches,
 )
 from app.api.auth import signup, login, logout, check_login_status
 from app.api.profiles import create_or_update_profile, get_profile_by_username, get_profile_by_candidate_id
@@ -53,6 +54,11 @@ def internships_endpoint():
     """Get all internships"""
     return get_internships()
 
+@api_bp.route('/internships/search', methods=['GET'])
+def internships_search_endpoint():
+    """Search internships by free text"""
+    return search_internships()
+
 @api_bp.route('/internships/<internship_id>', methods=['GET'])
 def internship_by_id_endpoint(internship_id):
     """Get specific internship by ID"""
@@ -80,6 +86,11 @@ def candidate_internship_match_endpoint(candidate_id, internship_id):
     """Get match score for one internship for a candidate"""
     return get_candidate_internship_match(candidate_id, internship_id)
 
+@api_bp.route('/recommendations/<candidate_id>/match', methods=['POST'])
+def candidate_internship_matches_endpoint(candidate_id):
+    """Get match scores for several internships for a candidate"""
+    return get_candidate_internship_matches(candidate_id)
+
 # Register authentication routes
 @api_bp.route('/auth/signup', methods=['POST'])
 def signup_endpoint():
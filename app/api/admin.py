@@ -9,6 +9,8 @@ from flask import jsonify
 from app.core.database import db_manager
 from app.utils.logger import app_logger
 from app.utils.response_helpers import success_response, error_response
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.single_flight import single_flight_stats
 
 import os
 from app.config import get_config
@@ -26,7 +28,9 @@ def db_stats():
           "internships": 0,
           "login_info": 0,
           "skills_synonyms": 0
-        }
+        },
+        "recommendation_cache": {"entries", "bytes", "hits", "misses", "hit_rate", ...},
+        "single_flight": {"<group>": {"executions", "coalesced", "coalesced_rate", ...}}
       }
     """
     try:
@@ -47,7 +51,9 @@ def db_stats():
                     "internships": 0,
                     "login_info": 0,
                     "skills_synonyms": 0
-                }
+                },
+                "recommendation_cache": recommendation_cache.stats(),
+                "single_flight": single_flight_stats(),
             })
 
         def _count(name: str) -> int:
@@ -67,7 +73,9 @@ def db_stats():
         return success_response({
             "database": "connected",
             "atlas_only": atlas_only,
-            "counts": counts
+            "counts": counts,
+            "recommendation_cache": recommendation_cache.stats(),
+            "single_flight": single_flight_stats(),
         })
     except Exception as e:
         app_logger.error(f"/api/admin/db-stats error: {e}")
@@ -15,6 +15,7 @@ from datetime import datetime
 from app.core.database import db_manager
 from app.utils.jwt_auth import token_required, get_current_user
 from app.utils.logger import app_logger
+from app.utils.recommendation_cache import invalidate_candidate
 from app.utils.response_helpers import success_response, error_response
 
 
@@ -67,6 +68,8 @@ def add_bookmark(internship_id):
             {"$setOnInsert": {"created_at": datetime.utcnow()}},
             upsert=True,
         )
+        # Bookmarked internships are always re-ranked
+        invalidate_candidate(candidate_id)
 
         return success_response({"internship_id": str(internship_id), "bookmarked": True})
     except Exception as e:
@@ -91,6 +94,7 @@ def remove_bookmark(internship_id):
             return error_response("Database connection failed", 500)
 
         col.delete_one({"candidate_id": str(candidate_id), "internship_id": str(internship_id)})
+        invalidate_candidate(candidate_id)
         return success_response({"internship_id": str(internship_id), "bookmarked": False})
     except Exception as e:
         app_logger.error(f"Error removing bookmark {internship_id}: {e}")
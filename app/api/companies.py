@@ -10,6 +10,7 @@ from app.utils.response_helpers import success_response, error_response
 from app.utils.error_handler import handle_errors
 from app.utils.company_match_scorer import CompanyMatchScorer
 from app.utils.jwt_auth import get_current_user
+from app.utils.catalog_snapshot import catalog_store, hydrate_internships
 
 companies_bp = Blueprint('companies', __name__)
 db = DatabaseManager()
@@ -160,22 +161,27 @@ def get_company(company_id):
     Includes full company profile and associated internships
     """
     try:
-        # Get company by ID
-        companies = load_data('companies', use_cache=False) or []
-        companies = [c for c in companies if c.get('company_id') == company_id]
+        # Get company by ID (from the in-memory catalog snapshot)
+        catalog = catalog_store.snapshot()
+        company = catalog.company(company_id)
         
-        if not companies:
+        if company is None:
             return error_response(f"Company with ID {company_id} not found", 404)
         
-        company = companies[0]
+        # Snapshot documents are shared and read-only
+        company = dict(company)
         
         # Get associated internships
         internship_ids = company.get('internship_ids', [])
         internships = []
         
         if internship_ids:
-            all_internships = load_data('internships', use_cache=False) or []
-            internships = [i for i in all_internships if i.get('internship_id') in internship_ids]
+            internships = catalog.find_internships(internship_ids)
+            # Snapshot internships are scoring projections; read the detail fields for these
+            try:
+                internships = hydrate_internships(internships)
+            except Exception as e:
+                app_logger.warning(f"[API] Could not read internship details: {e}")
         
         # Add internships to company data
         company['internships'] = internships
@@ -240,21 +246,26 @@ def get_company_by_name(company_name):
     """
     try:
         # Search for company by name (case-insensitive)
-        companies = load_data('companies', use_cache=False) or []
-        companies = [c for c in companies if c.get('name', '').lower() == company_name.lower()]
+        catalog = catalog_store.snapshot()
+        company = catalog.company_by_name(company_name)
         
-        if not companies:
+        if company is None:
             return error_response(f"Company '{company_name}' not found", 404)
         
-        company = companies[0]
+        # Snapshot documents are shared and read-only
+        company = dict(company)
         
         # Get associated internships
         internship_ids = company.get('internship_ids', [])
         internships = []
         
         if internship_ids:
-            all_internships = load_data('internships', use_cache=False) or []
-            internships = [i for i in all_internships if i.get('internship_id') in internship_ids]
+            internships = catalog.find_internships(internship_ids)
+            # Snapshot internships are scoring projections; read the detail fields for these
+            try:
+                internships = hydrate_internships(internships)
+            except Exception as e:
+                app_logger.warning(f"[API] Could not read internship details: {e}")
         
         # Add internships to company data
         company['internships'] = internships
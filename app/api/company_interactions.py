@@ -10,6 +10,8 @@ from app.utils.response_helpers import success_response, error_response
 from app.utils.error_handler import handle_errors
 from app.utils.jwt_auth import token_required, get_current_user
 from app.utils.company_match_scorer import CompanyMatchScorer
+from app.utils.recommendation_cache import invalidate_candidate
+from app.utils.recommendation_materializer import schedule_materialization
 from app.utils.company_reputation import rebuild_and_save_company_reputation
 from bson import ObjectId
 from datetime import datetime
@@ -72,6 +74,8 @@ def like_company(company_id):
             rebuild_and_save_company_reputation(database, company_id)
         except Exception as rep_err:
             app_logger.warning(f"Error updating company reputation: {rep_err}")
+        invalidate_candidate(candidate_id)
+        schedule_materialization(candidate_id)
         
         # Recalculate match score for this user-company pair
         try:
@@ -149,6 +153,8 @@ def dislike_company(company_id):
             rebuild_and_save_company_reputation(database, company_id)
         except Exception as rep_err:
             app_logger.warning(f"Error updating company reputation: {rep_err}")
+        invalidate_candidate(candidate_id)
+        schedule_materialization(candidate_id)
         
         # Recalculate match score for this user-company pair
         try:
@@ -198,6 +204,8 @@ def remove_company_interaction(company_id):
                 rebuild_and_save_company_reputation(database, company_id)
             except Exception as rep_err:
                 app_logger.warning(f"Error updating company reputation: {rep_err}")
+            invalidate_candidate(candidate_id)
+            schedule_materialization(candidate_id)
 
             # Recalculate match score for this user-company pair now that interaction is removed
             updated_match_score = None
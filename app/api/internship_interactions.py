@@ -10,6 +10,8 @@ from app.utils.response_helpers import success_response, error_response
 from app.utils.error_handler import handle_errors
 from app.utils.jwt_auth import token_required, get_current_user
 from app.utils.company_match_scorer import CompanyMatchScorer
+from app.utils.recommendation_cache import invalidate_candidate
+from app.utils.recommendation_materializer import schedule_materialization
 from app.utils.preference_profile import rebuild_and_save_personal_preference_profile
 from bson import ObjectId
 from datetime import datetime
@@ -73,6 +75,8 @@ def like_internship(internship_id):
             rebuild_and_save_personal_preference_profile(database, candidate_id)
         except Exception as pref_err:
             app_logger.warning(f"Error updating personal preference profile: {pref_err}")
+        invalidate_candidate(candidate_id)
+        schedule_materialization(candidate_id)
         
         # Recalculate company match score (internship feedback affects company score)
         try:
@@ -179,6 +183,8 @@ def dislike_internship(internship_id):
             rebuild_and_save_personal_preference_profile(database, candidate_id)
         except Exception as pref_err:
             app_logger.warning(f"Error updating personal preference profile: {pref_err}")
+        invalidate_candidate(candidate_id)
+        schedule_materialization(candidate_id)
         
         # Recalculate company match score (internship feedback affects company score)
         try:
@@ -254,6 +260,8 @@ def remove_internship_interaction(internship_id):
                 rebuild_and_save_personal_preference_profile(database, candidate_id)
             except Exception as pref_err:
                 app_logger.warning(f"Error updating personal preference profile: {pref_err}")
+            invalidate_candidate(candidate_id)
+            schedule_materialization(candidate_id)
 
             # Recalculate company match score (internship feedback affects company score)
             try:
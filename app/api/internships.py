@@ -4,11 +4,14 @@ Internships API endpoints
 Direct implementation to replace legacy imports
 """
 
-from flask import jsonify
+from flask import jsonify, request
 from app.core.database import db_manager
 from app.utils.logger import app_logger
 from app.utils.response_helpers import success_response, error_response
 
+# Long detail fields left out of the catalog listing
+LIST_EXCLUDED_FIELDS = {'responsibilities': 0, 'eligibility': 0}
+
 def get_internships():
     """Get all internships"""
     try:
@@ -16,7 +19,9 @@ def get_internships():
         db = db_manager.get_db()
         if db is not None:
             try:
-                internships = list(db.internships.find({}))
+                # Detail-page fields are served by /internships/<id>; the list keeps
+                # description for the client-side search
+                internships = list(db.internships.find({}, LIST_EXCLUDED_FIELDS))
                 # Convert ObjectId to string for JSON serialization
                 for internship in internships:
                     if '_id' in internship:
@@ -56,4 +61,27 @@ def get_internship_by_id(internship_id):
             
     except Exception as e:
         app_logger.error(f"Error retrieving internship {internship_id}: {e}")
-        return error_response("Failed to retrieve internship", 500)
\ No newline at end of file
+        return error_response("Failed to retrieve internship", 500)
+
+
+def search_internships():
+    """Free-text search over internship titles, descriptions and responsibilities"""
+    try:
+        from app.api.recommendations import load_text_index, text_match_rows
+
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return error_response("Query parameter 'q' is required", 400)
+        limit = request.args.get('limit', default=10, type=int) or 10
+        limit = max(1, min(int(limit), 50))
+
+        index = load_text_index()
+        if index is None:
+            return error_response("Search unavailable", 503)
+        return success_response({
+            "query": query,
+            "results": text_match_rows(index.search(query, limit), "Matches your search"),
+        })
+    except Exception as e:
+        app_logger.error(f"Error searching internships for {request.args.get('q')!r}: {e}")
+        return error_response("Failed to search internships", 500)
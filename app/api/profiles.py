@@ -9,6 +9,8 @@ from app.core.database import db_manager
 from app.utils.logger import app_logger
 from app.utils.response_helpers import success_response, error_response
 from app.utils.jwt_auth import token_required, get_current_user
+from app.utils.recommendation_cache import invalidate_candidate
+from app.utils.recommendation_materializer import schedule_materialization
 import json
 import os
 import uuid
@@ -98,6 +100,8 @@ def create_or_update_profile():
                     upsert=True
                 )
                 app_logger.info(f"Upserted profile for {username} in MongoDB")
+                invalidate_candidate(candidate_id)
+                schedule_materialization(candidate_id)
             except Exception as e:
                 app_logger.warning(f"Failed to save profile to MongoDB: {e}")
         
@@ -5,11 +5,16 @@ Direct implementation to replace legacy imports
 """
 
 from flask import jsonify, request
+from app.config import Config
 from app.core.database import db_manager
 from app.utils.logger import app_logger
 from app.utils.response_helpers import success_response, error_response
 from app.utils.preference_profile import load_personal_preference_profile
-from app.utils.company_reputation import load_company_reputation
+from app.utils.company_signals import company_signals, load_company_ratings
+from app.utils.context_loader import load_concurrently
+from app.utils.recommendation_cache import recommendation_cache
+from app.utils.catalog_snapshot import catalog_store, hydrate_internships
+from app.utils.single_flight import single_flight
 try:
     from bson import ObjectId
 except Exception:  # pragma: no cover
@@ -17,11 +22,146 @@ except Exception:  # pragma: no cover
 try:
     # Prefer the improved ML logic
     from app.core.ml_model import get_recommendations as ml_get_recommendations
+    from app.core.ml_model import score_internship as ml_score_internship
+    from app.core.ml_model import score_internships as ml_score_internships
+    from app.core.feature_store import feature_store
+    from app.core.candidate_context import candidate_context_cache, compile_candidate_context
 except Exception as _e:
     ml_get_recommendations = None
+    ml_score_internship = None
+    ml_score_internships = None
+    feature_store = None
+    candidate_context_cache = None
+    compile_candidate_context = None
     app_logger.error(f"Failed to import ML recommender: {__name__}: {_e}")
+try:
+    # Optional (needs NumPy): skill vocabulary used by the vectorized engine and retrieval
+    from app.core.skill_index import warm_skill_vocabulary
+    from app.core.retrieval import retrieve_candidates
+except Exception:
+    warm_skill_vocabulary = None
+    retrieve_candidates = None
+try:
+    # Optional (needs NumPy): precomputed similar-internship lists and the text index
+    from app.core.similar_internships import similar_internships, load_neighbor_list
+    from app.core.text_index import text_index
+except Exception:
+    similar_internships = None
+    load_neighbor_list = None
+    text_index = None
+
+recommendation_flight = single_flight('recommendations')
+catalog_sync_flight = single_flight('catalog_sync')
+# Catalog snapshot version the feature store, text index and similar lists were last synced with
+_synced_catalog_version = None
+
+def build_candidate_context(candidate_id, candidate, internships, internship_interactions, preference_profile):
+    """Compiled scoring context for this version of the candidate (cached per candidate)."""
+    if candidate_context_cache is None or feature_store is None:
+        return None
+    try:
+        features_by_id = {f.key: f for f in feature_store.features_for(internships)}
+        return candidate_context_cache.get_or_compile(
+            candidate_id, candidate, features_by_id, internship_interactions, preference_profile
+        )
+    except Exception as e:
+        app_logger.warning(f"Could not compile candidate context for {candidate_id}: {e}")
+        return None
+
+
+def build_match_context(candidate_id, candidate, internships, interacted_features,
+                        internship_interactions, preference_profile):
+    """Compiled scoring context for scoring a few internships (match endpoints)."""
+    if candidate_context_cache is None or feature_store is None:
+        return None
+    try:
+        features_by_id = dict(interacted_features)
+        for feat in feature_store.features_for(internships):
+            features_by_id.setdefault(feat.key, feat)
+        return candidate_context_cache.get_or_compile(
+            candidate_id, candidate, features_by_id, internship_interactions, preference_profile
+        )
+    except Exception as e:
+        app_logger.warning(f"Could not compile candidate context for {candidate_id}: {e}")
+        return None
+
 
-def get_candidate_recommendations(candidate_id):
+def retrieve_scoring_pool(internships, context, internship_interactions, bookmarked_ids=()):
+    """Stage-1 candidate pool for large catalogs; the full catalog when it is small enough."""
+    pool_size = Config.RETRIEVAL_POOL_SIZE
+    if retrieve_candidates is None or context is None or pool_size <= 0 or len(internships) <= pool_size:
+        return internships
+    try:
+        # Liked and bookmarked internships are always re-ranked
+        always_include = [
+            iid for iid, it in (internship_interactions or {}).items()
+            if isinstance(it, dict) and it.get('type') == 'like'
+        ]
+        always_include.extend(bookmarked_ids or ())
+        return retrieve_candidates(internships, context, pool_size, always_include)
+    except Exception as e:
+        app_logger.warning(f"Candidate retrieval failed, scoring full catalog: {e}")
+        return internships
+
+
+def recommendation_cache_key(candidate_id, top_n, min_score, dedupe_org):
+    """Result cache key: candidate, query params and the catalog / global-signal versions."""
+    company_signals.snapshot()  # loads on first use, schedules reconciles
+    # Patches from single likes/dislikes/reviews are picked up at the next reconcile (<= ttl)
+    signals_version = company_signals.reconciled_version
+    # Sync first so a swapped-in snapshot never shares a key with results ranked from the old one;
+    # the feature store version additionally covers recompiles after skill synonym changes
+    catalog_version = synced_catalog_snapshot().version
+    features_version = feature_store.version if feature_store is not None else 0
+    return (str(candidate_id), top_n, float(min_score or 0.0), bool(dedupe_org),
+            catalog_version, features_version, signals_version)
+
+
+def rank_candidate_internships(candidate_id, inputs, top_n=None, min_score=0.0, dedupe_org=False,
+                               context=None, retrieve=True):
+    """ML ranking of the catalog in `inputs` (from load_recommendation_inputs) for one candidate.
+
+    With retrieve=False the whole catalog is scored, not just the retrieval pool.
+    """
+    candidate = inputs['candidate']
+    internships = inputs['internships']
+    internship_interactions = inputs['internship_interactions']
+    preference_profile = inputs['preference_profile']
+    # For list endpoint we keep existing global stats, but also supply persisted reputation
+    # for the companies present in the internships list.
+    company_reputation_map = inputs['company_signals'].reputation_scores(
+        i.get('company_id') for i in internships
+    )
+
+    if context is None:
+        context = build_candidate_context(
+            candidate_id, candidate, internships, internship_interactions, preference_profile
+        )
+    scoring_pool = internships
+    if retrieve:
+        scoring_pool = retrieve_scoring_pool(
+            internships, context, internship_interactions, inputs.get('bookmarked_ids')
+        )
+
+    return ml_get_recommendations(
+        candidate,
+        scoring_pool,
+        top_n=top_n,
+        company_interactions=inputs['company_interactions'],
+        company_ratings=inputs['company_ratings'],
+        internship_interactions=internship_interactions,
+        company_interaction_stats=inputs['company_interaction_stats'],
+        company_reason_stats=inputs['company_reason_stats'],
+        preference_profile=preference_profile,
+        company_reputation=company_reputation_map,
+        dedupe_org=dedupe_org,
+        # min_score is percent; ML expects percent threshold too.
+        min_score=min_score,
+        context=context,
+    )
+
+
+def get_candidate_recommendations(candidate_id, context=None):
     """Get recommendations for a specific candidate"""
     try:
         # Query params
@@ -34,394 +174,114 @@ def get_candidate_recommendations(candidate_id):
         # limit<=0 means "no cap" (return all)
         top_n = None if (limit is None or int(limit) <= 0) else int(limit)
 
-        # Load candidate profile
-        candidate = load_candidate_by_id(candidate_id)
-        if not candidate:
-            return error_response("Candidate not found", 404)
-        
-        # Load internships
-        internships = load_all_internships()
-        if not internships:
-            return error_response("No internships available", 404)
-        
-        # Load company interactions for this candidate + global stats
-        company_interactions = {}
-        company_ratings = {}
-        internship_interactions = {}
-        company_interaction_stats = {}
-        company_reason_stats = {}
-        try:
-            db = db_manager.get_db()
-            
-            # Get user's company interactions (like/dislike)
-            interactions_collection = db['company_interactions']
-            user_interactions = list(interactions_collection.find({'candidate_id': candidate_id}))
-            for interaction in user_interactions:
-                company_id = interaction.get('company_id')
-                interaction_type = interaction.get('interaction_type')
-                reason_tags = interaction.get('reason_tags', [])
-                if company_id and interaction_type:
-                    company_interactions[company_id] = {
-                        'type': interaction_type,
-                        'reason_tags': reason_tags
-                    }
-            
-            # Get user's internship interactions (like/dislike) - personal preferences
-            internship_interactions_collection = db['internship_interactions']
-            user_internship_interactions = list(internship_interactions_collection.find({'candidate_id': candidate_id}))
-            for interaction in user_internship_interactions:
-                internship_id = interaction.get('internship_id')
-                interaction_type = interaction.get('interaction_type')
-                reason_tags = interaction.get('reason_tags', [])
-                if internship_id and interaction_type:
-                    internship_interactions[internship_id] = {
-                        'type': interaction_type,
-                        'reason_tags': reason_tags
-                    }
-            
-            # Get company average ratings
-            reviews_collection = db['company_reviews']
-            pipeline = [
-                {'$group': {
-                    '_id': '$company_id',
-                    'average_rating': {'$avg': '$rating'}
-                }}
-            ]
-            rating_results = list(reviews_collection.aggregate(pipeline))
-            for result in rating_results:
-                company_id = result.get('_id')
-                avg_rating = result.get('average_rating')
-                if company_id and avg_rating:
-                    company_ratings[company_id] = round(avg_rating, 2)
-
-            # Global company like/dislike stats (affects all users)
-            try:
-                stats = list(db['company_interactions'].aggregate([
-                    {'$group': {
-                        '_id': {
-                            'company_id': '$company_id',
-                            'interaction_type': '$interaction_type'
-                        },
-                        'count': {'$sum': 1}
-                    }}
-                ]))
-                tmp = {}
-                for row in stats:
-                    key = row.get('_id') or {}
-                    cid = key.get('company_id')
-                    it = key.get('interaction_type')
-                    if not cid or not it:
-                        continue
-                    tmp.setdefault(cid, {'like': 0, 'dislike': 0})
-                    if it == 'like':
-                        tmp[cid]['like'] += int(row.get('count') or 0)
-                    elif it == 'dislike':
-                        tmp[cid]['dislike'] += int(row.get('count') or 0)
-
-                # Also expose stats by company name (normalized) to support internships that
-                # only have organization/company strings.
-                company_interaction_stats = dict(tmp)
-                try:
-                    companies = list(db['companies'].find({}, {'company_id': 1, 'name': 1}))
-                    for c in companies:
-                        cid = c.get('company_id')
-                        name = (c.get('name') or '').strip().lower()
-                        if cid in tmp and name:
-                            company_interaction_stats[name] = tmp[cid]
-                except Exception:
-                    pass
-            except Exception as e:
-                app_logger.warning(f"Could not compute global company interaction stats: {e}")
-
-            # Global company reason-tag stats (affects all users)
-            try:
-                rows = list(db['company_interactions'].aggregate([
-                    {'$match': {'reason_tags': {'$exists': True, '$ne': []}}},
-                    {'$unwind': '$reason_tags'},
-                    {'$group': {
-                        '_id': {
-                            'company_id': '$company_id',
-                            'interaction_type': '$interaction_type',
-                            'reason_tag': '$reason_tags'
-                        },
-                        'count': {'$sum': 1}
-                    }}
-                ]))
-                tmp_reason = {}
-                for row in rows:
-                    key = row.get('_id') or {}
-                    cid = key.get('company_id')
-                    it = key.get('interaction_type')
-                    tag = key.get('reason_tag')
-                    if not cid or not it or not tag:
-                        continue
-                    tmp_reason.setdefault(cid, {'like': {}, 'dislike': {}})
-                    if it == 'like':
-                        tmp_reason[cid]['like'][tag] = tmp_reason[cid]['like'].get(tag, 0) + int(row.get('count') or 0)
-                    elif it == 'dislike':
-                        tmp_reason[cid]['dislike'][tag] = tmp_reason[cid]['dislike'].get(tag, 0) + int(row.get('count') or 0)
-
-                company_reason_stats = dict(tmp_reason)
-                # Also expose by normalized company name for string-only internships
-                try:
-                    companies = list(db['companies'].find({}, {'company_id': 1, 'name': 1}))
-                    for c in companies:
-                        cid = c.get('company_id')
-                        name = (c.get('name') or '').strip().lower()
-                        if cid in tmp_reason and name:
-                            company_reason_stats[name] = tmp_reason[cid]
-                except Exception:
-                    pass
-            except Exception as e:
-                app_logger.warning(f"Could not compute global company reason stats: {e}")
-                    
-        except Exception as e:
-            app_logger.warning(f"Could not load company/internship interactions/ratings: {e}")
-        
-        # Generate recommendations using improved ML logic
-        recommendations = []
-        if ml_get_recommendations is not None:
-            preference_profile = None
-            company_reputation_map = {}
-            try:
-                db = db_manager.get_db()
-                preference_profile = load_personal_preference_profile(db, candidate_id)
-                # For list endpoint we keep existing global stats, but also supply persisted reputation.
-                # Build a small map for companies present in the internships list.
-                if db is not None:
-                    try:
-                        company_ids = list({str(i.get('company_id') or '') for i in internships if i.get('company_id')})
-                        company_ids = [c for c in company_ids if c]
-                        for cid in company_ids:
-                            rep = load_company_reputation(db, cid)
-                            if rep and rep.get('score') is not None:
-                                company_reputation_map[cid] = float(rep.get('score'))
-                    except Exception:
-                        pass
-            except Exception:
-                preference_profile = None
-                company_reputation_map = {}
-
-            ml_recs = ml_get_recommendations(
-                candidate, 
-                internships, 
-                top_n=top_n,
-                company_interactions=company_interactions,
-                company_ratings=company_ratings,
-                internship_interactions=internship_interactions,
-                company_interaction_stats=company_interaction_stats,
-                company_reason_stats=company_reason_stats,
-                preference_profile=preference_profile,
-                company_reputation=company_reputation_map,
-                dedupe_org=dedupe_org,
-                # min_score is percent; ML expects percent threshold too.
-                min_score=min_score,
-            )
-            # Enrich with skills/description for UI compatibility
-            by_id = {i.get("internship_id"): i for i in internships}
-            for r in ml_recs:
-                base = by_id.get(r.get("internship_id"), {})
-                enriched = {
-                    **r,
-                    "skills_required": base.get("skills_required", r.get("skills_required", [])),
-                    "description": base.get("description", r.get("description", "")),
-                }
-                recommendations.append(enriched)
-        else:
-            # Fallback to simple overlap if ML import failed
-            recommendations = generate_recommendations(candidate, internships)
-        
-        return success_response({
-            "candidate": candidate.get("name"),
-            "candidate_id": candidate.get("candidate_id"),
-            "recommendations": recommendations
-        })
+        if context is not None:
+            payload, info = compute_candidate_recommendations(candidate_id, top_n, min_score, dedupe_org, context)
+            return success_response(payload) if payload is not None else error_response(*info)
+
+        # Repeat views with nothing changed are served from the result cache
+        cache_key = recommendation_cache_key(candidate_id, top_n, min_score, dedupe_org)
+        cached = recommendation_cache.get(cache_key)
+        if cached is not None:
+            return success_response(cached)
+        cache_started = recommendation_cache.begin()
+
+        def _compute_and_cache():
+            payload, info = compute_candidate_recommendations(candidate_id, top_n, min_score, dedupe_org)
+            if payload is not None:
+                recommendation_cache.put(cache_key, payload, tags=info, started=cache_started)
+            return cache_started, payload, info
+
+        # Identical concurrent misses (parallel SPA calls) share one computation
+        started, payload, info = recommendation_flight.do(cache_key, _compute_and_cache)
+        if payload is not None and started != cache_started and recommendation_cache.changed_since(info, started):
+            # The shared computation began before a write to this candidate
+            started, payload, info = _compute_and_cache()
+        return success_response(payload) if payload is not None else error_response(*info)
         
     except Exception as e:
         app_logger.error(f"Error generating recommendations for {candidate_id}: {e}")
         return error_response("Failed to generate recommendations", 500)
 
 
-def get_candidate_internship_match(candidate_id, internship_id):
+def compute_candidate_recommendations(candidate_id, top_n, min_score, dedupe_org, context=None):
+    """(payload, cache tags) of a candidate's recommendations, or (None, (error message, status))."""
+    # Independent reads run concurrently; endpoint latency ~ the slowest one
+    inputs = load_recommendation_inputs(candidate_id)
+    candidate = inputs['candidate']
+    if not candidate:
+        return None, ("Candidate not found", 404)
+    internships = inputs['internships']
+    if not internships:
+        return None, ("No internships available", 404)
+
+    # Generate recommendations using improved ML logic
+    recommendations = []
+    if ml_get_recommendations is not None:
+        ml_recs = rank_candidate_internships(
+            candidate_id, inputs, top_n=top_n, min_score=min_score, dedupe_org=dedupe_org, context=context
+        )
+        # Enrich with skills/description for UI compatibility
+        recommendations = enrich_result_rows(ml_recs, internships)
+    else:
+        # Fallback to simple overlap if ML import failed
+        recommendations = generate_recommendations(candidate, internships)
+
+    payload = {
+        "candidate": candidate.get("name"),
+        "candidate_id": candidate.get("candidate_id"),
+        "recommendations": recommendations
+    }
+    return payload, (candidate_id, candidate.get("candidate_id"), candidate.get("_id"))
+
+
+def get_candidate_internship_match(candidate_id, internship_id, context=None):
     """Get match score for a specific internship for a candidate (not top-N limited)."""
     try:
-        candidate = load_candidate_by_id(candidate_id)
+        inputs = load_recommendation_inputs(candidate_id, internship_id=internship_id)
+        candidate = inputs['candidate']
         if not candidate:
             return error_response("Candidate not found", 404)
-
-        internship = load_internship_by_any_id(internship_id)
+        internship = inputs['internship']
         if not internship:
             return error_response("Internship not found", 404)
 
-        company_interactions, company_ratings, internship_interactions = load_candidate_context(candidate_id)
-
-        # Global company stats to keep scores consistent with list endpoint
-        company_interaction_stats = {}
-        company_reason_stats = {}
-        try:
-            db = db_manager.get_db()
-            if db is not None:
-                stats = list(db['company_interactions'].aggregate([
-                    {'$group': {
-                        '_id': {
-                            'company_id': '$company_id',
-                            'interaction_type': '$interaction_type'
-                        },
-                        'count': {'$sum': 1}
-                    }}
-                ]))
-                tmp = {}
-                for row in stats:
-                    key = row.get('_id') or {}
-                    cid = key.get('company_id')
-                    it = key.get('interaction_type')
-                    if not cid or not it:
-                        continue
-                    tmp.setdefault(cid, {'like': 0, 'dislike': 0})
-                    if it == 'like':
-                        tmp[cid]['like'] += int(row.get('count') or 0)
-                    elif it == 'dislike':
-                        tmp[cid]['dislike'] += int(row.get('count') or 0)
-                company_interaction_stats = dict(tmp)
-                try:
-                    companies = list(db['companies'].find({}, {'company_id': 1, 'name': 1}))
-                    for c in companies:
-                        cid = c.get('company_id')
-                        name = (c.get('name') or '').strip().lower()
-                        if cid in tmp and name:
-                            company_interaction_stats[name] = tmp[cid]
-                except Exception:
-                    pass
-
-                # Global company reason-tag stats
-                try:
-                    rows = list(db['company_interactions'].aggregate([
-                        {'$match': {'reason_tags': {'$exists': True, '$ne': []}}},
-                        {'$unwind': '$reason_tags'},
-                        {'$group': {
-                            '_id': {
-                                'company_id': '$company_id',
-                                'interaction_type': '$interaction_type',
-                                'reason_tag': '$reason_tags'
-                            },
-                            'count': {'$sum': 1}
-                        }}
-                    ]))
-                    tmp_reason = {}
-                    for row in rows:
-                        key = row.get('_id') or {}
-                        cid = key.get('company_id')
-                        it = key.get('interaction_type')
-                        tag = key.get('reason_tag')
-                        if not cid or not it or not tag:
-                            continue
-                        tmp_reason.setdefault(cid, {'like': {}, 'dislike': {}})
-                        if it == 'like':
-                            tmp_reason[cid]['like'][tag] = tmp_reason[cid]['like'].get(tag, 0) + int(row.get('count') or 0)
-                        elif it == 'dislike':
-                            tmp_reason[cid]['dislike'][tag] = tmp_reason[cid]['dislike'].get(tag, 0) + int(row.get('count') or 0)
-
-                    company_reason_stats = dict(tmp_reason)
-                    try:
-                        companies = list(db['companies'].find({}, {'company_id': 1, 'name': 1}))
-                        for c in companies:
-                            cid = c.get('company_id')
-                            name = (c.get('name') or '').strip().lower()
-                            if cid in tmp_reason and name:
-                                company_reason_stats[name] = tmp_reason[cid]
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        internship_interactions = inputs['internship_interactions']
 
         match_score = 0
         recommendation = None
 
-        if ml_get_recommendations is not None:
-            preference_profile = None
-            company_reputation_map = {}
-            try:
-                db = db_manager.get_db()
-                preference_profile = load_personal_preference_profile(db, candidate_id)
-                # Only need reputation for the target internship company (if present)
-                try:
-                    cid = internship.get('company_id')
-                    if cid:
-                        rep = load_company_reputation(db, str(cid))
-                        if rep and rep.get('score') is not None:
-                            company_reputation_map[str(cid)] = float(rep.get('score'))
-                except Exception:
-                    pass
-            except Exception:
-                preference_profile = None
-                company_reputation_map = {}
+        if ml_score_internship is not None:
+            preference_profile = inputs['preference_profile']
+            signals = inputs['company_signals']
 
-            # IMPORTANT: The ML model learns "reason" preferences from prior internship interactions.
-            # When scoring a single internship, we still need to include the interacted internships
-            # in the input list so it can learn location/skills/etc. patterns.
-            scoring_pool = [internship]
-            try:
-                interacted_ids = [str(i) for i in (internship_interactions or {}).keys() if i]
-                interacted_ids = list(dict.fromkeys(interacted_ids))
-                if interacted_ids:
-                    db = db_manager.get_db()
-                    if db is not None:
-                        interacted_docs = list(db['internships'].find(
-                            {'internship_id': {'$in': interacted_ids}},
-                            {
-                                'internship_id': 1,
-                                '_id': 1,
-                                'title': 1,
-                                'organization': 1,
-                                'company_id': 1,
-                                'location': 1,
-                                'sector': 1,
-                                'stipend': 1,
-                                'skills_required': 1,
-                                'description': 1,
-                                'is_beginner_friendly': 1,
-                                'duration': 1,
-                            }
-                        ))
-                        # Avoid duplicate of the target internship
-                        target_key = str(internship.get('internship_id') or '')
-                        for doc in interacted_docs:
-                            if doc.get('_id') is not None:
-                                doc['_id'] = str(doc['_id'])
-                            if doc.get('internship_id') and str(doc.get('internship_id')) == target_key:
-                                continue
-                            scoring_pool.append(doc)
-            except Exception:
-                pass
+            # The model learns location/skills/etc. patterns from prior internship interactions,
+            # so the interacted internships' features are needed (usually already compiled).
+            interacted_features = load_interacted_features(internship_interactions)
+            if context is None:
+                context = build_match_context(
+                    candidate_id, candidate, [internship], interacted_features,
+                    internship_interactions, preference_profile
+                )
 
-            ml_recs = ml_get_recommendations(
+            picked = ml_score_internship(
                 candidate,
-                scoring_pool,
-                top_n=None,
-                company_interactions=company_interactions,
-                company_ratings=company_ratings,
+                internship,
                 internship_interactions=internship_interactions,
-                company_interaction_stats=company_interaction_stats,
-                company_reason_stats=company_reason_stats,
+                interacted_features=interacted_features,
+                # Global company stats to keep scores consistent with list endpoint
+                company_interaction_stats=signals.interaction_stats,
+                company_reason_stats=signals.reason_stats,
+                company_ratings=signals.ratings,
+                # Only need reputation for the target internship company (if present)
+                company_reputation=signals.reputation_scores([internship.get('company_id')]),
                 preference_profile=preference_profile,
-                company_reputation=company_reputation_map,
-                dedupe_org=False,
-                min_score=0.0,
+                context=context,
             )
 
-            # Find the target internship in results
-            target_id = str(internship.get('internship_id') or internship_id)
-            picked = None
-            for r in ml_recs or []:
-                rid = str(r.get('internship_id') or '')
-                if rid == target_id:
-                    picked = r
-                    break
-
-            if picked:
-                match_score = picked.get("match_score", picked.get("matchScore", 0)) or 0
+            # A zero score is "no match", as in the ranked list
+            if picked and picked.get("match_score", 0) > 0:
+                match_score = picked["match_score"]
+                internship = with_descriptions([internship])[0]
                 recommendation = {
                     **picked,
                     "skills_required": internship.get("skills_required", picked.get("skills_required", [])),
@@ -445,10 +305,201 @@ def get_candidate_internship_match(candidate_id, internship_id):
         return error_response("Failed to generate match score", 500)
 
 
-def get_internship_recommendations(internship_id):
+def get_candidate_internship_matches(candidate_id, context=None):
+    """Match scores for a list of internships for a candidate (list-page badges).
+
+    Body: { "internship_ids": ["INT001", ...] } (internship_id or Mongo _id
+    strings, at most Config.MATCH_BATCH_MAX_IDS). One context load, one catalog
+    lookup and one scoring pass for all of them.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        internship_ids = data.get('internship_ids')
+        if not isinstance(internship_ids, list) or not internship_ids:
+            return error_response("internship_ids must be a non-empty list", 400)
+        internship_ids = list(dict.fromkeys(str(i) for i in internship_ids if i))
+        if len(internship_ids) > Config.MATCH_BATCH_MAX_IDS:
+            return error_response(f"At most {Config.MATCH_BATCH_MAX_IDS} internship_ids per request", 400)
+
+        inputs = load_recommendation_inputs(candidate_id, internship_ids=internship_ids)
+        candidate = inputs['candidate']
+        if not candidate:
+            return error_response("Candidate not found", 404)
+
+        # Requested id (internship_id or _id) -> internship, in request order
+        by_requested_id = {}
+        for internship in inputs['internships']:
+            for key in (internship.get('internship_id'), internship.get('_id')):
+                if key is not None:
+                    by_requested_id.setdefault(str(key), internship)
+        targets = [by_requested_id[i] for i in internship_ids if i in by_requested_id]
+        not_found = [i for i in internship_ids if i not in by_requested_id]
+
+        rows = []
+        if targets and ml_score_internships is not None:
+            internship_interactions = inputs['internship_interactions']
+            preference_profile = inputs['preference_profile']
+            signals = inputs['company_signals']
+            interacted_features = load_interacted_features(internship_interactions)
+            if context is None:
+                context = build_match_context(
+                    candidate_id, candidate, targets, interacted_features,
+                    internship_interactions, preference_profile
+                )
+            rows = ml_score_internships(
+                candidate,
+                targets,
+                internship_interactions=internship_interactions,
+                interacted_features=interacted_features,
+                company_interaction_stats=signals.interaction_stats,
+                company_reason_stats=signals.reason_stats,
+                company_ratings=signals.ratings,
+                company_reputation=signals.reputation_scores(i.get('company_id') for i in targets),
+                preference_profile=preference_profile,
+                context=context,
+            )
+
+        # Descriptions of the matched internships only (one query for all of them)
+        matched = [index for index, picked in enumerate(rows) if picked and picked.get("match_score", 0) > 0]
+        details = dict(zip(matched, with_descriptions(targets[i] for i in matched)))
+
+        matches = []
+        for index, internship in enumerate(targets):
+            picked = rows[index] if rows else None
+            match_score = 0
+            recommendation = None
+            if index in details:
+                match_score = picked["match_score"]
+                internship = details[index]
+                recommendation = {
+                    **picked,
+                    "skills_required": internship.get("skills_required", picked.get("skills_required", [])),
+                    "description": internship.get("description", picked.get("description", "")),
+                }
+            matches.append({
+                "internship_id": internship.get("internship_id") or str(internship.get("_id")),
+                "match_score": round(float(match_score), 2),
+                "recommendation": recommendation,
+            })
+
+        return success_response({
+            "candidate_id": candidate_id,
+            "matches": matches,
+            "not_found": not_found,
+        })
+    except Exception as e:
+        app_logger.error(f"Error generating internship matches for {candidate_id}: {e}")
+        return error_response("Failed to generate match scores", 500)
+
+
+def load_similar_internships(internship_id):
+    """Precomputed neighbor list of an internship (memory, else the stored copy until the first build)."""
+    if similar_internships is None:
+        return None
+    entry = similar_internships.neighbors(internship_id)
+    if entry is None and not similar_internships.ready:
+        try:
+            entry = load_neighbor_list(db_manager.get_db(), internship_id)
+        except Exception as e:
+            app_logger.warning(f"Could not read similar internships for {internship_id}: {e}")
+    return entry
+
+
+def with_descriptions(internships):
+    """Catalog documents with their description (one `$in` query for the scoring projections)."""
+    internships = list(internships)
+    if all("description" in i for i in internships):
+        return internships
+    try:
+        return hydrate_internships(internships, ("description",))
+    except Exception as e:
+        app_logger.warning(f"Could not read internship descriptions: {e}")
+        return internships
+
+
+def enrich_result_rows(rows, internships=None):
+    """Add skills_required/description (UI compatibility) to ranked rows.
+
+    Skills come from the catalog documents the rows were ranked from (default:
+    the catalog snapshot). Those are scoring projections, so descriptions of
+    the returned rows are read in one `$in` query.
+    """
+    if internships is not None:
+        by_id = {i.get("internship_id"): i for i in internships}
+    else:
+        snapshot = catalog_store.current()
+        by_id = {}
+        for r in rows if snapshot is not None else ():
+            doc = snapshot.internship(r.get("internship_id")) if r.get("internship_id") else None
+            if doc is not None:
+                by_id[r.get("internship_id")] = doc
+    returned = [by_id[i] for i in dict.fromkeys(r.get("internship_id") for r in rows) if i in by_id]
+    by_id.update((d.get("internship_id"), d) for d in with_descriptions(returned))
+    enriched = []
+    for r in rows:
+        base = by_id.get(r.get("internship_id"), {})
+        enriched.append({
+            **r,
+            "skills_required": base.get("skills_required", r.get("skills_required", [])),
+            "description": base.get("description", r.get("description", "")),
+        })
+    return enriched
+
+
+def load_text_index():
+    """The internship text index, synced with the current catalog snapshot."""
+    if text_index is None:
+        return None
+    load_all_internships()
+    return text_index
+
+
+def text_match_rows(matches, reason):
+    """API rows for (internship key, cosine) text-index matches."""
+    rows = []
+    for key, score in matches:
+        summary = text_index.summary(key)
+        if summary is None:
+            continue  # removed since the index was compiled
+        rows.append({
+            **summary,
+            "internship_id": summary.get("internship_id") or key,
+            "match_score": round(score * 100, 1),
+            "reason": reason,
+            "components": {"text_sim": round(score, 4)},
+        })
+    return rows
+
+
+def get_content_similar_internships(internship_id, limit=10):
+    """Internships whose title/description/responsibilities read most like this one's."""
+    index = load_text_index()
+    if index is None:
+        return error_response("Content similarity unavailable", 503)
+    summary = index.summary(str(internship_id))
+    if summary is None:
+        return error_response("Internship not found", 404)
+    return success_response({
+        "base_internship": summary.get("title"),
+        "recommendations": text_match_rows(index.similar(internship_id, limit), "Similar description"),
+    })
+
+
+def get_internship_recommendations(internship_id, context=None):
     """Get similar internships for a given internship"""
     try:
-        # Load all internships
+        # by=content: text (TF-IDF) channel instead of the skills/sector/location profile
+        if str(request.args.get('by', 'profile')).lower() == 'content':
+            return get_content_similar_internships(internship_id)
+
+        if context is None:
+            entry = load_similar_internships(internship_id)
+            if entry is not None:
+                return success_response({
+                    "base_internship": entry.get("title"),
+                    "recommendations": enrich_result_rows(entry.get("neighbors", [])),
+                })
+
         internships = load_all_internships()
         if not internships:
             return error_response("No internships available", 404)
@@ -469,6 +520,14 @@ def get_internship_recommendations(internship_id):
             }
             pool = [i for i in internships if i.get("internship_id") != internship_id]
             # Slightly tilt weights towards skill/sector for "similarity" use-case
+            if context is None and compile_candidate_context is not None:
+                context = compile_candidate_context(
+                    pseudo_candidate,
+                    skill_weight=0.6,
+                    loc_weight=0.15,
+                    sector_weight=0.2,
+                    misc_weight=0.05,
+                )
             ml_recs = ml_get_recommendations(
                 pseudo_candidate,
                 pool,
@@ -477,16 +536,10 @@ def get_internship_recommendations(internship_id):
                 loc_weight=0.15,
                 sector_weight=0.2,
                 misc_weight=0.05,
+                context=context,
             )
             # Enrich with skills/description for UI compatibility
-            by_id = {i.get("internship_id"): i for i in pool}
-            for r in ml_recs:
-                base = by_id.get(r.get("internship_id"), {})
-                recommendations.append({
-                    **r,
-                    "skills_required": base.get("skills_required", r.get("skills_required", [])),
-                    "description": base.get("description", r.get("description", "")),
-                })
+            recommendations = enrich_result_rows(ml_recs, pool)
         else:
             recommendations = generate_similar_internships(base_internship, internships)
         
@@ -537,32 +590,113 @@ def load_candidate_by_id(candidate_id):
         return None
 
 
+def _catalog_synced(internships, features):
+    """Follow-up work after the feature store has synced a catalog load."""
+    # Intern new skills so fuzzy equivalences are computed off the scoring path
+    if warm_skill_vocabulary is not None:
+        warm_skill_vocabulary(f.skills for f in features)
+    # Keep the similar-internship lists in step with the catalog (background)
+    if similar_internships is not None:
+        similar_internships.schedule_refresh(internships, features, feature_store.version)
+
+
+def _catalog_detail_loader(internships):
+    """hydrate(keys) for one catalog sync: full documents of these internships, read at most once."""
+    by_key = {}
+    for internship in internships:
+        by_key.setdefault(str(internship.get('internship_id') or internship.get('_id') or ''), internship)
+    loaded = {}
+
+    def hydrate(keys):
+        keys = [str(k) for k in keys]
+        wanted = [k for k in dict.fromkeys(keys) if k not in loaded and k in by_key]
+        if wanted:
+            loaded.update(zip(wanted, hydrate_internships([by_key[k] for k in wanted])))
+        return [loaded[k] for k in keys if k in loaded]
+
+    return hydrate
+
+
+def _sync_state(snapshot):
+    # A feature store invalidation (synonyms, scripts) needs a resync too: the snapshot's
+    # projections cannot be compiled without their descriptions
+    return snapshot.version, feature_store.version if feature_store is not None else 0
+
+
+def _sync_catalog(snapshot, internships):
+    global _synced_catalog_version
+    if _sync_state(snapshot) == _synced_catalog_version:
+        return
+    hydrate = _catalog_detail_loader(internships)
+    if feature_store is not None:
+        _catalog_synced(internships, feature_store.sync(internships, hydrate=hydrate))
+    if text_index is not None:
+        text_index.sync(internships, hydrate=hydrate)
+    _synced_catalog_version = _sync_state(snapshot)
+
+
+def synced_catalog_snapshot():
+    """The current catalog snapshot, with the feature store and text index synced to it."""
+    snapshot = catalog_store.snapshot()
+    # Compile scoring features (and index text) once per snapshot, not per request;
+    # requests arriving during the sync wait for it instead of compiling in parallel
+    state = _sync_state(snapshot)
+    if state != _synced_catalog_version:
+        try:
+            catalog_sync_flight.do(state, _sync_catalog, snapshot, list(snapshot.internships))
+        except Exception as e:
+            # Served unsynced (features compiled per request); the next request retries
+            app_logger.warning(f"Could not sync catalog version {snapshot.version}: {e}")
+    return snapshot
+
+
 def load_all_internships():
-    """Load all internships"""
+    """All internships of the current catalog snapshot (read-only documents: copy before changing)"""
     try:
-        # Try MongoDB first
-        db = db_manager.get_db()
-        if db is not None:
-            try:
-                internships = list(db.internships.find({}))
-                # Convert ObjectId to string for JSON serialization
-                for internship in internships:
-                    if '_id' in internship:
-                        internship['_id'] = str(internship['_id'])
-                return internships
-            except Exception as e:
-                app_logger.warning(f"MongoDB query failed: {e}")
-        
-        # Strict Atlas mode: do not read JSON files
-        return []
+        return list(synced_catalog_snapshot().internships)
     except Exception as e:
         app_logger.error(f"Error loading internships: {e}")
         return []
 
 
+def load_internships_by_ids(internship_ids):
+    """Load internships by internship_id or Mongo _id strings (catalog snapshot, else one query)."""
+    try:
+        # Full documents come from the loaded snapshot; only ids it doesn't have go to Mongo
+        snapshot = catalog_store.current()
+        found = snapshot.find_internships(internship_ids, by_object_id=True) if snapshot is not None else []
+        if found:
+            known = {str(i.get('internship_id')) for i in found} | {str(i.get('_id')) for i in found}
+            internship_ids = [i for i in internship_ids if str(i) not in known]
+
+        db = db_manager.get_db()
+        if db is None or not internship_ids:
+            return found
+
+        clauses = [{"internship_id": {"$in": list(internship_ids)}}]
+        if ObjectId is not None:
+            object_ids = [ObjectId(i) for i in internship_ids if ObjectId.is_valid(i)]
+            if object_ids:
+                clauses.append({"_id": {"$in": object_ids}})
+
+        internships = list(db.internships.find({"$or": clauses}))
+        for internship in internships:
+            if '_id' in internship:
+                internship['_id'] = str(internship['_id'])
+        return found + internships
+    except Exception as e:
+        app_logger.error(f"Error loading internships {internship_ids[:5]}...: {e}")
+        return []
+
+
 def load_internship_by_any_id(internship_id):
     """Load an internship by either internship_id or Mongo _id string."""
     try:
+        snapshot = catalog_store.current()
+        internship = snapshot.internship(internship_id) if snapshot is not None else None
+        if internship is not None:
+            return internship
+
         db = db_manager.get_db()
         if db is None:
             return None
@@ -584,6 +718,114 @@ def load_internship_by_any_id(internship_id):
         return None
 
 
+def _interactions_by_key(rows, key_field):
+    interactions = {}
+    for interaction in rows:
+        key = interaction.get(key_field)
+        interaction_type = interaction.get('interaction_type')
+        reason_tags = interaction.get('reason_tags', [])
+        if key and interaction_type:
+            interactions[key] = {'type': interaction_type, 'reason_tags': reason_tags}
+    return interactions
+
+
+def load_company_interactions(db, candidate_id):
+    """The candidate's company likes/dislikes: {company_id: {'type', 'reason_tags'}}."""
+    return _interactions_by_key(db['company_interactions'].find({'candidate_id': candidate_id}), 'company_id')
+
+
+def load_internship_interactions(db, candidate_id):
+    """The candidate's internship likes/dislikes (personal preferences): {internship_id: {...}}."""
+    return _interactions_by_key(db['internship_interactions'].find({'candidate_id': candidate_id}), 'internship_id')
+
+
+def load_bookmarked_internship_ids(db, candidate_id):
+    """Internship ids the candidate has bookmarked."""
+    rows = db['bookmarks'].find({'candidate_id': str(candidate_id)}, {'internship_id': 1})
+    return [str(r.get('internship_id')) for r in rows if r.get('internship_id')]
+
+
+def load_interacted_features(internship_interactions):
+    """Compiled features of the candidate's interacted internships, by internship id.
+
+    Served from the feature store; only internships it has not seen yet are read
+    (one `$in` query).
+    """
+    if feature_store is None:
+        return {}
+    features = {}
+    missing = []
+    for iid in dict.fromkeys(str(i) for i in (internship_interactions or {}) if i):
+        feat = feature_store.lookup(iid)
+        if feat is not None:
+            features[iid] = feat
+        else:
+            missing.append(iid)
+    if missing:
+        try:
+            db = db_manager.get_db()
+            if db is not None:
+                for doc in db['internships'].find({'internship_id': {'$in': missing}}):
+                    if doc.get('_id') is not None:
+                        doc['_id'] = str(doc['_id'])
+                    feat = feature_store.get(doc)
+                    features[feat.key] = feat
+        except Exception as e:
+            app_logger.warning(f"Could not load interacted internships: {e}")
+    return features
+
+
+def load_recommendation_inputs(candidate_id, internship_id=None, internships=None, internship_ids=None):
+    """Load the scoring inputs for a candidate with one concurrent round of queries.
+
+    Loads the whole catalog as 'internships' (unless an already loaded catalog is
+    passed in), only `internship_ids` as 'internships', or only `internship_id`
+    as 'internship'. Full-catalog loads also read the candidate's 'bookmarked_ids'
+    (always kept in the retrieval pool). Queries that fail or time out come back
+    empty; the full catalog is not one of them (see below).
+    """
+    db = db_manager.get_db()
+    # Global company signals come from the in-memory snapshot (no aggregation per request)
+    signals = company_signals.snapshot()
+    full_catalog = internship_id is None and internship_ids is None
+    if full_catalog and internships is None:
+        # Served from the catalog snapshot; a cold load can outlast the per-query timeout,
+        # which would turn into an empty catalog (404), so it is not run in the timed pool
+        internships = load_all_internships()
+    queries = {'candidate': lambda: load_candidate_by_id(candidate_id)}
+    if internship_id is not None:
+        queries['internship'] = lambda: load_internship_by_any_id(internship_id)
+    elif internship_ids is not None:
+        queries['internships'] = lambda: load_internships_by_ids(internship_ids)
+    if db is not None:
+        queries.update({
+            'internship_interactions': lambda: load_internship_interactions(db, candidate_id),
+            'preference_profile': lambda: load_personal_preference_profile(db, candidate_id),
+        })
+        if full_catalog:
+            queries['company_interactions'] = lambda: load_company_interactions(db, candidate_id)
+            queries['bookmarked_ids'] = lambda: load_bookmarked_internship_ids(db, candidate_id)
+
+    defaults = {
+        'internships': [],
+        'company_interactions': {},
+        'internship_interactions': {},
+        'bookmarked_ids': [],
+    }
+    results, _ = load_concurrently(queries, defaults, label=f"recommendation inputs for {candidate_id}")
+    if full_catalog:
+        results['internships'] = internships
+    for name, default in defaults.items():
+        results.setdefault(name, default)
+    results.setdefault('preference_profile', None)
+
+    results['company_signals'] = signals
+    results['company_ratings'] = signals.ratings
+    results['company_interaction_stats'] = signals.interaction_stats
+    results['company_reason_stats'] = signals.reason_stats
+    return results
+
+
 def load_candidate_context(candidate_id):
     """Load interaction/rating context used by the ML model."""
     company_interactions = {}
@@ -593,32 +835,9 @@ def load_candidate_context(candidate_id):
         db = db_manager.get_db()
         if db is None:
             return company_interactions, company_ratings, internship_interactions
-
-        interactions_collection = db['company_interactions']
-        user_interactions = list(interactions_collection.find({'candidate_id': candidate_id}))
-        for interaction in user_interactions:
-            company_id = interaction.get('company_id')
-            interaction_type = interaction.get('interaction_type')
-            reason_tags = interaction.get('reason_tags', [])
-            if company_id and interaction_type:
-                company_interactions[company_id] = {'type': interaction_type, 'reason_tags': reason_tags}
-
-        internship_interactions_collection = db['internship_interactions']
-        user_internship_interactions = list(internship_interactions_collection.find({'candidate_id': candidate_id}))
-        for interaction in user_internship_interactions:
-            iid = interaction.get('internship_id')
-            interaction_type = interaction.get('interaction_type')
-            reason_tags = interaction.get('reason_tags', [])
-            if iid and interaction_type:
-                internship_interactions[iid] = {'type': interaction_type, 'reason_tags': reason_tags}
-
-        reviews_collection = db['company_reviews']
-        pipeline = [{'$group': {'_id': '$company_id', 'average_rating': {'$avg': '$rating'}}}]
-        for result in list(reviews_collection.aggregate(pipeline)):
-            cid = result.get('_id')
-            avg_rating = result.get('average_rating')
-            if cid and avg_rating:
-                company_ratings[cid] = round(avg_rating, 2)
+        company_interactions = load_company_interactions(db, candidate_id)
+        internship_interactions = load_internship_interactions(db, candidate_id)
+        company_ratings = load_company_ratings(db)
     except Exception as e:
         app_logger.warning(f"Could not load candidate context: {e}")
 
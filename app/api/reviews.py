@@ -10,6 +10,7 @@ from app.utils.response_helpers import success_response, error_response
 from app.utils.error_handler import handle_errors
 from app.utils.jwt_auth import token_required, get_current_user
 from app.utils.company_match_scorer import CompanyMatchScorer
+from app.utils.company_signals import company_signals
 from bson import ObjectId
 from datetime import datetime
 
@@ -412,6 +413,7 @@ def _update_company_rating(company_id):
             {'_id': company_id} if isinstance(company_id, ObjectId) else {'company_id': company_id},
             {'$set': {'rating': avg_rating, 'average_rating': avg_rating}}  # Update both fields
         )
+        company_signals.apply_rating(company_id, avg_rating)
         
     except Exception as e:
         app_logger.error(f"Error updating company rating: {e}")
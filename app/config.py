@@ -47,6 +47,27 @@ class Config:
     # Performance
     CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', 300))
     API_RATE_LIMIT = int(os.getenv('API_RATE_LIMIT', 100))
+    # Recommendation scoring engine: 'loop' (per-internship) or 'vectorized' (NumPy batch kernel)
+    RECOMMENDER_ENGINE = os.getenv('RECOMMENDER_ENGINE', 'loop').strip().lower()
+    # Candidate pool re-ranked per recommendation request (0 = score the whole catalog)
+    RETRIEVAL_POOL_SIZE = int(os.getenv('RETRIEVAL_POOL_SIZE', 2000))
+    # Seconds between checks of the skills_synonyms collection for changes
+    SKILL_SYNONYMS_TTL = int(os.getenv('SKILL_SYNONYMS_TTL', 300))
+    # Threads shared by request context loaders, and the deadline (seconds) for one round of queries
+    CONTEXT_LOADER_WORKERS = int(os.getenv('CONTEXT_LOADER_WORKERS', 8))
+    CONTEXT_LOADER_TIMEOUT = float(os.getenv('CONTEXT_LOADER_TIMEOUT', 10))
+    # Seconds between full reloads of the in-memory company signals (writes patch it in between)
+    COMPANY_SIGNALS_TTL = int(os.getenv('COMPANY_SIGNALS_TTL', 60))
+    # Recommendation result cache: memory bound (approximate JSON bytes) and max age in seconds
+    RECOMMENDATION_CACHE_MAX_BYTES = int(os.getenv('RECOMMENDATION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    RECOMMENDATION_CACHE_TTL = int(os.getenv('RECOMMENDATION_CACHE_TTL', 300))
+    # Batch match-score endpoint: max internship ids per request
+    MATCH_BATCH_MAX_IDS = int(os.getenv('MATCH_BATCH_MAX_IDS', 200))
+    # Precomputed similar-internship lists: neighbors kept per internship
+    SIMILAR_INTERNSHIPS_K = int(os.getenv('SIMILAR_INTERNSHIPS_K', 10))
+    # Catalog snapshot: max age (seconds) before a full reload (the CACHE_TIMEOUT checks only
+    # pick up new documents and documents with a newer updated_at)
+    CATALOG_FULL_RELOAD_TTL = int(os.getenv('CATALOG_FULL_RELOAD_TTL', 3600))
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -0,0 +1,347 @@
+# app/core/batch_scoring.py
+"""
+NumPy batch scoring kernel for `get_recommendations(engine='vectorized')`.
+
+The loop engine in `ml_model` scores one internship at a time and re-evaluates
+every signal (skill fuzzy match, distance lookups, company sentiment, learned
+patterns, preference-profile nudges) per row. Most of those signals only depend
+on a handful of categorical attributes (skill stack, city, sector, title,
+company, duration bucket, ...) that repeat heavily across a large catalog.
+
+This module:
+- encodes the catalog once into integer code columns (`CatalogColumns`),
+- evaluates each signal once per *unique* value with the same helpers the loop
+  uses, then gathers it into a full column (skill coverage comes from the sparse
+  matrix in `skill_index` instead of per-pair fuzzy matching),
+- sums boosts/penalties as array operations in the loop's exact order, so
+  `match_score` and `components` are bit-for-bit identical to the loop engine,
+- only materializes `components` dicts for rows that end up in the response.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.ml_model import (
+    _company_adjustments,
+    _location_similarity_normalized,
+)
+from app.core.skill_index import SkillMatrix, skill_vocabulary
+
+
+def _encode(values: Iterable[Hashable]) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encode values into (int32 codes, list of unique values)."""
+    index: Dict[Any, int] = {}
+    uniques: List[Any] = []
+    codes = []
+    for v in values:
+        code = index.get(v)
+        if code is None:
+            code = index[v] = len(uniques)
+            uniques.append(v)
+        codes.append(code)
+    return np.asarray(codes, dtype=np.int32), uniques
+
+
+def _company_identity(feat) -> Hashable:
+    try:
+        key = (feat.company_key, feat.rating_key, feat.raw_company_id)
+        hash(key)
+        return key
+    except TypeError:
+        return ('__row__', id(feat))
+
+
+class CatalogColumns:
+    """Column-oriented, dictionary-encoded view of a list of InternshipFeatures."""
+
+    def __init__(self, features: Sequence[Any]):
+        self.features = list(features)
+        self.n = len(self.features)
+        feats = self.features
+
+        self.skill_codes, self.skill_values = _encode(f.skills for f in feats)
+        self.city_codes, self.city_values = _encode(f.city for f in feats)
+        self.sector_codes, self.sector_values = _encode(f.sector for f in feats)
+        self.title_codes, self.title_values = _encode(f.title for f in feats)
+        self.duration_codes, self.duration_values = _encode(f.duration_bucket for f in feats)
+        self.complexity_codes, self.complexity_values = _encode(f.complexity for f in feats)
+        self.work_type_codes, self.work_type_values = _encode(f.work_type for f in feats)
+        self.seniority_codes, self.seniority_values = _encode(f.seniority for f in feats)
+        self.org_codes, self.org_values = _encode(f.org for f in feats)
+        self.has_org = np.asarray([bool(o) for o in self.org_values], dtype=bool)[self.org_codes] \
+            if feats else np.zeros(0, dtype=bool)
+
+        company_codes, _ = _encode(_company_identity(f) for f in feats)
+        self.company_codes = company_codes
+        # One representative feature record per unique company identity.
+        reps: Dict[int, Any] = {}
+        for code, f in zip(company_codes.tolist(), feats):
+            reps.setdefault(code, f)
+        self.company_reps = [reps[c] for c in range(len(reps))]
+
+        self.beginner = np.fromiter((bool(f.beginner) for f in feats), dtype=bool, count=self.n)
+        self.learning = np.fromiter((bool(f.learning) for f in feats), dtype=bool, count=self.n)
+        self.has_stipend = np.fromiter((f.stipend is not None for f in feats), dtype=bool, count=self.n)
+        self.stipend = np.fromiter(
+            (float(f.stipend) if f.stipend is not None else np.nan for f in feats),
+            dtype=np.float64, count=self.n,
+        )
+
+        self._skill_matrix: Optional[SkillMatrix] = None
+
+        self.rows_by_key: Dict[Any, List[int]] = {}
+        for i, f in enumerate(feats):
+            try:
+                self.rows_by_key.setdefault(f.key, []).append(i)
+            except TypeError:
+                pass
+
+    def skill_matrix(self) -> SkillMatrix:
+        """Sparse matrix of the unique skill stacks (rebuilt if the vocabulary was reset)."""
+        m = self._skill_matrix
+        if m is None or m.version != skill_vocabulary.version:
+            m = self._skill_matrix = SkillMatrix(self.skill_values, skill_vocabulary)
+        return m
+
+
+_last_columns: Optional[Tuple[Tuple[int, ...], CatalogColumns]] = None
+
+
+def catalog_columns(features: Sequence[Any]) -> CatalogColumns:
+    """Columns for `features`, reusing the previous build when the catalog is unchanged.
+
+    Feature records are immutable and shared through the feature store, so the
+    identity of every record is enough to tell whether the catalog changed.
+    """
+    global _last_columns
+    token = tuple(map(id, features))
+    cached = _last_columns
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    cols = CatalogColumns(features)
+    _last_columns = (token, cols)
+    return cols
+
+
+def _gather(table: Sequence[float], codes: np.ndarray) -> np.ndarray:
+    return np.asarray(table, dtype=np.float64)[codes] if len(table) else np.zeros(len(codes))
+
+
+def _round_pct(values: np.ndarray) -> np.ndarray:
+    """round(v, 1) of every value, exactly as Python's round() (the loop engine) gives it.
+
+    rint(v * 10) / 10 is the same float unless v * 10 is within float noise of
+    a .5 tie; those few values go through round() itself.
+    """
+    tenths = values * 10
+    out = np.rint(tenths) / 10
+    near_tie = np.abs(tenths - np.floor(tenths) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie).tolist():
+        out[i] = round(float(values[i]), 1)
+    return out
+
+
+def rank_catalog(internships: Sequence[Mapping[str, Any]], features: Sequence[Any], ctx, company_signals, *,
+                 limit=None, min_score=0.0, dedupe_org=True, cache_columns=True, exclude_rows=None
+                 ) -> Tuple[Iterator[Tuple[float, Mapping[str, Any], Any, int]], Callable[[int], Dict[str, Any]]]:
+    """Score the whole catalog at once for a compiled CandidateContext.
+
+    Returns (rows, components_for) in the shape `ml_model._select_results`
+    expects: `rows` yields (score_pct, internship, features, row) in catalog
+    order and `components_for(row)` builds the components dict. When `limit` is
+    set, rows that cannot make the top `limit` (below the k-th best score, or
+    not the best of their organization under dedupe) are dropped here so the
+    final heap selection only sees a handful of candidates. Pass
+    cache_columns=False for ad-hoc subsets so they don't evict the columns of
+    the full catalog. Rows in `exclude_rows` are never returned.
+    """
+    cols = catalog_columns(features) if cache_columns else CatalogColumns(features)
+    n = cols.n
+    w_skill, w_loc, w_sector, w_misc = ctx.weights
+    company_interaction_stats, company_reputation, company_reason_stats, company_ratings = company_signals
+
+    # --- Base channels (evaluated once per unique value) ---
+    skill_sim = cols.skill_matrix().coverage(ctx.skills)[cols.skill_codes]
+
+    loc_table = [_location_similarity_normalized(ctx.city, c) for c in cols.city_values]
+    loc_sim = _gather([t[0] for t in loc_table], cols.city_codes)
+    loc_reasons = [t[2] for t in loc_table]
+
+    sector_sim = _gather([1.0 if s in ctx.sector_interests else 0.0 for s in cols.sector_values], cols.sector_codes)
+    field_sim = _gather(
+        [1.0 if ctx.field_of_study and ctx.field_of_study in s else 0.0 for s in cols.sector_values], cols.sector_codes
+    )
+    edu_sim = _gather(
+        [1.0 if ctx.education_level and ctx.education_level in t else 0.0 for t in cols.title_values], cols.title_codes
+    )
+    fg_boost = np.where(cols.beginner, 0.08, 0.0) if ctx.is_first_gen else np.zeros(n)
+
+    # --- Global company signals ---
+    company_table = [
+        _company_adjustments(f, company_interaction_stats, company_reputation, company_reason_stats, company_ratings)
+        for f in cols.company_reps
+    ]
+    company_boost = _gather([t[0] for t in company_table], cols.company_codes)
+    company_penalty = _gather([t[1] for t in company_table], cols.company_codes)
+    rating_boost = _gather([t[2] for t in company_table], cols.company_codes)
+
+    # --- Learned personal patterns ---
+    # Accumulated in the same order as the loop engine so float sums match exactly.
+    pattern_boost = np.zeros(n)
+    pattern_penalty = np.zeros(n)
+    stipend = cols.stipend
+    has_stipend = cols.has_stipend
+
+    if ctx.liked_locations or ctx.disliked_locations:
+        location_table = [ctx.location_adjustment(c) for c in cols.city_values]
+        pattern_boost += _gather([t[0] for t in location_table], cols.city_codes)
+        pattern_penalty += _gather([t[1] for t in location_table], cols.city_codes)
+
+    if ctx.disliked_sectors:
+        pattern_penalty += _gather(
+            [0.15 if s and s in ctx.disliked_sectors else 0.0 for s in cols.sector_values], cols.sector_codes
+        )
+    if ctx.liked_sectors:
+        pattern_boost += _gather(
+            [0.06 if s and s in ctx.liked_sectors else 0.0 for s in cols.sector_values], cols.sector_codes
+        )
+
+    if ctx.low_stipend is not None:
+        mask = has_stipend & (np.nan_to_num(stipend) != 0)
+        with np.errstate(invalid='ignore'):
+            pattern_penalty += np.where(
+                mask & (stipend <= ctx.low_stipend), 0.08,
+                np.where(mask & (stipend <= ctx.low_stipend_soft), 0.04, 0.0),
+            )
+
+    if ctx.disliked_skills:
+        table = []
+        for skills in cols.skill_values:
+            current = frozenset(skills)
+            overlap = ctx.disliked_skills & current
+            value = 0.0
+            if overlap:
+                ratio = len(overlap) / max(len(current), 1)
+                if ratio >= 0.5:
+                    value = 0.12
+                elif ratio >= 0.3:
+                    value = 0.06
+            table.append(value)
+        pattern_penalty += _gather(table, cols.skill_codes)
+
+    if ctx.liked_skills:
+        table = []
+        for skills in cols.skill_values:
+            current = frozenset(skills)
+            overlap = ctx.liked_skills & current
+            value = 0.0
+            if overlap:
+                ratio = len(overlap) / max(len(current), 1)
+                value = min(0.06, 0.06 * ratio)
+            table.append(value)
+        pattern_boost += _gather(table, cols.skill_codes)
+
+    if ctx.disliked_durations:
+        pattern_penalty += _gather(
+            [0.04 if b and b in ctx.disliked_durations else 0.0 for b in cols.duration_values], cols.duration_codes
+        )
+
+    if ctx.disliked_complexity:
+        pattern_penalty += _gather(
+            [0.04 if c in ctx.disliked_complexity else 0.0 for c in cols.complexity_values], cols.complexity_codes
+        )
+
+    if ctx.liked_learning:
+        pattern_boost += np.where(cols.learning, 0.04, 0.0)
+    if ctx.disliked_learning:
+        pattern_penalty += np.where(cols.learning, 0.0, 0.04)
+
+    if ctx.min_stipend:
+        with np.errstate(invalid='ignore'):
+            pattern_boost += np.where(
+                has_stipend & (stipend >= ctx.min_stipend), 0.04,
+                np.where(has_stipend & (stipend >= ctx.min_stipend_soft), 0.02, 0.0),
+            )
+
+    # --- Direct internship interactions (sparse) ---
+    internship_boost = np.zeros(n)
+    internship_penalty = np.zeros(n)
+    for key, (boost, penalty) in ctx.interactions.items():
+        rows = cols.rows_by_key.get(key)
+        if rows:
+            internship_boost[rows] = boost
+            internship_penalty[rows] = penalty
+
+    # --- Preference-profile extras: work type + seniority + stipend minimum ---
+    if ctx.work_type_boost is not None:
+        pattern_boost += _gather(
+            [ctx.work_type_boost.get(wt) or 0.0 for wt in cols.work_type_values], cols.work_type_codes
+        )
+    if ctx.seniority_boost is not None:
+        pattern_boost += _gather(
+            [ctx.seniority_boost.get(sen) or 0.0 for sen in cols.seniority_values], cols.seniority_codes
+        )
+        if ctx.stipend_floor is not None:
+            with np.errstate(invalid='ignore'):
+                pattern_boost += np.where(has_stipend & (stipend >= ctx.stipend_floor), ctx.stipend_floor_boost, 0.0)
+
+    base_score = (
+        w_skill * skill_sim +
+        w_loc * loc_sim +
+        w_sector * sector_sim +
+        w_misc * (0.5 * field_sim + 0.5 * edu_sim)
+    )
+    score = base_score + fg_boost + company_boost + rating_boost + internship_boost + pattern_boost - company_penalty - internship_penalty - pattern_penalty
+    score = np.minimum(1.0, np.maximum(0.0, score))
+    pct = _round_pct(score * 100)
+    score_pct = pct.tolist()
+    if exclude_rows:
+        pct[list(exclude_rows)] = -np.inf
+    keep = _candidate_rows(cols, pct, limit, float(min_score or 0), dedupe_org)
+
+    def components_for(i: int) -> Dict[str, Any]:
+        return {
+            "skill_sim": round(float(skill_sim[i]), 2),
+            "loc_sim": round(float(loc_sim[i]), 2),
+            "loc_reason": loc_reasons[cols.city_codes[i]],
+            "sector_sim": float(sector_sim[i]),
+            "field_sim": float(field_sim[i]),
+            "edu_sim": float(edu_sim[i]),
+            "fg_boost": float(fg_boost[i]),
+            "company_boost": float(company_boost[i]),
+            "company_penalty": float(company_penalty[i]),
+            "rating_boost": float(rating_boost[i]),
+            "internship_boost": float(internship_boost[i]),
+            "internship_penalty": float(internship_penalty[i]),
+            "pattern_penalty": float(pattern_penalty[i]),
+            "pattern_boost": float(pattern_boost[i]),
+        }
+
+    rows = ((score_pct[i], internships[i], cols.features[i], i) for i in keep)
+    return rows, components_for
+
+
+def _candidate_rows(cols: CatalogColumns, pct: np.ndarray, limit, threshold: float, dedupe_org: bool) -> List[int]:
+    """Row indices that can still be part of the top `limit` results."""
+    eligible = pct > threshold
+    if limit is None or not len(pct):
+        return np.flatnonzero(eligible).tolist()
+
+    if dedupe_org:
+        # Only the best-scoring row(s) of each organization can be selected.
+        org_rows = eligible & cols.has_org
+        org_best = np.full(len(cols.org_values), -np.inf)
+        np.maximum.at(org_best, cols.org_codes[org_rows], pct[org_rows])
+        keep = eligible & (~cols.has_org | (pct == org_best[cols.org_codes]))
+        values = np.concatenate([org_best[np.isfinite(org_best)], pct[eligible & ~cols.has_org]])
+    else:
+        keep = eligible
+        values = pct[eligible]
+
+    if len(values) > limit:
+        kth = np.partition(values, len(values) - limit)[len(values) - limit]
+        keep &= pct >= kth
+    return np.flatnonzero(keep).tolist()
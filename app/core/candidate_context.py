@@ -0,0 +1,267 @@
+# app/core/candidate_context.py
+"""
+Compiled per-candidate scoring context.
+
+Everything `get_recommendations` derives from the candidate side - normalized
+skills and city, dynamic channel weights, patterns learned from liked/disliked
+internships, preference-profile nudges and direct internship interactions - is
+compiled once into an immutable `CandidateContext`. Scoring an internship is
+then a pure function of (context, InternshipFeatures) plus the global company
+signals, see `ml_model._score_features`.
+
+Contexts are cached per candidate *version*: the cache key is a fingerprint of
+every input the context was compiled from, so a profile edit, a new
+like/dislike or a changed preference profile compiles a fresh one.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from app.core.feature_store import _freeze
+from app.core.location_affinity import LocationAffinityField, location_affinity_field
+from app.core.skill_index import CandidateSkills, skill_vocabulary
+from app.core.skill_synonyms import skill_synonyms
+from app.core.ml_model import (
+    _direct_interaction_adjustment,
+    _learn_interaction_patterns,
+    _normalize_skill_list,
+    _recommendation_weights,
+    _safe_normalize_city,
+    skill_similarity,
+)
+
+
+DEFAULT_WEIGHTS = (0.5, 0.25, 0.15, 0.10)  # skill, location, sector, misc
+
+
+@dataclass(frozen=True)
+class CandidateContext:
+    """Candidate-side inputs of the recommender, compiled for scoring."""
+
+    skills: FrozenSet[str]
+    city: str
+    sector_interests: FrozenSet[str]
+    field_of_study: str
+    education_level: str
+    is_first_gen: bool
+    weights: Tuple[float, float, float, float]   # normalized (skill, loc, sector, misc)
+    pref_strength: float
+
+    # Learned from liked/disliked internships
+    liked_locations: Tuple[str, ...]
+    disliked_locations: Tuple[str, ...]
+    liked_sectors: FrozenSet[str]
+    disliked_sectors: FrozenSet[str]
+    liked_skills: FrozenSet[str]
+    disliked_skills: FrozenSet[str]
+    disliked_durations: FrozenSet[str]
+    disliked_complexity: FrozenSet[Any]
+    liked_learning: bool
+    disliked_learning: bool
+    low_stipend: Optional[float]          # stipend at/below this is penalized
+    low_stipend_soft: Optional[float]     # ... and slightly penalized up to this
+    min_stipend: Optional[float]          # liked "Good stipend" level
+    min_stipend_soft: Optional[float]
+
+    # Preference profile nudges (None = that part of the profile is not applied)
+    work_type_boost: Optional[Mapping[str, float]]
+    seniority_boost: Optional[Mapping[str, float]]
+    stipend_floor: Optional[float]
+    stipend_floor_boost: float
+
+    # internship key -> (internship_boost, internship_penalty)
+    interactions: Mapping[Any, Tuple[float, float]]
+
+    # Affinity of every known city to the liked/disliked locations (None without any)
+    location_field: Optional[LocationAffinityField] = field(default=None, compare=False, repr=False)
+    # `skills` resolved against the skill vocabulary (None: fuzzy-match per pair)
+    skill_matcher: Optional[CandidateSkills] = field(default=None, compare=False, repr=False)
+
+    def skill_coverage(self, internship_skills) -> float:
+        """skill_similarity(skills, internship_skills)."""
+        if self.skill_matcher is None:
+            return skill_similarity(self.skills, internship_skills)
+        return self.skill_matcher.coverage(internship_skills)
+
+    def location_adjustment(self, city: str) -> Tuple[float, float]:
+        """(boost, penalty) of an internship city w.r.t. liked/disliked locations."""
+        if not city or self.location_field is None:
+            return 0.0, 0.0
+        max_like, max_dislike = self.location_field.affinity(city)
+        return (0.08 * max_like if max_like > 0 else 0.0,
+                0.10 * max_dislike if max_dislike > 0 else 0.0)
+
+
+def _preference_nudges(preference_profile, pref_strength):
+    """Work type / seniority / stipend-floor nudges from the learned preference profile.
+
+    Mirrors the original per-internship block: a malformed work type list disables
+    all three, a malformed seniority list disables seniority and the stipend floor.
+    """
+    work_type_boost = None
+    seniority_boost = None
+    stipend_floor = None
+    if not (isinstance(preference_profile, dict) and preference_profile.get('strength', 0) and pref_strength > 0):
+        return work_type_boost, seniority_boost, stipend_floor
+
+    def _boosts(pairs):
+        scores = {k: float(v) for k, v in pairs if k}
+        return {k: max(-0.03, min(0.03, 0.02 * v * pref_strength)) for k, v in scores.items() if v}
+
+    try:
+        work_type_boost = _boosts(preference_profile.get('work_type') or [])
+        seniority_boost = _boosts(preference_profile.get('seniority') or [])
+        try:
+            pref_min = (preference_profile.get('stipend') or {}).get('min_preferred')
+            if pref_min:
+                stipend_floor = float(pref_min)
+        except Exception:
+            stipend_floor = None
+    except Exception:
+        pass
+    return work_type_boost, seniority_boost, stipend_floor
+
+
+def compile_candidate_context(candidate, features_by_id=None, internship_interactions=None,
+                              preference_profile=None, skill_weight=0.5, loc_weight=0.25,
+                              sector_weight=0.15, misc_weight=0.10) -> CandidateContext:
+    """Compile a candidate profile and its interactions into a CandidateContext.
+
+    `features_by_id` maps internship keys to InternshipFeatures; it is used to
+    learn patterns from interacted internships.
+    """
+    candidate = candidate or {}
+    features_by_id = features_by_id or {}
+    internship_interactions = internship_interactions or {}
+
+    cand_skill_set = frozenset(_normalize_skill_list(candidate.get("skills_possessed", [])))
+    sector_interests = frozenset(s.lower() for s in candidate.get("sector_interests", []) or [])
+    location_pref = (candidate.get("location_preference") or "").strip().lower()
+
+    pref_strength = 0.0
+    try:
+        if isinstance(preference_profile, dict):
+            pref_strength = float(preference_profile.get('strength') or 0.0)
+    except Exception:
+        pref_strength = 0.0
+    try:
+        pref_strength = max(0.0, min(1.0, float(pref_strength)))
+    except Exception:
+        pref_strength = 0.0
+
+    weights = _recommendation_weights(
+        bool(cand_skill_set), bool(location_pref), bool(sector_interests), pref_strength,
+        skill_weight, loc_weight, sector_weight, misc_weight,
+    )
+
+    disliked, liked = _learn_interaction_patterns(internship_interactions, features_by_id)
+
+    low = disliked['low_stipend']
+    pref = liked.get('min_stipend')
+    work_type_boost, seniority_boost, stipend_floor = _preference_nudges(preference_profile, pref_strength)
+
+    interactions = {}
+    for key, interaction in internship_interactions.items():
+        interactions[key] = _direct_interaction_adjustment(interaction)
+
+    location_field = None
+    if liked['locations'] or disliked['locations']:
+        location_field = location_affinity_field(liked['locations'], disliked['locations'])
+
+    return CandidateContext(
+        skills=cand_skill_set,
+        city=_safe_normalize_city(location_pref) if location_pref else "",
+        sector_interests=sector_interests,
+        field_of_study=(candidate.get("field_of_study") or "").strip().lower(),
+        education_level=(candidate.get("education_level") or "").strip().lower(),
+        is_first_gen=bool(candidate.get("first_generation") or candidate.get("no_experience")),
+        weights=weights,
+        pref_strength=pref_strength,
+        liked_locations=tuple(liked['locations']),
+        disliked_locations=tuple(disliked['locations']),
+        liked_sectors=frozenset(liked['sectors']),
+        disliked_sectors=frozenset(disliked['sectors']),
+        liked_skills=frozenset(_normalize_skill_list(liked['skills'])),
+        disliked_skills=frozenset(_normalize_skill_list(disliked['skills'])),
+        disliked_durations=frozenset(disliked['duration_buckets']),
+        disliked_complexity=frozenset(disliked['complexity']),
+        liked_learning=liked.get('learning', 0) > 0,
+        disliked_learning=disliked.get('learning', 0) > 0,
+        low_stipend=low,
+        low_stipend_soft=low * 1.1 if low is not None else None,
+        min_stipend=float(pref) if pref else None,
+        min_stipend_soft=float(pref) * 0.9 if pref else None,
+        work_type_boost=work_type_boost,
+        seniority_boost=seniority_boost,
+        stipend_floor=stipend_floor,
+        stipend_floor_boost=0.02 * pref_strength,
+        interactions=interactions,
+        location_field=location_field,
+        skill_matcher=CandidateSkills(cand_skill_set, skill_vocabulary) if cand_skill_set else None,
+    )
+
+
+def context_fingerprint(candidate, features_by_id, internship_interactions, preference_profile, weights) -> Tuple[Any, ...]:
+    """Version key of a compiled context: every input it was compiled from."""
+    candidate = candidate or {}
+    interactions = internship_interactions or {}
+    features_by_id = features_by_id or {}
+    return (
+        _freeze({k: candidate.get(k) for k in (
+            'skills_possessed', 'sector_interests', 'location_preference',
+            'field_of_study', 'education_level', 'first_generation', 'no_experience',
+        )}),
+        _freeze(interactions),
+        _freeze(preference_profile),
+        tuple(weights),
+        # Interacted internships' compiled features, compared by value (None when not in the catalog)
+        tuple(sorted(((str(k), features_by_id.get(k)) for k in interactions), key=lambda kv: kv[0])),
+    )
+
+
+class CandidateContextCache:
+    """Small thread-safe LRU of compiled contexts keyed by candidate id + version."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Any, Tuple[Tuple[Any, ...], CandidateContext]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, candidate_id, candidate, features_by_id=None, internship_interactions=None,
+                       preference_profile=None, weights=DEFAULT_WEIGHTS) -> CandidateContext:
+        version = context_fingerprint(candidate, features_by_id, internship_interactions, preference_profile, weights)
+        with self._lock:
+            cached = self._items.get(candidate_id)
+            if cached is not None and cached[0] == version:
+                self._items.move_to_end(candidate_id)
+                self.hits += 1
+                return cached[1]
+        self.misses += 1
+        ctx = compile_candidate_context(candidate, features_by_id, internship_interactions, preference_profile, *weights)
+        with self._lock:
+            self._items[candidate_id] = (version, ctx)
+            self._items.move_to_end(candidate_id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return ctx
+
+    def invalidate(self, candidate_id=None) -> None:
+        with self._lock:
+            if candidate_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(candidate_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': len(self._items), 'hits': self.hits, 'misses': self.misses}
+
+
+candidate_context_cache = CandidateContextCache()
+# Contexts hold skills normalized through the synonym map.
+skill_synonyms.subscribe(lambda version: candidate_context_cache.invalidate())
@@ -0,0 +1,212 @@
+# app/core/city_store.py
+"""
+Compact binary city store.
+
+`scripts/build_city_coords.py` writes app/core/city_coords.bin; this module
+memory-maps it on first use and exposes read-only Mapping views over it, so
+importing `app.core.city_coords` costs nothing until a city is looked up and
+the coordinate data is shared by every worker through the page cache.
+
+File layout (little-endian):
+
+    header        magic b"CITYCRD1", version, n_cities, n_aliases, reserved (u32 each)
+    lat           float64[n_cities]
+    lon           float64[n_cities]
+    name_off      uint32[n_cities + 1]    offsets into the string blob
+    display_off   uint32[n_cities + 1]
+    alias_off     uint32[n_aliases + 1]
+    alias_city    uint32[n_aliases]       city index of each alias
+    blob          utf-8 names, display names, aliases (concatenated)
+"""
+
+from __future__ import annotations
+
+import abc
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+
+CITY_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'city_coords.bin')
+MAGIC = b'CITYCRD1'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIII')
+
+
+def write_city_store(path: str, rows: Sequence[Mapping], aliases: Mapping[str, str]) -> None:
+    """Write rows ({'key', 'city', 'lat', 'lon'}) and alias -> key pairs to `path`."""
+    index = {r['key']: i for i, r in enumerate(rows)}
+    alias_items = [(a, index[k]) for a, k in aliases.items() if k in index]
+
+    blob = bytearray()
+
+    def _offsets(strings):
+        offsets = [len(blob)]
+        for s in strings:
+            blob.extend(s.encode('utf-8'))
+            offsets.append(len(blob))
+        return offsets
+
+    name_off = _offsets(r['key'] for r in rows)
+    display_off = _offsets(r['city'] for r in rows)
+    alias_off = _offsets(a for a, _ in alias_items)
+
+    n, m = len(rows), len(alias_items)
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, n, m, 0),
+        struct.pack(f'<{n}d', *(float(r['lat']) for r in rows)),
+        struct.pack(f'<{n}d', *(float(r['lon']) for r in rows)),
+        struct.pack(f'<{n + 1}I', *name_off),
+        struct.pack(f'<{n + 1}I', *display_off),
+        struct.pack(f'<{m + 1}I', *alias_off),
+        struct.pack(f'<{m}I', *(i for _, i in alias_items)),
+        bytes(blob),
+    ]
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for part in parts:
+            f.write(part)
+    os.replace(tmp_path, path)
+
+
+class CityStore:
+    """Read-only view over a memory-mapped city store file."""
+
+    def __init__(self, path: str = CITY_STORE_PATH):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, m, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} city store')
+        self.size = n
+
+        view = memoryview(self._mm)
+        pos = _HEADER.size
+
+        def _take(count, fmt, width):
+            nonlocal pos
+            arr = view[pos:pos + count * width].cast(fmt)
+            pos += count * width
+            return arr
+
+        self.lat = _take(n, 'd', 8)
+        self.lon = _take(n, 'd', 8)
+        self._name_off = _take(n + 1, 'I', 4)
+        self._display_off = _take(n + 1, 'I', 4)
+        self._alias_off = _take(m + 1, 'I', 4)
+        self._alias_city = _take(m, 'I', 4)
+        self._blob = view[pos:]
+
+        # Interned name table: the only per-process structure (name -> index).
+        self.names: List[str] = [self._string(self._name_off, i) for i in range(n)]
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    def _string(self, offsets, i: int) -> str:
+        return bytes(self._blob[offsets[i]:offsets[i + 1]]).decode('utf-8')
+
+    def coordinates(self, i: int) -> Tuple[float, float]:
+        return self.lat[i], self.lon[i]
+
+    def display_name(self, i: int) -> str:
+        return self._string(self._display_off, i)
+
+    def aliases(self) -> Dict[str, str]:
+        return {
+            self._string(self._alias_off, j): self.names[self._alias_city[j]]
+            for j in range(len(self._alias_city))
+        }
+
+
+_store_lock = threading.Lock()
+_store: Optional[CityStore] = None
+_store_failed = False
+
+
+def city_store() -> Optional[CityStore]:
+    """The process-wide CityStore, opened on first use (None if unreadable)."""
+    global _store, _store_failed
+    if _store is None and not _store_failed:
+        with _store_lock:
+            if _store is None and not _store_failed:
+                try:
+                    _store = CityStore(CITY_STORE_PATH)
+                except Exception as e:
+                    from app.utils.logger import app_logger
+                    app_logger.error(f"Failed to load city store {CITY_STORE_PATH}: {e}")
+                    _store_failed = True
+    return _store
+
+
+class _LazyCityMapping(Mapping, abc.ABC):
+    """Mapping keyed by normalized city name, backed by the city store."""
+
+    @abc.abstractmethod
+    def _lookup(self, store: CityStore, i: int):
+        """The value of city `i` in `store`."""
+
+    def __getitem__(self, key):
+        store = city_store()
+        i = store.index.get(key) if store is not None else None
+        if i is None:
+            raise KeyError(key)
+        return self._lookup(store, i)
+
+    def __contains__(self, key) -> bool:
+        store = city_store()
+        return store is not None and key in store.index
+
+    def get(self, key, default=None):
+        store = city_store()
+        i = store.index.get(key) if store is not None else None
+        return default if i is None else self._lookup(store, i)
+
+    def __iter__(self) -> Iterator[str]:
+        store = city_store()
+        return iter(store.names if store is not None else ())
+
+    def __len__(self) -> int:
+        store = city_store()
+        return store.size if store is not None else 0
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({len(self)} cities)'
+
+
+class CityCoordinates(_LazyCityMapping):
+    """city -> (lat, lon)"""
+
+    def _lookup(self, store, i):
+        return store.coordinates(i)
+
+
+class CityDisplayNames(_LazyCityMapping):
+    """city -> display name"""
+
+    def _lookup(self, store, i):
+        return store.display_name(i)
+
+
+class CityNameAliases(Mapping):
+    """alias -> city (from the 'aliases' field of the city data)"""
+
+    def __init__(self):
+        self._aliases: Optional[Dict[str, str]] = None
+
+    def _items(self) -> Dict[str, str]:
+        if self._aliases is None:
+            store = city_store()
+            if store is None:
+                return {}
+            self._aliases = store.aliases()
+        return self._aliases
+
+    def __getitem__(self, key):
+        return self._items()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items())
+
+    def __len__(self) -> int:
+        return len(self._items())
@@ -80,6 +80,10 @@ class DatabaseManager:
             self._initialize()
         return self._db
     
+    def current_db(self):
+        """Get database instance if connected, without reconnecting or pinging."""
+        return self._db
+    
     def health_check(self):
         """Check database health."""
         try:
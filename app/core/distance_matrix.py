@@ -2,12 +2,34 @@
 """
 Distance calculation using a static hardcoded city coordinates dictionary.
 This module imports CITY_COORDINATES from app.core.city_coords.
+
+City names resolve through one reverse alias dict (CITY_ALIASES, the aliases
+from the city build script, and accent-folded spellings, e.g. 'thane' ->
+'thāne'); resolve_city_name adds a fuzzy fallback for misspellings.
+
+Pairwise distances are precomputed by scripts/build_distance_matrix.py into
+data/city_distances.npy, which is memory-mapped read-only (and so shared by
+all worker processes through the page cache). When the file is missing or
+stale the Haversine formula is used instead.
 """
 
-from app.core.city_coords import CITY_COORDINATES
+import json
+import os
+import threading
+import unicodedata
+
+from app.core.city_coords import CITY_COORDINATES, CITY_NAME_ALIASES
 
 from math import radians, sin, cos, sqrt, atan2
 
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+DISTANCE_MATRIX_PATH = os.environ.get('CITY_DISTANCE_MATRIX', os.path.join(_DATA_DIR, 'city_distances.npy'))
+DISTANCE_INDEX_PATH = os.path.splitext(DISTANCE_MATRIX_PATH)[0] + '.json'
+# Matrix cells hold distances in tenths of a km (get_distance rounds to 0.1 km).
+DISTANCE_SCALE = 10.0
+# Grid distances are unrounded; widen queries so 0.1 km rounding never drops a city.
+_GRID_SLACK_KM = 0.1
+
 # Common city name mappings for better matching
 CITY_ALIASES = {
 	# Must map to keys that exist in CITY_COORDINATES
@@ -45,6 +67,58 @@ def _basic_normalize(city: str) -> str:
     s = " ".join(s.split())
     return s
 
+def fold_accents(s: str) -> str:
+	"""
+	Strip diacritics: 'rājkot' -> 'rajkot'.
+	"""
+	if s.isascii():
+		return s
+	return "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+
+def _build_city_lookup() -> dict:
+	"""
+	Reverse alias map: every known spelling -> CITY_COORDINATES key (or CITY_ALIASES standard name).
+	"""
+	folded_keys = {}
+	for key in CITY_COORDINATES:
+		folded_keys.setdefault(fold_accents(key), key)
+
+	def _target(standard, aliases):
+		# Prefer a spelling that has coordinates ('rajkot' -> 'rājkot', 'gurgaon' -> 'gurugram')
+		for name in [standard] + list(aliases):
+			if name in CITY_COORDINATES:
+				return name
+			if fold_accents(name) in folded_keys:
+				return folded_keys[fold_accents(name)]
+		return standard
+
+	lookup = {}
+	for standard_name, aliases in CITY_ALIASES.items():
+		target = _target(standard_name, aliases)
+		for alias in aliases:
+			lookup.setdefault(alias, target)
+	for key in CITY_COORDINATES:
+		lookup.setdefault(key, key)
+	for alias, key in CITY_NAME_ALIASES.items():
+		lookup.setdefault(_basic_normalize(alias), key)
+	for name, target in list(lookup.items()):
+		lookup.setdefault(fold_accents(name), target)
+	return lookup
+
+_lookup_lock = threading.Lock()
+_CITY_LOOKUP = None
+
+def _city_lookup() -> dict:
+	"""
+	The reverse alias map, built on first use (the city store is loaded lazily too).
+	"""
+	global _CITY_LOOKUP
+	if _CITY_LOOKUP is None:
+		with _lookup_lock:
+			if _CITY_LOOKUP is None:
+				_CITY_LOOKUP = _build_city_lookup()
+	return _CITY_LOOKUP
+
 def normalize_city_name(city: str) -> str:
 	"""
 	Normalize city name to standard form for distance lookup.
@@ -52,14 +126,87 @@ def normalize_city_name(city: str) -> str:
 	if not city:
 		return ""
 	city_lower = _basic_normalize(city)
-	for standard_name, aliases in CITY_ALIASES.items():
-		if city_lower in aliases:
-			return standard_name
-	return city_lower
+	lookup = _city_lookup()
+	hit = lookup.get(city_lower)
+	if hit is not None:
+		return hit
+	return lookup.get(fold_accents(city_lower), city_lower)
+
+_fuzzy_lock = threading.Lock()
+_fuzzy_choices = None
+
+def resolve_city_name(city: str, score_cutoff: float = 85.0):
+	"""
+	Resolve a (possibly misspelled) city to a CITY_COORDINATES key, or None.
+	One dict hit for known spellings; otherwise a fuzzy match over the frozen
+	list of known spellings.
+	"""
+	city_norm = normalize_city_name(city)
+	if not city_norm:
+		return None
+	if city_norm in CITY_COORDINATES:
+		return city_norm
+	global _fuzzy_choices
+	if _fuzzy_choices is None:
+		with _fuzzy_lock:
+			if _fuzzy_choices is None:
+				_fuzzy_choices = tuple(sorted(n for n, t in _city_lookup().items() if n.isascii() and t in CITY_COORDINATES))
+	try:
+		from rapidfuzz import fuzz, process
+	except ImportError:
+		return None
+	match = process.extractOne(fold_accents(city_norm), _fuzzy_choices, scorer=fuzz.ratio, score_cutoff=score_cutoff)
+	if not match:
+		return None
+	return _city_lookup()[match[0]]
+
+def haversine_km(coord1, coord2) -> float:
+	"""
+	Great-circle distance in kilometers between two (lat, lon) pairs, rounded to 0.1 km.
+	"""
+	lat1, lon1 = radians(coord1[0]), radians(coord1[1])
+	lat2, lon2 = radians(coord2[0]), radians(coord2[1])
+	dlat = lat2 - lat1
+	dlon = lon2 - lon1
+	a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+	c = 2 * atan2(sqrt(a), sqrt(1-a))
+	R = 6371  # Earth radius in km
+	return round(R * c, 1)
+
+_matrix_lock = threading.Lock()
+_matrix_loaded = False
+_matrix = None
+CITY_INDEX: dict = {}
+
+def _load_distance_matrix():
+	"""
+	Memory-map the precomputed distance matrix once per process.
+	Returns None (Haversine fallback) if numpy or the files are unavailable,
+	or if the matrix was built for a different CITY_COORDINATES.
+	"""
+	global _matrix_loaded, _matrix, CITY_INDEX
+	if _matrix_loaded:
+		return _matrix
+	with _matrix_lock:
+		if _matrix_loaded:
+			return _matrix
+		try:
+			import numpy as np
+			with open(DISTANCE_INDEX_PATH, 'r', encoding='utf-8') as f:
+				cities = json.load(f).get('cities') or []
+			if cities == list(CITY_COORDINATES):
+				matrix = np.load(DISTANCE_MATRIX_PATH, mmap_mode='r')
+				if matrix.shape == (len(cities), len(cities)):
+					CITY_INDEX = {name: i for i, name in enumerate(cities)}
+					_matrix = matrix
+		except Exception:
+			_matrix = None
+		_matrix_loaded = True
+		return _matrix
 
 def get_distance(city1: str, city2: str) -> float:
 	"""
-	Get distance between two cities in kilometers using Haversine formula.
+	Get distance between two cities in kilometers (precomputed matrix, else Haversine formula).
 	Returns 0 if cities are the same, or a large number if city not found.
 	"""
 	if not city1 or not city2:
@@ -68,19 +215,75 @@ def get_distance(city1: str, city2: str) -> float:
 	city2_norm = normalize_city_name(city2)
 	if city1_norm == city2_norm:
 		return 0.0
+	matrix = _load_distance_matrix()
+	if matrix is not None:
+		i = CITY_INDEX.get(city1_norm)
+		j = CITY_INDEX.get(city2_norm)
+		if i is not None and j is not None:
+			return int(matrix[i, j]) / DISTANCE_SCALE
 	coord1 = CITY_COORDINATES.get(city1_norm)
 	coord2 = CITY_COORDINATES.get(city2_norm)
 	if not coord1 or not coord2:
 		return 1000.0
-	# Haversine formula
-	lat1, lon1 = radians(coord1[0]), radians(coord1[1])
-	lat2, lon2 = radians(coord2[0]), radians(coord2[1])
-	dlat = lat2 - lat1
-	dlon = lon2 - lon1
-	a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-	c = 2 * atan2(sqrt(a), sqrt(1-a))
-	R = 6371  # Earth radius in km
-	return round(R * c, 1)
+	return haversine_km(coord1, coord2)
+
+_positions = None
+
+def city_index() -> dict:
+	"""
+	CITY_COORDINATES key -> position (the row/column of the distance matrix).
+	"""
+	global _positions
+	if _positions is None:
+		_positions = {name: i for i, name in enumerate(CITY_COORDINATES)}
+	return _positions
+
+def distances_from(city_norm: str):
+	"""
+	get_distance from a CITY_COORDINATES key to every key, as a float64 array by position.
+	"""
+	import numpy as np
+	matrix = _load_distance_matrix()
+	i = city_index()[city_norm]
+	if matrix is not None:
+		return matrix[i] / DISTANCE_SCALE
+	coord = CITY_COORDINATES[city_norm]
+	row = np.fromiter((haversine_km(coord, other) for other in CITY_COORDINATES.values()), dtype=np.float64, count=len(CITY_COORDINATES))
+	row[i] = 0.0
+	return row
+
+_grid_lock = threading.Lock()
+_grid = None
+_aliased_rows: list = []
+
+def _city_grid():
+	"""
+	Spatial grid over CITY_COORDINATES (built once per process), plus the keys whose
+	normalized name is a different city (those are measured through the alias).
+	"""
+	global _grid, _aliased_rows
+	if _grid is None:
+		with _grid_lock:
+			if _grid is None:
+				from app.core.spatial_index import CityGrid
+				_aliased_rows = [i for i, c in enumerate(CITY_COORDINATES) if normalize_city_name(c) != c]
+				_grid = CityGrid(CITY_COORDINATES.items())
+	return _grid
+
+def _exact_neighbors(city_norm: str, candidates) -> list:
+	"""
+	get_distance from city_norm to each candidate key (plus aliased keys), sorted by distance.
+	Ties keep CITY_COORDINATES order.
+	"""
+	names = _grid.names
+	rows = sorted(set(candidates).union(_aliased_rows))
+	pairs = []
+	for j in rows:
+		other_city = names[j]
+		if other_city == city_norm:
+			continue
+		pairs.append((other_city, get_distance(city_norm, other_city)))
+	return sorted(pairs, key=lambda x: x[1])
 
 def get_nearby_cities(city: str, max_distance: float = 100.0) -> list:
 	"""
@@ -91,11 +294,30 @@ def get_nearby_cities(city: str, max_distance: float = 100.0) -> list:
 	city_norm = normalize_city_name(city)
 	if city_norm not in CITY_COORDINATES:
 		return []
-	nearby = []
-	for other_city, coord in CITY_COORDINATES.items():
-		if other_city == city_norm:
-			continue
-		dist = get_distance(city_norm, other_city)
-		if dist <= max_distance:
-			nearby.append((other_city, dist))
-	return sorted(nearby, key=lambda x: x[1])
+	grid = _city_grid()
+	lat, lon = CITY_COORDINATES[city_norm]
+	# Unknown (aliased) coordinates count as 1000 km, so a wide radius scans everything.
+	if max_distance >= 1000.0:
+		rows = range(len(grid))
+	else:
+		rows = grid.within(lat, lon, max_distance + _GRID_SLACK_KM)[0].tolist()
+	return [pair for pair in _exact_neighbors(city_norm, rows) if pair[1] <= max_distance]
+
+def get_k_nearest_cities(city: str, k: int = 5, max_distance: float = None) -> list:
+	"""
+	Get the k cities closest to the given city as (city, distance_km), nearest first.
+	Optionally limited to max_distance km.
+	"""
+	if not city or k <= 0:
+		return []
+	city_norm = normalize_city_name(city)
+	if city_norm not in CITY_COORDINATES:
+		return []
+	grid = _city_grid()
+	lat, lon = CITY_COORDINATES[city_norm]
+	# +1: the city itself is in the grid
+	rows = grid.nearest(lat, lon, k + 1 + len(_aliased_rows), slack_km=_GRID_SLACK_KM)[0].tolist()
+	nearest = _exact_neighbors(city_norm, rows)
+	if max_distance is not None:
+		nearest = [pair for pair in nearest if pair[1] <= max_distance]
+	return nearest[:k]
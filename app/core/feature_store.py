@@ -0,0 +1,249 @@
+# app/core/feature_store.py
+"""
+Precompiled internship features for the recommender.
+
+`get_recommendations` used to re-derive the same per-internship values from raw
+Mongo documents on every request (normalized skills, city, sector, duration
+bucket, complexity, learning proxy, work type, seniority). This module compiles
+each internship once into an immutable `InternshipFeatures` record and keeps it
+until the underlying document changes.
+
+Invalidation is per internship: every record remembers a fingerprint of the raw
+fields it was compiled from, so an edited document is recompiled the next time
+it is seen. `invalidate_internship()` drops a record explicitly (e.g. from
+scripts that rewrite `internships`).
+
+Catalog snapshot documents are scoring projections without the long text
+fields (`is_projection`: the mapping lists them in `omitted_fields`). A
+projected document reuses the record compiled from its full document while the
+projected fields agree; `sync(..., hydrate=...)` fetches full documents only
+for internships that are new or changed.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.core.ml_model import (
+    _complexity_label,
+    _duration_bucket,
+    _infer_seniority,
+    _infer_work_type,
+    _learning_proxy,
+    _normalize_skill_list,
+    _safe_normalize_city,
+)
+from app.core.skill_synonyms import skill_synonyms
+
+
+# Raw document fields that feed into InternshipFeatures.
+_FINGERPRINT_FIELDS = (
+    'internship_id',
+    '_id',
+    'company_id',
+    'organization',
+    'company',
+    'location',
+    'sector',
+    'title',
+    'stipend',
+    'skills_required',
+    'duration',
+    'is_beginner_friendly',
+    'description',
+    'updated_at',
+)
+# Detail fields a scoring projection leaves out (see catalog_snapshot.INTERNSHIP_DETAIL_FIELDS).
+# Projections are matched on the remaining fields.
+_DETAIL_FIELDS = ('description',)
+_PROJECTED_FIELDS = tuple(f for f in _FINGERPRINT_FIELDS if f not in _DETAIL_FIELDS)
+
+
+@dataclass(frozen=True, slots=True)
+class InternshipFeatures:
+    """Scoring view of one internship document."""
+
+    key: str                      # internship_id or _id (interaction key)
+    sort_id: str                  # internship_id or "" (tie-break key)
+    org: str                      # normalized organization (dedupe key)
+    rating_key: Any               # company_id or organization (company_ratings key)
+    company_key: str              # key into global company stats
+    raw_company_id: Any           # company_id as stored (reputation fallback)
+    skills: Tuple[str, ...]
+    skill_set: frozenset
+    city: str
+    sector: str
+    title: str                    # lowercase title
+    stipend: Optional[float]      # numeric stipend, else None
+    beginner: bool
+    duration_bucket: Optional[str]
+    complexity: Optional[str]
+    learning: bool
+    work_type: str
+    seniority: str
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _fingerprint(internship: Mapping[str, Any], fields: Tuple[str, ...] = _FINGERPRINT_FIELDS) -> Tuple[Any, ...]:
+    return tuple(_freeze(internship.get(f)) for f in fields)
+
+
+def is_projection(internship: Mapping[str, Any]) -> bool:
+    """Whether a document was loaded without its detail fields."""
+    omitted = getattr(internship, 'omitted_fields', ())
+    return any(f in omitted for f in _DETAIL_FIELDS)
+
+
+def internship_key(internship: Mapping[str, Any]) -> str:
+    """Key used by interactions and the feature store (internship_id, else _id)."""
+    return internship.get('internship_id') or internship.get('_id', '')
+
+
+def compile_internship_features(internship: Mapping[str, Any]) -> InternshipFeatures:
+    """Derive the scoring features of a single internship document."""
+    company_id = internship.get('company_id') or internship.get('organization', '')
+    company_key = company_id if isinstance(company_id, str) and company_id.strip() else None
+    if not company_key:
+        company_key = (internship.get('organization') or internship.get('company') or '').strip().lower()
+
+    skills = _normalize_skill_list(internship.get('skills_required', []))
+    stipend = internship.get('stipend')
+
+    try:
+        bucket = _duration_bucket(internship.get('duration'))
+    except Exception:
+        bucket = None
+    try:
+        complexity = _complexity_label(internship)
+    except Exception:
+        complexity = None
+    try:
+        learning = _learning_proxy(internship)
+    except Exception:
+        learning = False
+
+    return InternshipFeatures(
+        key=internship_key(internship),
+        sort_id=internship.get('internship_id') or '',
+        org=(internship.get('organization') or '').strip().lower(),
+        rating_key=company_id,
+        company_key=company_key,
+        raw_company_id=internship.get('company_id'),
+        skills=tuple(skills),
+        skill_set=frozenset(skills),
+        city=_safe_normalize_city(internship.get('location') or ''),
+        sector=(internship.get('sector') or '').strip().lower(),
+        title=(internship.get('title') or '').lower(),
+        stipend=stipend if isinstance(stipend, (int, float)) else None,
+        beginner=bool(internship.get('is_beginner_friendly')),
+        duration_bucket=bucket,
+        complexity=complexity,
+        learning=learning,
+        work_type=_infer_work_type(internship.get('location')),
+        seniority=_infer_seniority(internship.get('title')),
+    )
+
+
+class InternshipFeatureStore:
+    """Thread-safe cache of compiled features keyed by internship id."""
+
+    def __init__(self):
+        # key -> (fingerprint, features, fingerprint without detail fields)
+        self._records: Dict[str, Tuple[Tuple[Any, ...], InternshipFeatures, Tuple[Any, ...]]] = {}
+        self._lock = threading.Lock()
+        self.compiled = 0
+        self.hits = 0
+        # Bumped whenever a catalog load or invalidation changes the compiled set
+        self.version = 0
+
+    def _match(self, key: str, internship: Mapping[str, Any]) -> Optional[InternshipFeatures]:
+        rec = self._records.get(key) if key else None
+        if rec is None:
+            return None
+        if is_projection(internship):
+            # The record was compiled from the full document; trust it while the projected fields agree
+            return rec[1] if rec[2] == _fingerprint(internship, _PROJECTED_FIELDS) else None
+        return rec[1] if rec[0] == _fingerprint(internship) else None
+
+    def get(self, internship: Mapping[str, Any]) -> InternshipFeatures:
+        key = internship_key(internship)
+        features = self._match(key, internship)
+        if features is not None:
+            self.hits += 1
+            return features
+
+        features = compile_internship_features(internship)
+        self.compiled += 1
+        # Features compiled from a projection lack the description-based signals; only
+        # full documents are kept, so the next sync compiles this internship properly
+        if key and not is_projection(internship):
+            with self._lock:
+                self._records[key] = (
+                    _fingerprint(internship), features, _fingerprint(internship, _PROJECTED_FIELDS)
+                )
+        return features
+
+    def lookup(self, key: str) -> Optional[InternshipFeatures]:
+        """Features last compiled for this internship id (None if never seen)."""
+        rec = self._records.get(str(key))
+        return rec[1] if rec is not None else None
+
+    def features_for(self, internships: Iterable[Mapping[str, Any]]) -> List[InternshipFeatures]:
+        return [self.get(i) for i in internships or []]
+
+    def sync(self, internships: Iterable[Mapping[str, Any]],
+             hydrate: Optional[Callable[[List[str]], Iterable[Mapping[str, Any]]]] = None) -> List[InternshipFeatures]:
+        """Compile a full catalog load and drop records for internships no longer present.
+
+        When the load is a scoring projection, new or changed internships are
+        compiled from the full documents `hydrate(keys)` returns (one call).
+        """
+        compiled = self.compiled
+        internships = list(internships or [])
+        if hydrate is not None:
+            missing = [
+                internship_key(i) for i in internships
+                if is_projection(i) and self._match(internship_key(i), i) is None
+            ]
+            if missing:
+                self.features_for(hydrate([k for k in missing if k]))
+        features = self.features_for(internships)
+        live = {f.key for f in features if f.key}
+        with self._lock:
+            stale = [k for k in self._records if k not in live]
+            for key in stale:
+                del self._records[key]
+            if stale or self.compiled != compiled:
+                self.version += 1
+        return features
+
+    def invalidate(self, internship_id: Optional[str] = None) -> None:
+        """Drop one internship's record, or everything when no id is given."""
+        with self._lock:
+            if internship_id is None:
+                self._records.clear()
+            else:
+                self._records.pop(str(internship_id), None)
+            self.version += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {'records': len(self._records), 'compiled': self.compiled, 'hits': self.hits, 'version': self.version}
+
+
+feature_store = InternshipFeatureStore()
+# Compiled skills are normalized through the synonym map; recompile after it changes.
+skill_synonyms.subscribe(lambda version: feature_store.invalidate())
+
+
+def invalidate_internship(internship_id: Optional[str] = None) -> None:
+    """Invalidate cached features after an `internships` document changes."""
+    feature_store.invalidate(internship_id)
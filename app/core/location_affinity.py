@@ -0,0 +1,108 @@
+# app/core/location_affinity.py
+"""
+Dense location-affinity field over all known cities.
+
+Liked/disliked locations nudge scores by how close a city is to the nearest
+liked (or disliked) one: `max(decay(distance(l, city)) for l in locations)`,
+with the same 150 km half-life decay as `ml_model._distance_decay`. Instead of
+measuring every internship city against every pattern city, a field computes
+that max for all cities in CITY_COORDINATES at once (decay is monotonic, so it
+is the decay of the row-wise minimum distance) and a lookup is an array index.
+
+Values match the per-city loop in `CompanyMatchScorer._location_affinity`
+(used when no field can be built), including the 1000 km distance used for
+cities without coordinates; the field is decayed with one `np.exp`, which can
+differ from `math.exp` in the last bit.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.core.city_coords import CITY_COORDINATES
+from app.core.distance_matrix import city_index, distances_from, normalize_city_name
+
+
+UNKNOWN_DISTANCE_KM = 1000.0
+HALF_LIFE_KM = 150.0
+_LN2 = 0.6931471805599453
+
+
+def _decay(d: float) -> float:
+    if not math.isfinite(d) or d < 0:
+        return 0.0
+    return math.exp(-_LN2 * d / HALF_LIFE_KM)
+
+
+class _Affinity:
+    """max decay to one set of pattern locations, for every known city."""
+
+    def __init__(self, locations: Iterable[str]):
+        self.locations = frozenset(normalize_city_name(loc) for loc in locations if loc)
+        known = [loc for loc in self.locations if loc in CITY_COORDINATES]
+        self.has_unknown = len(known) < len(self.locations)
+
+        if not self.locations:
+            self.values = None
+            self._fallback = 0.0
+            return
+        # Cities without coordinates are 1000 km from everything (but themselves).
+        self._fallback = _decay(UNKNOWN_DISTANCE_KM)
+        nearest = np.full(len(CITY_COORDINATES), UNKNOWN_DISTANCE_KM if self.has_unknown else np.inf)
+        for loc in known:
+            np.minimum(nearest, distances_from(loc), out=nearest)
+        values = np.exp(-_LN2 * nearest / HALF_LIFE_KM)
+        # No distance (inf) or a bad one decays to 0, as in _decay
+        values[~np.isfinite(nearest) | (nearest < 0)] = 0.0
+        self.values = values
+
+    def lookup(self, city: str, index: Optional[int]) -> float:
+        if self.values is None or not city:
+            return 0.0
+        if index is not None:
+            return float(self.values[index])
+        # Internship city without coordinates
+        return 1.0 if normalize_city_name(city) in self.locations else self._fallback
+
+
+class LocationAffinityField:
+    """Affinity of every known city to a candidate's liked and disliked locations."""
+
+    def __init__(self, liked_locations: Iterable[str] = (), disliked_locations: Iterable[str] = ()):
+        self._index = city_index()
+        self.liked = _Affinity(liked_locations)
+        self.disliked = _Affinity(disliked_locations)
+
+    def affinity(self, city: str) -> Tuple[float, float]:
+        """(max_like, max_dislike) closeness (0..1) of `city` to liked / disliked locations."""
+        if not city:
+            return 0.0, 0.0
+        index = self._index.get(normalize_city_name(city))
+        return self.liked.lookup(city, index), self.disliked.lookup(city, index)
+
+
+_fields_lock = threading.Lock()
+_fields: "OrderedDict[Tuple[frozenset, frozenset], LocationAffinityField]" = OrderedDict()
+_MAX_FIELDS = 256
+
+
+def location_affinity_field(liked_locations: Iterable[str] = (),
+                            disliked_locations: Iterable[str] = ()) -> LocationAffinityField:
+    """Field for these liked/disliked locations (small LRU; fields are shared read-only)."""
+    key = (frozenset(l for l in liked_locations if l), frozenset(l for l in disliked_locations if l))
+    with _fields_lock:
+        field = _fields.get(key)
+        if field is not None:
+            _fields.move_to_end(key)
+            return field
+    field = LocationAffinityField(key[0], key[1])
+    with _fields_lock:
+        _fields[key] = field
+        while len(_fields) > _MAX_FIELDS:
+            _fields.popitem(last=False)
+    return field
@@ -1,15 +1,16 @@
 # app/core/ml_model.py
-from rapidfuzz import fuzz
-import difflib
+from rapidfuzz import fuzz, process
+import heapq
 import math
 import re
+from operator import itemgetter
 
 # ----------------- distance imports (robust) -----------------
 try:
-    from .distance_matrix import get_distance, normalize_city_name
+    from .distance_matrix import get_distance, normalize_city_name, resolve_city_name
 except Exception:
     try:
-        from app.core.distance_matrix import get_distance, normalize_city_name
+        from app.core.distance_matrix import get_distance, normalize_city_name, resolve_city_name
     except Exception:
         # If distance_matrix missing, provide safe fallbacks
         def normalize_city_name(x):
@@ -19,6 +20,11 @@ except Exception:
             # fallback: unknown distance
             return float('inf')
 
+        def resolve_city_name(x):
+            return None
+
+from app.core.skill_synonyms import skill_synonyms
+
 # ----------------- City Helpers (kept from original) -----------------
 def _normalize_city(name: str) -> str:
     return (name or "").strip().lower()
@@ -86,63 +92,109 @@ def find_nearest_city(input_city: str, cities: list[dict]):
 
     # --- Step 1: Exact/Fuzzy match ---
     input_norm = _normalize_city(input_city)
-    norm_db = [_normalize_city(c) for c in db_city_names]
+    names, first_index, choices = _db_city_choices(db_city_names)
 
     # Try exact
-    if input_norm in norm_db:
-        idx = norm_db.index(input_norm)
-        return db_city_names[idx], 0.0
+    if input_norm in first_index:
+        return names[first_index[input_norm]], 0.0
 
-    # Try fuzzy (difflib, cutoff=0.8)
-    match = difflib.get_close_matches(input_norm, norm_db, n=1, cutoff=0.8)
+    # Try fuzzy (similarity >= 80, as difflib's cutoff=0.8)
+    match = process.extractOne(input_norm, choices, scorer=fuzz.ratio, score_cutoff=80)
     if match:
-        idx = norm_db.index(match[0])
-        return db_city_names[idx], 0.0
+        return names[first_index[match[0]]], 0.0
 
     # --- Step 2: Distance-based using hardcoded distances ---
-    nearest_city = None
-    min_dist = float("inf")
+    # Misspelled input: measure from the closest known city name instead.
+    input_city = resolve_city_name(input_city) or input_city
+    nearest_city, min_dist = _nearest_by_distance(input_city, db_city_names)
+    if nearest_city:
+        return nearest_city, round(min_dist, 2)
+    return None, None
 
-    for city in db_city_names:
-        try:
+_db_city_names = None  # (names, first index per normalized name, frozen fuzzy choices)
+
+def _db_city_choices(db_city_names: list):
+    """Lookup structures over the database city names, rebuilt only when the list changes."""
+    global _db_city_names
+    names = tuple(db_city_names)
+    cached = _db_city_names
+    if cached is None or cached[0] != names:
+        first_index = {}
+        for i, c in enumerate(names):
+            first_index.setdefault(_normalize_city(c), i)
+        cached = _db_city_names = (names, first_index, tuple(first_index))
+    return cached
+
+_db_city_grid = None  # (names, normalized names, first index per name, CityGrid, known indices, unknown indices)
+
+def _nearest_by_distance(input_city: str, db_city_names: list):
+    """(city, distance) minimizing _get_distance_between_cities; first city wins ties.
+
+    Cities with known coordinates are searched through a spatial grid (built once
+    per list of database cities); unknown ones are all 1000 km away.
+    """
+    global _db_city_grid
+    if not input_city:
+        return None, float("inf")
+    try:
+        from app.core.city_coords import CITY_COORDINATES
+        from app.core.spatial_index import CityGrid
+    except Exception:
+        CityGrid = None
+
+    if CityGrid is None:
+        nearest_city = None
+        min_dist = float("inf")
+        for city in db_city_names:
             dist = _get_distance_between_cities(input_city, city)
             if dist < min_dist:
                 min_dist = dist
                 nearest_city = city
-        except Exception as e:
-            print(f"❌ Error calculating distance to {city}: {e}")
-            continue
-
-    if nearest_city:
-        return nearest_city, round(min_dist, 2)
-    return None, None
+        return nearest_city, min_dist
+
+    names = tuple(db_city_names)
+    cached = _db_city_grid
+    if cached is None or cached[0] != names:
+        norms = [normalize_city_name(c) for c in names]
+        first_index = {}
+        for i, n in enumerate(norms):
+            first_index.setdefault(n, i)
+        known = [i for i, n in enumerate(norms) if n in CITY_COORDINATES]
+        unknown = [i for i, n in enumerate(norms) if n not in CITY_COORDINATES]
+        grid = CityGrid((norms[i], CITY_COORDINATES[norms[i]]) for i in known)
+        cached = _db_city_grid = (names, norms, first_index, grid, known, unknown)
+    _, norms, first_index, grid, known, unknown = cached
+
+    input_norm = normalize_city_name(normalize_city_name(input_city))
+    best = None  # (distance, index)
+    if input_norm in first_index:
+        best = (0.0, first_index[input_norm])
+    if input_norm in CITY_COORDINATES:
+        if unknown and (best is None or (1000.0, unknown[0]) < best):
+            best = (1000.0, unknown[0])
+        lat, lon = CITY_COORDINATES[input_norm]
+        for row in grid.nearest(lat, lon, 1, slack_km=0.1)[0].tolist():
+            i = known[row]
+            cand = (_get_distance_between_cities(input_city, names[i]), i)
+            if best is None or cand < best:
+                best = cand
+    else:
+        # Unknown input: every other city is 1000 km away.
+        other = next((i for i, n in enumerate(norms) if n != input_norm), None)
+        if other is not None and (best is None or (1000.0, other) < best):
+            best = (1000.0, other)
+    if best is None:
+        return None, float("inf")
+    return names[best[1]], best[0]
 
 # ----------------- Skill Helpers (from your original file) -----------------
-def _load_synonyms():
-    """Load skill synonyms strictly from MongoDB (Atlas). No JSON fallback."""
-    try:
-        from app.core.database import load_data
-        syn_rows = load_data('skills_synonyms') or []
-        mapping = {}
-        for row in syn_rows:
-            alias = str(row.get('alias', '')).strip().lower()
-            canonical = str(row.get('canonical', '')).strip().lower()
-            if alias and canonical:
-                mapping[alias] = canonical
-        return mapping
-    except Exception as e:
-        print(f"[ERROR] DB load for skills_synonyms failed: {e}")
-        return {}
-
-_SKILL_SYNONYMS = _load_synonyms()
-
 def _normalize_skill(skill: str) -> str:
     """Lowercase, strip, and map synonyms."""
     if not isinstance(skill, str):
         print(f"[DEBUG] Non-string skill passed to _normalize_skill: {repr(skill)} (type: {type(skill)})")
         return ""
     s = skill.strip().lower()
-    return _SKILL_SYNONYMS.get(s, s)
+    return skill_synonyms.mapping().get(s, s)
 
 def _normalize_skill_list(skills):
     """Return a list of cleaned, lowercase skill strings (unique, ordered)."""
@@ -150,7 +202,7 @@ def _normalize_skill_list(skills):
         return []
     # Deeply flatten skills (arbitrary depth)
     def _deep_flatten(sk):
-        if isinstance(sk, list):
+        if isinstance(sk, (list, tuple)):
             out = []
             for item in sk:
                 out.extend(_deep_flatten(item))
@@ -228,8 +280,10 @@ def location_similarity(candidate_loc, intern_loc):
     """
     if not candidate_loc or not intern_loc:
         return 0.0, None, "no location info"
-    c_norm = _safe_normalize_city(candidate_loc)
-    i_norm = _safe_normalize_city(intern_loc)
+    return _location_similarity_normalized(_safe_normalize_city(candidate_loc), _safe_normalize_city(intern_loc))
+
+def _location_similarity_normalized(c_norm, i_norm):
+    """location_similarity for city names already passed through _safe_normalize_city."""
     if not c_norm or not i_norm:
         return 0.0, None, "no location info"
 
@@ -251,64 +305,212 @@ def location_similarity(candidate_loc, intern_loc):
         return 0.6, dist, f"{int(dist)} km away"
     return 0.0, dist if math.isfinite(dist) else None, f"{int(dist)} km away" if math.isfinite(dist) else "far"
 
-# ----------------- Recommendations (keeps the original function name) -----------------
-def get_recommendations(candidate, internships, top_n=10,
-                        skill_weight=0.5, loc_weight=0.25,
-                        sector_weight=0.15, misc_weight=0.10,
-                        company_interactions=None, company_ratings=None,
-                        internship_interactions=None,
-                        company_interaction_stats=None,
-                        company_reason_stats=None,
-                        preference_profile=None,
-                        company_reputation=None,
-                        dedupe_org=True,
-                        min_score=0.0):
-    """
-    Lightweight, explainable recommendation function that is compatible with
-    existing callers in your codebase.
-    Returns a list of up to top_n internship dicts with match_score and reason.
-    
-    New parameters:
-    - company_interactions: dict of {company_id: {'type': 'like'|'dislike', 'reason_tags': []}}
-    - company_ratings: dict of {company_id: average_rating} from reviews
-    - internship_interactions: dict of {internship_id: {'type': 'like'|'dislike', 'reason_tags': []}}
+# ----------------- Internship feature helpers (used by the feature store) -----------------
+def _duration_bucket(v):
+    if v is None:
+        return None
+    months = None
+    if isinstance(v, (int, float)):
+        months = int(v)
+    elif isinstance(v, str):
+        m = re.search(r"(\d+)", v)
+        if m:
+            months = int(m.group(1))
+    if months is None or months <= 0:
+        return None
+    if months <= 2:
+        return 'short'
+    if months <= 4:
+        return 'medium'
+    return 'long'
+
+def _complexity_label(intern):
+    try:
+        skill_count = len(_normalize_skill_list(intern.get('skills_required', [])))
+    except Exception:
+        skill_count = 0
+    beginner = bool(intern.get('is_beginner_friendly'))
+    if beginner or skill_count <= 3:
+        return 'basic'
+    if (not beginner) and skill_count >= 6:
+        return 'advanced'
+    return 'medium'
+
+def _learning_proxy(intern):
+    if intern.get('is_beginner_friendly'):
+        return True
+    desc = (intern.get('description') or '')
+    if isinstance(desc, str) and re.search(r"\b(learn|learning|training|mentor|mentorship)\b", desc.lower()):
+        return True
+    return False
+
+def _infer_work_type(location):
+    """remote|hybrid|onsite|unknown from a raw location string."""
+    s_loc = str(location or '').lower()
+    if 'hybrid' in s_loc:
+        return 'hybrid'
+    if 'remote' in s_loc or 'wfh' in s_loc or 'work from home' in s_loc:
+        return 'remote'
+    if s_loc.strip():
+        return 'onsite'
+    return 'unknown'
+
+def _infer_seniority(title):
+    """senior|junior|mid from a raw title string."""
+    title_text = str(title or '').lower()
+    if any(k in title_text for k in ('senior', 'lead', 'principal', 'staff')):
+        return 'senior'
+    if any(k in title_text for k in ('junior', 'entry', 'fresher')):
+        return 'junior'
+    return 'mid'
+
+# ----------------- Global company signals -----------------
+_COMPANY_REASON_WEIGHTS = {
+    # positive
+    'Great company culture': 1.0,
+    'Excellent benefits': 0.8,
+    'Good work-life balance': 1.0,
+    'Strong reputation': 1.0,
+    'Innovation focused': 0.7,
+    'Learning opportunities': 0.9,
+    'Career growth potential': 0.9,
+    'Good management': 0.8,
+    # negative
+    'Poor work culture': -1.0,
+    'Inadequate benefits': -0.8,
+    'Bad work-life balance': -1.0,
+    'Negative reviews': -0.9,
+    'Limited growth': -0.8,
+    'Poor management': -0.9,
+    'Low compensation': -0.7,
+    'Toxic environment': -1.2,
+}
+
+
+def _company_adjustments(feat, company_interaction_stats, company_reputation, company_reason_stats, company_ratings):
+    """Global (all users) company nudges for one internship.
+
+    Returns (company_boost, company_penalty, rating_boost).
     """
-    # company_interactions are the *current user's* company likes/dislikes.
-    # Per product rules: company interactions affect all users, so the model
-    # should prefer company_interaction_stats (global counts) for scoring.
-    company_interactions = company_interactions or {}
-    company_ratings = company_ratings or {}
-    internship_interactions = internship_interactions or {}
-    company_interaction_stats = company_interaction_stats or {}
-    company_reason_stats = company_reason_stats or {}
-    
-    cand_skills = _normalize_skill_list(candidate.get("skills_possessed", []))
-    cand_skill_set = set(cand_skills)
-    sector_interests = [s.lower() for s in candidate.get("sector_interests", []) or []]
-    location_pref = (candidate.get("location_preference") or "").strip().lower()
-
-    # ----------------- Dynamic weights (context-aware) -----------------
-    # The system avoids a single fixed formula by adjusting weights based on:
-    # - availability of candidate data
-    # - strength of learned preference profile
-    def _clamp01(x: float) -> float:
-        try:
-            return max(0.0, min(1.0, float(x)))
-        except Exception:
-            return 0.0
+    company_boost = 0.0
+    company_penalty = 0.0
+    rating_boost = 0.0
+
+    # Global company like/dislike signal (all users)
+    company_key = feat.company_key
+    company_id = feat.rating_key
+    stats = None
 
-    pref_strength = 0.0
     try:
-        if isinstance(preference_profile, dict):
-            pref_strength = float(preference_profile.get('strength') or 0.0)
+        stats = company_interaction_stats.get(company_key)
+        if not stats and isinstance(company_key, str):
+            stats = company_interaction_stats.get(company_key.strip().lower())
+        if isinstance(stats, dict):
+            like_count = float(stats.get('like', 0) or 0)
+            dislike_count = float(stats.get('dislike', 0) or 0)
+            total = like_count + dislike_count
+            if total > 0:
+                # Net sentiment in [-1, 1]
+                sentiment = (like_count - dislike_count) / total
+                # Convert to small boost/penalty (max +/- 5%)
+                impact = max(-0.05, min(0.05, sentiment * 0.05))
+                if impact >= 0:
+                    company_boost += impact
+                else:
+                    company_penalty += abs(impact)
     except Exception:
-        pref_strength = 0.0
-    pref_strength = _clamp01(pref_strength)
+        pass
 
-    has_skills = bool(cand_skill_set)
-    has_loc = bool(location_pref)
-    has_sector = bool(sector_interests)
+    # Persisted global reputation (optional): small additional nudge, confidence-weighted by counts.
+    try:
+        rep_score = None
+        if isinstance(company_reputation, dict):
+            rep_score = company_reputation.get(company_key)
+            if rep_score is None and isinstance(company_key, str):
+                rep_score = company_reputation.get(company_key.strip().lower())
+
+        if rep_score is None and isinstance(company_reputation, dict):
+            # if keyed strictly by company_id but internship has it separately
+            cid = feat.raw_company_id
+            if cid:
+                rep_score = company_reputation.get(str(cid))
+
+        if rep_score is not None:
+            rep = float(rep_score)
+            # Convert 0..100 -> [-1,1] around neutral 50
+            sentiment = max(-1.0, min(1.0, (rep - 50.0) / 50.0))
+            # Confidence based on available global counts if present
+            conf = 0.3
+            if isinstance(stats, dict):
+                total = float((stats.get('like', 0) or 0) + (stats.get('dislike', 0) or 0))
+                conf = max(0.2, min(1.0, total / 25.0))
+            impact = max(-0.06, min(0.06, sentiment * 0.06 * conf))
+            if impact >= 0:
+                company_boost += impact
+            else:
+                company_penalty += abs(impact)
+    except Exception:
+        pass
 
+    # Global company reason-tag signal (all users): small extra nudge based on why
+    # people like/dislike the company.
+    try:
+        rs = company_reason_stats.get(company_key)
+        if not rs and isinstance(company_key, str):
+            rs = company_reason_stats.get(company_key.strip().lower())
+        if isinstance(rs, dict):
+            like_map = rs.get('like') or {}
+            dislike_map = rs.get('dislike') or {}
+
+            weighted = 0.0
+            total = 0.0
+            for tag, cnt in (like_map or {}).items():
+                w = float(_COMPANY_REASON_WEIGHTS.get(tag, 0.3))
+                c = float(cnt or 0)
+                if c <= 0:
+                    continue
+                weighted += abs(w) * c
+                total += abs(w) * c
+            for tag, cnt in (dislike_map or {}).items():
+                w = float(_COMPANY_REASON_WEIGHTS.get(tag, -0.3))
+                c = float(cnt or 0)
+                if c <= 0:
+                    continue
+                weighted -= abs(w) * c
+                total += abs(w) * c
+
+            if total > 0:
+                # Normalize into [-1, 1], then cap to a small magnitude.
+                s = max(-1.0, min(1.0, weighted / total))
+                extra = max(-0.02, min(0.02, s * 0.02))
+                if extra >= 0:
+                    company_boost += extra
+                else:
+                    company_penalty += abs(extra)
+    except Exception:
+        pass
+    
+    # Company rating boost (global)
+    if company_id in company_ratings:
+        avg_rating = company_ratings[company_id]
+        if avg_rating >= 4.5:
+            rating_boost = 0.05  # +5% for highly rated companies
+        elif avg_rating < 3.0:
+            company_penalty += 0.10  # Additional -10% for low-rated companies
+
+    return company_boost, company_penalty, rating_boost
+
+
+# ----------------- Personal preference signals -----------------
+def _recommendation_weights(has_skills, has_loc, has_sector, pref_strength,
+                            skill_weight, loc_weight, sector_weight, misc_weight):
+    """Adapt the base channel weights to the data available for this candidate.
+
+    The system avoids a single fixed formula by adjusting weights based on:
+    - availability of candidate data
+    - strength of learned preference profile
+    Returns (w_skill, w_loc, w_sector, w_misc) normalized to sum to 1.0.
+    """
     # Start from provided defaults, then adapt.
     w_skill = float(skill_weight)
     w_loc = float(loc_weight)
@@ -340,16 +542,13 @@ def get_recommendations(candidate, internships, top_n=10,
 
     # Normalize to sum to 1.0
     s_w = max(1e-9, w_skill + w_loc + w_sector + w_misc)
-    w_skill, w_loc, w_sector, w_misc = (w_skill / s_w, w_loc / s_w, w_sector / s_w, w_misc / s_w)
+    return (w_skill / s_w, w_loc / s_w, w_sector / s_w, w_misc / s_w)
 
-    field_of_study = (candidate.get("field_of_study") or "").strip().lower()
-    education_level = (candidate.get("education_level") or "").strip().lower()
-    is_first_gen = bool(candidate.get("first_generation") or candidate.get("no_experience"))
-    
-    # Build internship lookup for property-based learning
-    internships_by_id = {(i.get("internship_id") or i.get("_id", "")): i for i in internships or []}
-    
-    # Analyze internships to learn user preferences from interactions
+def _learn_interaction_patterns(internship_interactions, internships_by_id):
+    """Analyze liked/disliked internships to learn this user's preferences.
+
+    Returns (disliked_patterns, liked_patterns).
+    """
     disliked_patterns = {
         'locations': [],        # Cities to avoid
         'sectors': [],          # Sectors to penalize
@@ -371,117 +570,71 @@ def get_recommendations(candidate, internships, top_n=10,
         'skills_focus': 0       # likes due to skills fit
     }
 
-    def _duration_bucket(v):
-        if v is None:
-            return None
-        months = None
-        if isinstance(v, (int, float)):
-            months = int(v)
-        elif isinstance(v, str):
-            m = re.search(r"(\d+)", v)
-            if m:
-                months = int(m.group(1))
-        if months is None or months <= 0:
-            return None
-        if months <= 2:
-            return 'short'
-        if months <= 4:
-            return 'medium'
-        return 'long'
-
-    def _complexity_label(intern):
-        try:
-            skill_count = len(_normalize_skill_list(intern.get('skills_required', [])))
-        except Exception:
-            skill_count = 0
-        beginner = bool(intern.get('is_beginner_friendly'))
-        if beginner or skill_count <= 3:
-            return 'basic'
-        if (not beginner) and skill_count >= 6:
-            return 'advanced'
-        return 'medium'
-
-    def _learning_proxy(intern):
-        if intern.get('is_beginner_friendly'):
-            return True
-        desc = (intern.get('description') or '')
-        if isinstance(desc, str) and re.search(r"\b(learn|learning|training|mentor|mentorship)\b", desc.lower()):
-            return True
-        return False
-    
     for internship_id, interaction in internship_interactions.items():
         if not isinstance(interaction, dict):
             continue
         interaction_type = interaction.get('type')
         reason_tags = interaction.get('reason_tags', [])
-        base_internship = internships_by_id.get(internship_id)
+        base = internships_by_id.get(internship_id)
 
-        if not base_internship:
+        if not base:
             continue
 
         if interaction_type == 'dislike':
             # Learn location patterns to avoid
             if 'Poor location' in reason_tags:
-                loc = _safe_normalize_city(base_internship.get('location') or '')
-                if loc:
-                    disliked_patterns['locations'].append(loc)
+                if base.city:
+                    disliked_patterns['locations'].append(base.city)
 
             # Learn sector patterns to avoid
             if 'Not interested in sector' in reason_tags:
-                sector = (base_internship.get('sector') or '').strip().lower()
-                if sector:
-                    disliked_patterns['sectors'].append(sector)
+                if base.sector:
+                    disliked_patterns['sectors'].append(base.sector)
 
             # Learn stipend expectations
             if 'Low stipend' in reason_tags:
-                stipend = base_internship.get('stipend')
-                if stipend and isinstance(stipend, (int, float)):
+                stipend = base.stipend
+                if stipend:
                     if disliked_patterns['low_stipend'] is None or stipend > disliked_patterns['low_stipend']:
                         disliked_patterns['low_stipend'] = stipend
 
             # Learn skills to avoid
             if 'Skills mismatch' in reason_tags:
-                skills = _normalize_skill_list(base_internship.get('skills_required', []))
-                disliked_patterns['skills'].extend(skills)
+                disliked_patterns['skills'].extend(base.skills)
 
             if 'Duration issues' in reason_tags:
-                bucket = _duration_bucket(base_internship.get('duration'))
-                if bucket:
-                    disliked_patterns['duration_buckets'].append(bucket)
+                if base.duration_bucket:
+                    disliked_patterns['duration_buckets'].append(base.duration_bucket)
 
             if 'Too advanced/basic' in reason_tags:
-                disliked_patterns['complexity'].append(_complexity_label(base_internship))
+                disliked_patterns['complexity'].append(base.complexity)
 
             if 'Limited learning' in reason_tags:
                 disliked_patterns['learning'] += 1
 
             if 'Role doesn\'t fit' in reason_tags:
-                sector = (base_internship.get('sector') or '').strip().lower()
-                if sector:
-                    disliked_patterns['sectors'].append(sector)
+                if base.sector:
+                    disliked_patterns['sectors'].append(base.sector)
 
         if interaction_type == 'like':
             # Location preference
             if 'Great location' in reason_tags:
-                loc = _safe_normalize_city(base_internship.get('location') or '')
-                if loc:
-                    liked_patterns['locations'].append(loc)
+                if base.city:
+                    liked_patterns['locations'].append(base.city)
 
             # Skills and role fit
             if 'Skills match well' in reason_tags:
                 liked_patterns['skills_focus'] += 1
-                skills = _normalize_skill_list(base_internship.get('skills_required', []))
-                liked_patterns['skills'].extend(skills)
+                liked_patterns['skills'].extend(base.skills)
             if 'Perfect role fit' in reason_tags or 'Career relevant' in reason_tags:
                 liked_patterns['career'] += 1
-                sector = (base_internship.get('sector') or '').strip().lower()
-                if sector:
-                    liked_patterns['sectors'].append(sector)
+                if base.sector:
+                    liked_patterns['sectors'].append(base.sector)
 
             # Compensation preference
             if 'Good stipend' in reason_tags:
-                stipend = base_internship.get('stipend')
-                if isinstance(stipend, (int, float)):
+                stipend = base.stipend
+                if stipend is not None:
                     liked_patterns['min_stipend'] = max(float(liked_patterns['min_stipend'] or 0), float(stipend))
 
             # Learning preference
@@ -491,437 +644,537 @@ def get_recommendations(candidate, internships, top_n=10,
             # Reputation preference (use global ratings/sentiment as proxy later)
             if 'Reputable company' in reason_tags:
                 liked_patterns['reputable'] += 1
-    
-    # Extract liked company sectors for sector preference boost
-    liked_sectors = set()
-    for company_id, interaction in company_interactions.items():
-        if interaction == 'like':
-            # This would need company data to get sector - will add in integration
-            pass
 
-    scored = []
-    for internship in internships or []:
-        internship_skills = _normalize_skill_list(internship.get("skills_required", []))
-        internship_id = internship.get("internship_id") or internship.get("_id", "")
-        company_id = internship.get("company_id") or internship.get("organization", "")
-
-        skill_sim = skill_similarity(cand_skill_set, internship_skills)
-        loc_sim, dist_km, loc_reason = location_similarity(location_pref, internship.get("location", ""))
-        sector = (internship.get("sector") or "").strip().lower()
-        sector_sim = 1.0 if sector in sector_interests else 0.0
-        field_sim = 1.0 if field_of_study and field_of_study in sector else 0.0
-        edu_sim = 1.0 if education_level and education_level in (internship.get("title") or "").lower() else 0.0
-        fg_boost = 0.08 if is_first_gen and internship.get("is_beginner_friendly") else 0.0
-        
-        # --- Company interaction and rating factors ---
-        # Per product rules: company likes/dislikes are global signals.
-        company_boost = 0.0
-        company_penalty = 0.0
-        rating_boost = 0.0
-
-        # Global company like/dislike signal (all users)
-        company_key = None
-        try:
-            if isinstance(company_id, str) and company_id.strip():
-                company_key = company_id
-        except Exception:
-            company_key = None
-        if not company_key:
-            company_key = (internship.get('organization') or internship.get('company') or '').strip().lower()
+    return disliked_patterns, liked_patterns
+
+def _direct_interaction_adjustment(interaction):
+    """(internship_boost, internship_penalty) for an explicit like/dislike of this internship."""
+    internship_boost = 0.0
+    internship_penalty = 0.0
+    interaction_type = interaction.get('type') if isinstance(interaction, dict) else interaction
+    reason_tags = interaction.get('reason_tags', []) if isinstance(interaction, dict) else []
+
+    if interaction_type == 'like':
+        internship_boost = 0.20  # +20% boost for liked internships (personal)
+        # Additional boost based on reason tags
+        if 'Skills match well' in reason_tags or 'Perfect role fit' in reason_tags:
+            internship_boost += 0.05
+    elif interaction_type == 'dislike':
+        internship_penalty = 0.30  # -30% penalty for disliked internships (strong personal signal)
+        # Don't show if explicitly disliked
+        if 'Role doesn\'t fit' in reason_tags:
+            internship_penalty = 1.0
+    return internship_boost, internship_penalty
+
+# ----------------- Result assembly -----------------
+def _components_dict(values):
+    (skill_sim, loc_sim, loc_reason, sector_sim, field_sim, edu_sim, fg_boost,
+     company_boost, company_penalty, rating_boost,
+     internship_boost, internship_penalty, pattern_penalty, pattern_boost) = values
+    return {
+        "skill_sim": round(skill_sim, 2),
+        "loc_sim": round(loc_sim, 2),
+        "loc_reason": loc_reason,
+        "sector_sim": sector_sim,
+        "field_sim": field_sim,
+        "edu_sim": edu_sim,
+        "fg_boost": fg_boost,
+        "company_boost": company_boost,
+        "company_penalty": company_penalty,
+        "rating_boost": rating_boost,
+        "internship_boost": internship_boost,
+        "internship_penalty": internship_penalty,
+        "pattern_penalty": pattern_penalty,
+        "pattern_boost": pattern_boost
+    }
 
-        try:
-            stats = company_interaction_stats.get(company_key)
-            if not stats and isinstance(company_key, str):
-                stats = company_interaction_stats.get(company_key.strip().lower())
-            if isinstance(stats, dict):
-                like_count = float(stats.get('like', 0) or 0)
-                dislike_count = float(stats.get('dislike', 0) or 0)
-                total = like_count + dislike_count
-                if total > 0:
-                    # Net sentiment in [-1, 1]
-                    sentiment = (like_count - dislike_count) / total
-                    # Convert to small boost/penalty (max +/- 5%)
-                    impact = max(-0.05, min(0.05, sentiment * 0.05))
-                    if impact >= 0:
-                        company_boost += impact
-                    else:
-                        company_penalty += abs(impact)
-        except Exception:
-            pass
+def _reason_text(comps):
+    reason = []
+    if comps["skill_sim"] >= 0.6:
+        reason.append(f"Strong skill fit ({int(comps['skill_sim']*100)}%)")
+    elif comps["skill_sim"] > 0:
+        reason.append(f"Some skill match ({int(comps['skill_sim']*100)}%)")
+    if comps["loc_sim"] >= 0.9:
+        reason.append("Close to you")
+    elif comps["loc_sim"] >= 0.6:
+        reason.append("Within reasonable distance")
+    if comps["sector_sim"]:
+        reason.append("Sector match")
+    if comps["fg_boost"]:
+        reason.append("Good for beginners")
+    if comps["company_boost"]:
+        reason.append("You liked this company")
+    if comps["rating_boost"]:
+        reason.append("Highly rated company")
+    if comps["internship_boost"]:
+        reason.append("You showed interest in this")
+    if comps["internship_penalty"] and comps["internship_penalty"] < 1.0:
+        reason.append("Previously disliked")
+    if comps["pattern_penalty"] > 0:
+        if comps["pattern_penalty"] >= 0.12:
+            reason.append("Similar to disliked roles")
+        elif comps["pattern_penalty"] >= 0.08:
+            reason.append("May not match preferences")
+    if comps.get("pattern_boost", 0) > 0:
+        reason.append("Matches your preferences")
+    return ", ".join(reason) if reason else "Relevant"
+
+def _result_limit(top_n):
+    """top_n as a positive int, or None for "no limit" (None, 0, negative, invalid)."""
+    if top_n is None:
+        return None
+    try:
+        n = int(top_n)
+    except Exception:
+        return None
+    return n if n > 0 else None
 
-        # Persisted global reputation (optional): small additional nudge, confidence-weighted by counts.
-        try:
-            rep_score = None
-            if isinstance(company_reputation, dict):
-                rep_score = company_reputation.get(company_key)
-                if rep_score is None and isinstance(company_key, str):
-                    rep_score = company_reputation.get(company_key.strip().lower())
-
-            if rep_score is None and isinstance(company_reputation, dict):
-                # if keyed strictly by company_id but internship has it separately
-                cid = internship.get('company_id')
-                if cid:
-                    rep_score = company_reputation.get(str(cid))
-
-            if rep_score is not None:
-                rep = float(rep_score)
-                # Convert 0..100 -> [-1,1] around neutral 50
-                sentiment = max(-1.0, min(1.0, (rep - 50.0) / 50.0))
-                # Confidence based on available global counts if present
-                conf = 0.3
-                if isinstance(stats, dict):
-                    total = float((stats.get('like', 0) or 0) + (stats.get('dislike', 0) or 0))
-                    conf = max(0.2, min(1.0, total / 25.0))
-                impact = max(-0.06, min(0.06, sentiment * 0.06 * conf))
-                if impact >= 0:
-                    company_boost += impact
-                else:
-                    company_penalty += abs(impact)
-        except Exception:
-            pass
+def _top_k(rows, limit, dedupe_org):
+    """Pick the best `limit` rows ordered by (score desc, internship_id asc).
 
-        # Global company reason-tag signal (all users): small extra nudge based on why
-        # people like/dislike the company.
-        try:
-            rs = company_reason_stats.get(company_key)
-            if not rs and isinstance(company_key, str):
-                rs = company_reason_stats.get(company_key.strip().lower())
-            if isinstance(rs, dict):
-                like_map = rs.get('like') or {}
-                dislike_map = rs.get('dislike') or {}
-
-                reason_weights = {
-                    # positive
-                    'Great company culture': 1.0,
-                    'Excellent benefits': 0.8,
-                    'Good work-life balance': 1.0,
-                    'Strong reputation': 1.0,
-                    'Innovation focused': 0.7,
-                    'Learning opportunities': 0.9,
-                    'Career growth potential': 0.9,
-                    'Good management': 0.8,
-                    # negative
-                    'Poor work culture': -1.0,
-                    'Inadequate benefits': -0.8,
-                    'Bad work-life balance': -1.0,
-                    'Negative reviews': -0.9,
-                    'Limited growth': -0.8,
-                    'Poor management': -0.9,
-                    'Low compensation': -0.7,
-                    'Toxic environment': -1.2,
-                }
-
-                weighted = 0.0
-                total = 0.0
-                for tag, cnt in (like_map or {}).items():
-                    w = float(reason_weights.get(tag, 0.3))
-                    c = float(cnt or 0)
-                    if c <= 0:
-                        continue
-                    weighted += abs(w) * c
-                    total += abs(w) * c
-                for tag, cnt in (dislike_map or {}).items():
-                    w = float(reason_weights.get(tag, -0.3))
-                    c = float(cnt or 0)
-                    if c <= 0:
-                        continue
-                    weighted -= abs(w) * c
-                    total += abs(w) * c
-
-                if total > 0:
-                    # Normalize into [-1, 1], then cap to a small magnitude.
-                    s = max(-1.0, min(1.0, weighted / total))
-                    extra = max(-0.02, min(0.02, s * 0.02))
-                    if extra >= 0:
-                        company_boost += extra
-                    else:
-                        company_penalty += abs(extra)
-        except Exception:
-            pass
-        
-        # Company rating boost (global)
-        if company_id in company_ratings:
-            avg_rating = company_ratings[company_id]
-            if avg_rating >= 4.5:
-                rating_boost = 0.05  # +5% for highly rated companies
-            elif avg_rating < 3.0:
-                company_penalty += 0.10  # Additional -10% for low-rated companies
-        
-        # --- Internship interaction factors (personal preferences - only affects this user) ---
-        internship_boost = 0.0
-        internship_penalty = 0.0
-        pattern_penalty = 0.0  # Penalty from learned patterns
-        pattern_boost = 0.0    # Boost from learned patterns
-        
-        # Check if this internship matches disliked patterns
-        current_location = _safe_normalize_city(internship.get('location') or '')
-        current_sector = (internship.get('sector') or '').strip().lower()
-        current_stipend = internship.get('stipend')
-        current_skills = internship_skills
-        
-        # Location-based preference: smooth decay via distance matrix
-        if current_location:
-            try:
-                max_like = 0.0
-                for liked_loc in liked_patterns['locations']:
-                    if not liked_loc:
-                        continue
-                    if liked_loc == current_location:
-                        max_like = 1.0
-                        break
-                    d = _get_distance_between_cities(liked_loc, current_location)
-                    if math.isfinite(d) and d >= 0:
-                        max_like = max(max_like, _distance_decay(d, half_life_km=150.0))
-                if max_like > 0:
-                    pattern_boost += 0.08 * max_like
-            except Exception:
-                pass
-
-            try:
-                max_dislike = 0.0
-                for disliked_loc in disliked_patterns['locations']:
-                    if not disliked_loc:
-                        continue
-                    if disliked_loc == current_location:
-                        max_dislike = 1.0
-                        break
-                    d = _get_distance_between_cities(disliked_loc, current_location)
-                    if math.isfinite(d) and d >= 0:
-                        max_dislike = max(max_dislike, _distance_decay(d, half_life_km=150.0))
-                if max_dislike > 0:
-                    pattern_penalty += 0.10 * max_dislike
-            except Exception:
-                pass
-        
-        # Sector-based penalty (exact match)
-        if current_sector and current_sector in disliked_patterns['sectors']:
-            pattern_penalty += 0.15  # -15% for disliked sector
-
-        # Sector-based boost from likes
-        if current_sector and liked_patterns['sectors'] and current_sector in set(liked_patterns['sectors']):
-            pattern_boost += 0.06
-        
-        # Stipend-based penalty (if current stipend is at or below disliked threshold)
-        if disliked_patterns['low_stipend'] is not None and current_stipend:
-            if isinstance(current_stipend, (int, float)):
-                if current_stipend <= disliked_patterns['low_stipend']:
-                    pattern_penalty += 0.08  # -8% for low stipend
-                elif current_stipend <= disliked_patterns['low_stipend'] * 1.1:  # Within 10% above
-                    pattern_penalty += 0.04  # -4% for slightly better but still low stipend
-        
-        # Skills-based penalty (if significant overlap with disliked skills)
-        if disliked_patterns['skills']:
-            disliked_skill_set = set(_normalize_skill_list(disliked_patterns['skills']))
-            current_skill_set = set(current_skills)
-            overlap = disliked_skill_set & current_skill_set
-            if overlap:
-                overlap_ratio = len(overlap) / max(len(current_skill_set), 1)
-                if overlap_ratio >= 0.5:  # 50%+ skills are disliked
-                    pattern_penalty += 0.12  # -12% for high skill overlap
-                elif overlap_ratio >= 0.3:  # 30-50% overlap
-                    pattern_penalty += 0.06  # -6% for moderate skill overlap
-
-        # Skills-based boost from likes (nudge towards similar skill stacks)
-        if liked_patterns['skills']:
-            liked_skill_set = set(_normalize_skill_list(liked_patterns['skills']))
-            current_skill_set = set(current_skills)
-            overlap = liked_skill_set & current_skill_set
-            if overlap:
-                overlap_ratio = len(overlap) / max(len(current_skill_set), 1)
-                pattern_boost += min(0.06, 0.06 * overlap_ratio)
-
-        # Duration and complexity nudges
-        try:
-            if disliked_patterns['duration_buckets']:
-                b = _duration_bucket(internship.get('duration'))
-                if b and b in set(disliked_patterns['duration_buckets']):
-                    pattern_penalty += 0.04
-        except Exception:
-            pass
+    `rows` are (key, features, payload) tuples where key = (-score, sort_id, seq).
+    With dedupe_org only the best row of each organization can be returned, so it
+    is kept per org while scanning; the final pick is a bounded heap (O(n log k))
+    instead of sorting everything.
+    """
+    if dedupe_org:
+        best = {}
+        candidates = []
+        for row in rows:
+            org = row[1].org
+            if not org:
+                candidates.append(row)
+                continue
+            cur = best.get(org)
+            if cur is None or row[0] < cur[0]:
+                best[org] = row
+        candidates.extend(best.values())
+        rows = candidates
+    if limit is None:
+        return sorted(rows, key=itemgetter(0))
+    return heapq.nsmallest(limit, rows, key=itemgetter(0))
+
+def _select_results(rows, components_for, top_n, min_score, dedupe_org):
+    """Turn scored (score, internship, features, ref) rows into API results.
+
+    Rows may come in any order; ties keep their relative order. Components and
+    reason strings are only materialized (via `components_for(ref)`) for rows
+    that make it into the output.
+    """
+    threshold = float(min_score or 0)
+    keyed = (
+        ((-score, feat.sort_id, seq), feat, (score, internship, ref))
+        for seq, (score, internship, feat, ref) in enumerate(rows)
+        if score > threshold
+    )
 
-        try:
-            if disliked_patterns['complexity']:
-                cplx = _complexity_label(internship)
-                if cplx in set(disliked_patterns['complexity']):
-                    pattern_penalty += 0.04
-        except Exception:
-            pass
+    results = []
+    for _, _, (score, internship, ref) in _top_k(keyed, _result_limit(top_n), dedupe_org):
+        results.append(_result_row(internship, score, components_for(ref)))
+    return results
+
+def _result_row(internship, score, comps):
+    return {
+        "internship_id": internship.get("internship_id") or internship.get("id"),
+        "title": internship.get("title"),
+        "organization": internship.get("organization"),
+        "location": internship.get("location"),
+        "sector": internship.get("sector"),
+        "match_score": score,
+        "reason": _reason_text(comps),
+        "components": comps
+    }
+
+def _default_engine():
+    try:
+        from app.config import Config
+        return Config.RECOMMENDER_ENGINE
+    except Exception:
+        return 'loop'
 
-        # Learning preference nudges (proxy-based)
+def _score_features(ctx, feat, company_signals):
+    """Score one internship for a compiled CandidateContext.
+
+    Pure function of (context, internship features) plus the global company
+    signals. Returns (score_pct, component values) - see _components_dict.
+    """
+    company_interaction_stats, company_reputation, company_reason_stats, company_ratings = company_signals
+    w_skill, w_loc, w_sector, w_misc = ctx.weights
+
+    skill_sim = ctx.skill_coverage(feat.skills)
+    loc_sim, dist_km, loc_reason = _location_similarity_normalized(ctx.city, feat.city)
+    sector = feat.sector
+    sector_sim = 1.0 if sector in ctx.sector_interests else 0.0
+    field_sim = 1.0 if ctx.field_of_study and ctx.field_of_study in sector else 0.0
+    edu_sim = 1.0 if ctx.education_level and ctx.education_level in feat.title else 0.0
+    fg_boost = 0.08 if ctx.is_first_gen and feat.beginner else 0.0
+
+    # --- Company interaction and rating factors ---
+    # Per product rules: company likes/dislikes are global signals.
+    company_boost, company_penalty, rating_boost = _company_adjustments(
+        feat, company_interaction_stats, company_reputation, company_reason_stats, company_ratings
+    )
+
+    # --- Internship interaction factors (personal preferences - only affects this user) ---
+    internship_boost = 0.0
+    internship_penalty = 0.0
+    pattern_penalty = 0.0  # Penalty from learned patterns
+    pattern_boost = 0.0    # Boost from learned patterns
+
+    current_stipend = feat.stipend
+
+    # Location-based preference: smooth decay via distance matrix
+    if feat.city:
+        like_boost, dislike_penalty = ctx.location_adjustment(feat.city)
+        if like_boost:
+            pattern_boost += like_boost
+        if dislike_penalty:
+            pattern_penalty += dislike_penalty
+
+    # Sector-based penalty (exact match)
+    if sector and sector in ctx.disliked_sectors:
+        pattern_penalty += 0.15  # -15% for disliked sector
+
+    # Sector-based boost from likes
+    if sector and sector in ctx.liked_sectors:
+        pattern_boost += 0.06
+
+    # Stipend-based penalty (if current stipend is at or below disliked threshold)
+    if ctx.low_stipend is not None and current_stipend:
+        if current_stipend <= ctx.low_stipend:
+            pattern_penalty += 0.08  # -8% for low stipend
+        elif current_stipend <= ctx.low_stipend_soft:  # Within 10% above
+            pattern_penalty += 0.04  # -4% for slightly better but still low stipend
+
+    # Skills-based penalty (if significant overlap with disliked skills)
+    if ctx.disliked_skills:
+        overlap = ctx.disliked_skills & feat.skill_set
+        if overlap:
+            overlap_ratio = len(overlap) / max(len(feat.skill_set), 1)
+            if overlap_ratio >= 0.5:  # 50%+ skills are disliked
+                pattern_penalty += 0.12  # -12% for high skill overlap
+            elif overlap_ratio >= 0.3:  # 30-50% overlap
+                pattern_penalty += 0.06  # -6% for moderate skill overlap
+
+    # Skills-based boost from likes (nudge towards similar skill stacks)
+    if ctx.liked_skills:
+        overlap = ctx.liked_skills & feat.skill_set
+        if overlap:
+            overlap_ratio = len(overlap) / max(len(feat.skill_set), 1)
+            pattern_boost += min(0.06, 0.06 * overlap_ratio)
+
+    # Duration and complexity nudges
+    if feat.duration_bucket and feat.duration_bucket in ctx.disliked_durations:
+        pattern_penalty += 0.04
+    if ctx.disliked_complexity and feat.complexity in ctx.disliked_complexity:
+        pattern_penalty += 0.04
+
+    # Learning preference nudges (proxy-based)
+    if ctx.liked_learning and feat.learning:
+        pattern_boost += 0.04
+    if ctx.disliked_learning and not feat.learning:
+        pattern_penalty += 0.04
+
+    # Compensation preference: if they liked "Good stipend", prefer roles >= that level
+    if ctx.min_stipend and current_stipend is not None:
+        if current_stipend >= ctx.min_stipend:
+            pattern_boost += 0.04
+        elif current_stipend >= ctx.min_stipend_soft:
+            pattern_boost += 0.02
+
+    # Direct internship interaction (overrides pattern penalties if explicitly liked/disliked)
+    if feat.key in ctx.interactions:
+        internship_boost, internship_penalty = ctx.interactions[feat.key]
+
+    # Preference-profile extras (personal): work type + seniority + stipend minimum.
+    if ctx.work_type_boost is not None:
+        wt = ctx.work_type_boost.get(feat.work_type)
+        if wt:
+            pattern_boost += wt
+    if ctx.seniority_boost is not None:
+        sen = ctx.seniority_boost.get(feat.seniority)
+        if sen:
+            pattern_boost += sen
+        if ctx.stipend_floor is not None and current_stipend is not None:
+            if float(current_stipend) >= ctx.stipend_floor:
+                pattern_boost += ctx.stipend_floor_boost
+
+    base_score = (
+        w_skill * skill_sim +
+        w_loc * loc_sim +
+        w_sector * sector_sim +
+        w_misc * (0.5 * field_sim + 0.5 * edu_sim)
+    )
+    # Apply all factors (company global + internship personal + learned patterns)
+    score = base_score + fg_boost + company_boost + rating_boost + internship_boost + pattern_boost - company_penalty - internship_penalty - pattern_penalty
+    score = min(1.0, max(0.0, score))  # Clamp between 0 and 1
+    score_pct = round(score * 100, 1)
+
+    return score_pct, (
+        skill_sim, loc_sim, loc_reason, sector_sim, field_sim, edu_sim, fg_boost,
+        company_boost, company_penalty, rating_boost,
+        internship_boost, internship_penalty, pattern_penalty, pattern_boost,
+    )
+
+# ----------------- Upper-bound pruning (exact top-N) -----------------
+# Slack (in percent points) between an upper bound and a rounded score_pct:
+# round(score * 100, 1) can exceed score * 100 by 0.05, plus float noise.
+_UB_SLACK_PCT = 0.05 + 1e-6
+
+def _pattern_boost_ceiling(ctx):
+    """Largest pattern boost any internship can collect outside location/sector likes."""
+    ceiling = 0.0
+    if ctx.liked_skills:
+        ceiling += 0.06
+    if ctx.liked_learning:
+        ceiling += 0.04
+    if ctx.min_stipend:
+        ceiling += 0.04
+    if ctx.work_type_boost:
+        ceiling += max(0.0, max(ctx.work_type_boost.values()))
+    if ctx.seniority_boost is not None:
+        if ctx.seniority_boost:
+            ceiling += max(0.0, max(ctx.seniority_boost.values()))
+        if ctx.stipend_floor is not None:
+            ceiling += max(0.0, ctx.stipend_floor_boost)
+    return ceiling
+
+def _score_upper_bound(ctx, feat, loc_sim, company, pattern_ceiling):
+    """Cheap upper bound of _score_features: no fuzzy skill matching, no penalties from patterns."""
+    w_skill, w_loc, w_sector, w_misc = ctx.weights
+    # At most every candidate skill matches a distinct internship skill.
+    skill_ub = min(1.0, len(ctx.skills) / len(feat.skills)) if feat.skills else 0.0
+    sector = feat.sector
+    sector_sim = 1.0 if sector in ctx.sector_interests else 0.0
+    field_sim = 1.0 if ctx.field_of_study and ctx.field_of_study in sector else 0.0
+    edu_sim = 1.0 if ctx.education_level and ctx.education_level in feat.title else 0.0
+    fg_boost = 0.08 if ctx.is_first_gen and feat.beginner else 0.0
+    company_boost, company_penalty, rating_boost = company
+    internship_boost, internship_penalty = ctx.interactions.get(feat.key, (0.0, 0.0))
+
+    pattern_boost = pattern_ceiling
+    if feat.city:
+        pattern_boost += ctx.location_adjustment(feat.city)[0]
+    if sector and sector in ctx.liked_sectors:
+        pattern_boost += 0.06
+
+    return (
+        w_skill * skill_ub + w_loc * loc_sim + w_sector * sector_sim +
+        w_misc * (0.5 * field_sim + 0.5 * edu_sim) +
+        fg_boost + company_boost + rating_boost + internship_boost + pattern_boost -
+        company_penalty - internship_penalty
+    )
+
+def _score_pruned(ctx, internships, features, company_signals, limit, threshold, dedupe_org):
+    """Fully score only the internships whose upper bound can still reach the top `limit`.
+
+    Internships are visited in decreasing upper-bound order (threshold algorithm);
+    once the best remaining bound cannot beat the current K-th best score_pct
+    (org-deduped when dedupe_org) nothing else can enter the result. Rows are
+    returned in catalog order so tie-breaking matches exhaustive scoring.
+    """
+    company_interaction_stats, company_reputation, company_reason_stats, company_ratings = company_signals
+    pattern_ceiling = _pattern_boost_ceiling(ctx)
+    company_memo = {}
+    loc_memo = {}
+
+    bounds = []
+    for idx, feat in enumerate(features):
+        ckey = (feat.company_key, feat.rating_key, feat.raw_company_id)
         try:
-            if liked_patterns.get('learning', 0) > 0 and _learning_proxy(internship):
-                pattern_boost += 0.04
-            if disliked_patterns.get('learning', 0) > 0 and (not _learning_proxy(internship)):
-                pattern_penalty += 0.04
-        except Exception:
-            pass
+            company = company_memo.get(ckey)
+        except TypeError:
+            ckey, company = None, None
+        if company is None:
+            company = _company_adjustments(
+                feat, company_interaction_stats, company_reputation, company_reason_stats, company_ratings
+            )
+            if ckey is not None:
+                company_memo[ckey] = company
+        loc_sim = loc_memo.get(feat.city)
+        if loc_sim is None:
+            loc_sim = loc_memo[feat.city] = _location_similarity_normalized(ctx.city, feat.city)[0]
+
+        ub_pct = _score_upper_bound(ctx, feat, loc_sim, company, pattern_ceiling) * 100 + _UB_SLACK_PCT
+        if ub_pct <= threshold:
+            continue  # cannot pass min_score
+        bounds.append((-ub_pct, idx))
+    heapq.heapify(bounds)
+
+    scored = []
+    slots = {}  # org (or row) -> best score_pct so far
+    kth = None
+    while bounds:
+        neg_ub, idx = heapq.heappop(bounds)
+        if kth is not None and -neg_ub < kth:
+            break
+        feat = features[idx]
+        score_pct, values = _score_features(ctx, feat, company_signals)
+        scored.append((idx, score_pct, values))
+        if score_pct <= threshold:
+            continue
+        slot = feat.org if (dedupe_org and feat.org) else ('row', idx)
+        if score_pct > slots.get(slot, float('-inf')):
+            slots[slot] = score_pct
+            if len(slots) >= limit and (kth is None or score_pct > kth):
+                kth = heapq.nlargest(limit, slots.values())[-1]
+
+    scored.sort(key=itemgetter(0))
+    return [(score_pct, internships[idx], features[idx], values) for idx, score_pct, values in scored]
+
+# ----------------- Recommendations (keeps the original function name) -----------------
+def get_recommendations(candidate, internships, top_n=10,
+                        skill_weight=0.5, loc_weight=0.25,
+                        sector_weight=0.15, misc_weight=0.10,
+                        company_interactions=None, company_ratings=None,
+                        internship_interactions=None,
+                        company_interaction_stats=None,
+                        company_reason_stats=None,
+                        preference_profile=None,
+                        company_reputation=None,
+                        dedupe_org=True,
+                        min_score=0.0,
+                        engine=None,
+                        context=None):
+    """
+    Lightweight, explainable recommendation function that is compatible with
+    existing callers in your codebase.
+    Returns a list of up to top_n internship dicts with match_score and reason.
+    
+    New parameters:
+    - company_interactions: dict of {company_id: {'type': 'like'|'dislike', 'reason_tags': []}}
+    - company_ratings: dict of {company_id: average_rating} from reviews
+    - internship_interactions: dict of {internship_id: {'type': 'like'|'dislike', 'reason_tags': []}}
+    - engine: 'loop' (per-internship Python loop) or 'vectorized' (NumPy batch kernel,
+      see app.core.batch_scoring). Both return identical results; defaults to
+      Config.RECOMMENDER_ENGINE.
+    - context: a precompiled app.core.candidate_context.CandidateContext. When given,
+      candidate, internship_interactions, preference_profile and the weights are
+      ignored in favour of the context.
+    """
+    # company_interactions are the *current user's* company likes/dislikes.
+    # Per product rules: company interactions affect all users, so the model
+    # should prefer company_interaction_stats (global counts) for scoring.
+    company_signals = (
+        company_interaction_stats or {},
+        company_reputation,
+        company_reason_stats or {},
+        company_ratings or {},
+    )
+
+    # Precompiled per-internship features (normalized skills, city, sector, ...)
+    from app.core.feature_store import feature_store
+    internships = list(internships or [])
+    features = feature_store.features_for(internships)
+
+    if context is None:
+        # Learn this user's preferences from the interacted internships in the list
+        from app.core.candidate_context import compile_candidate_context
+        context = compile_candidate_context(
+            candidate, {f.key: f for f in features}, internship_interactions, preference_profile,
+            skill_weight, loc_weight, sector_weight, misc_weight,
+        )
 
-        # Compensation preference: if they liked "Good stipend", prefer roles >= that level
+    engine = (engine or _default_engine() or 'loop').strip().lower()
+    if engine == 'vectorized':
         try:
-            pref = liked_patterns.get('min_stipend')
-            if pref and isinstance(current_stipend, (int, float)):
-                if current_stipend >= float(pref):
-                    pattern_boost += 0.04
-                elif current_stipend >= float(pref) * 0.9:
-                    pattern_boost += 0.02
-        except Exception:
+            from app.core.batch_scoring import rank_catalog
+            rows, components_for = rank_catalog(
+                internships, features, context, company_signals,
+                limit=_result_limit(top_n),
+                min_score=min_score,
+                dedupe_org=dedupe_org,
+            )
+            return _select_results(rows, components_for, top_n, min_score, dedupe_org)
+        except ImportError:
+            # NumPy not installed: fall back to the loop engine.
             pass
-        
-        # Direct internship interaction (overrides pattern penalties if explicitly liked/disliked)
-        
-        if internship_id in internship_interactions:
-            interaction = internship_interactions[internship_id]
-            interaction_type = interaction.get('type') if isinstance(interaction, dict) else interaction
-            reason_tags = interaction.get('reason_tags', []) if isinstance(interaction, dict) else []
-            
-            if interaction_type == 'like':
-                internship_boost = 0.20  # +20% boost for liked internships (personal)
-                # Additional boost based on reason tags
-                if 'Skills match well' in reason_tags or 'Perfect role fit' in reason_tags:
-                    internship_boost += 0.05
-            elif interaction_type == 'dislike':
-                internship_penalty = 0.30  # -30% penalty for disliked internships (strong personal signal)
-                # Don't show if explicitly disliked
-                if 'Role doesn\'t fit' in reason_tags:
-                    internship_penalty = 1.0
-
-        # Preference-profile extras (personal): work type + seniority nudges.
+
+    limit = _result_limit(top_n)
+    if limit is not None:
+        # Exact top-N: skip internships whose upper bound cannot reach the result.
+        scored = _score_pruned(context, internships, features, company_signals,
+                               limit, float(min_score or 0), dedupe_org)
+        return _select_results(scored, _components_dict, top_n, min_score, dedupe_org)
+
+    scored = []
+    for internship, feat in zip(internships, features):
+        score_pct, values = _score_features(context, feat, company_signals)
+        scored.append((score_pct, internship, feat, values))
+
+    return _select_results(scored, _components_dict, top_n, min_score, dedupe_org)
+
+def score_internships(candidate, internships,
+                      skill_weight=0.5, loc_weight=0.25,
+                      sector_weight=0.15, misc_weight=0.10,
+                      internship_interactions=None,
+                      interacted_features=None,
+                      company_interaction_stats=None,
+                      company_reason_stats=None,
+                      company_ratings=None,
+                      company_reputation=None,
+                      preference_profile=None,
+                      engine=None,
+                      context=None):
+    """Score the given internships for a candidate, one result row each, in input order.
+
+    Each row is the internship's row in get_recommendations(..., min_score=0)
+    over a list containing it and the candidate's interacted internships, but
+    nothing is ranked, filtered or deduplicated. `interacted_features` maps
+    interacted internship ids to compiled InternshipFeatures (used to learn the
+    candidate's patterns when no precompiled `context` is given). Rows are
+    returned whatever the score; get_recommendations would leave out the ones
+    with match_score 0.
+    """
+    from app.core.feature_store import feature_store
+    internships = list(internships or [])
+    features = feature_store.features_for(internships)
+
+    if context is None:
+        from app.core.candidate_context import compile_candidate_context
+        features_by_id = dict(interacted_features or {})
+        for feat in features:
+            features_by_id.setdefault(feat.key, feat)
+        context = compile_candidate_context(
+            candidate, features_by_id, internship_interactions, preference_profile,
+            skill_weight, loc_weight, sector_weight, misc_weight,
+        )
+
+    company_signals = (
+        company_interaction_stats or {},
+        company_reputation,
+        company_reason_stats or {},
+        company_ratings or {},
+    )
+
+    engine = (engine or _default_engine() or 'loop').strip().lower()
+    if engine == 'vectorized' and internships:
         try:
-            if isinstance(preference_profile, dict) and preference_profile.get('strength', 0) and pref_strength > 0:
-                # work type
-                wt_list = preference_profile.get('work_type') or []
-                wt_map = {k: float(v) for k, v in wt_list if k}
-                intern_wt = 'unknown'
-                loc_text = (internship.get('location') or '')
-                s_loc = str(loc_text).lower()
-                if 'hybrid' in s_loc:
-                    intern_wt = 'hybrid'
-                elif 'remote' in s_loc or 'wfh' in s_loc or 'work from home' in s_loc:
-                    intern_wt = 'remote'
-                elif s_loc.strip():
-                    intern_wt = 'onsite'
-                wt_score = wt_map.get(intern_wt, 0.0)
-                if wt_score:
-                    pattern_boost += max(-0.03, min(0.03, 0.02 * wt_score * pref_strength))
-
-                # seniority
-                sen_list = preference_profile.get('seniority') or []
-                sen_map = {k: float(v) for k, v in sen_list if k}
-                title_text = str(internship.get('title') or '').lower()
-                intern_sen = 'mid'
-                if any(k in title_text for k in ('senior', 'lead', 'principal', 'staff')):
-                    intern_sen = 'senior'
-                elif any(k in title_text for k in ('junior', 'entry', 'fresher')):
-                    intern_sen = 'junior'
-                sen_score = sen_map.get(intern_sen, 0.0)
-                if sen_score:
-                    pattern_boost += max(-0.03, min(0.03, 0.02 * sen_score * pref_strength))
-
-                # stipend minimum preference (slight)
-                try:
-                    pref_min = (preference_profile.get('stipend') or {}).get('min_preferred')
-                    if pref_min and isinstance(current_stipend, (int, float)):
-                        if float(current_stipend) >= float(pref_min):
-                            pattern_boost += 0.02 * pref_strength
-                except Exception:
-                    pass
-        except Exception:
+            from app.core.batch_scoring import rank_catalog
+            rows, components_for = rank_catalog(
+                internships, features, context, company_signals,
+                min_score=-1.0, dedupe_org=False, cache_columns=False,
+            )
+            return [_result_row(internship, score_pct, components_for(ref))
+                    for score_pct, internship, _, ref in rows]
+        except ImportError:
+            # NumPy not installed: fall back to the loop engine.
             pass
 
-        base_score = (
-            w_skill * skill_sim +
-            w_loc * loc_sim +
-            w_sector * sector_sim +
-            w_misc * (0.5 * field_sim + 0.5 * edu_sim)
-        )
-        # Apply all factors (company global + internship personal + learned patterns)
-        score = base_score + fg_boost + company_boost + rating_boost + internship_boost + pattern_boost - company_penalty - internship_penalty - pattern_penalty
-        score = min(1.0, max(0.0, score))  # Clamp between 0 and 1
-        score_pct = round(score * 100, 1)
-
-        scored.append({
-            "internship": internship,
-            "score": score_pct,
-            "components": {
-                "skill_sim": round(skill_sim, 2),
-                "loc_sim": round(loc_sim, 2),
-                "loc_reason": loc_reason,
-                "sector_sim": sector_sim,
-                "field_sim": field_sim,
-                "edu_sim": edu_sim,
-                "fg_boost": fg_boost,
-                "company_boost": company_boost,
-                "company_penalty": company_penalty,
-                "rating_boost": rating_boost,
-                "internship_boost": internship_boost,
-                "internship_penalty": internship_penalty,
-                "pattern_penalty": pattern_penalty,
-                "pattern_boost": pattern_boost
-            }
-        })
-
-    scored.sort(key=lambda x: (-x["score"], x["internship"].get("internship_id") or ""))
     results = []
-    seen_orgs = set()
-    for item in scored:
-        if item.get('score', 0) <= float(min_score or 0):
-            continue
-        org = (item["internship"].get("organization") or "").strip().lower()
-        if dedupe_org:
-            if org and org in seen_orgs:
-                continue
-        comps = item["components"]
-        reason = []
-        if comps["skill_sim"] >= 0.6:
-            reason.append(f"Strong skill fit ({int(comps['skill_sim']*100)}%)")
-        elif comps["skill_sim"] > 0:
-            reason.append(f"Some skill match ({int(comps['skill_sim']*100)}%)")
-        if comps["loc_sim"] >= 0.9:
-            reason.append("Close to you")
-        elif comps["loc_sim"] >= 0.6:
-            reason.append("Within reasonable distance")
-        if comps["sector_sim"]:
-            reason.append("Sector match")
-        if comps["fg_boost"]:
-            reason.append("Good for beginners")
-        if comps["company_boost"]:
-            reason.append("You liked this company")
-        if comps["rating_boost"]:
-            reason.append("Highly rated company")
-        if comps["internship_boost"]:
-            reason.append("You showed interest in this")
-        if comps["internship_penalty"] and comps["internship_penalty"] < 1.0:
-            reason.append("Previously disliked")
-        if comps["pattern_penalty"] > 0:
-            if comps["pattern_penalty"] >= 0.12:
-                reason.append("Similar to disliked roles")
-            elif comps["pattern_penalty"] >= 0.08:
-                reason.append("May not match preferences")
-        if comps.get("pattern_boost", 0) > 0:
-            reason.append("Matches your preferences")
-
-        results.append({
-            "internship_id": item["internship"].get("internship_id") or item["internship"].get("id"),
-            "title": item["internship"].get("title"),
-            "organization": item["internship"].get("organization"),
-            "location": item["internship"].get("location"),
-            "sector": item["internship"].get("sector"),
-            "match_score": item["score"],
-            "reason": ", ".join(reason) if reason else "Relevant",
-            "components": comps
-        })
-        if org:
-            seen_orgs.add(org)
-        if top_n is not None:
-            try:
-                n = int(top_n)
-            except Exception:
-                n = None
-            if n is not None and n > 0 and len(results) >= n:
-                break
-
+    for internship, feat in zip(internships, features):
+        score_pct, values = _score_features(context, feat, company_signals)
+        results.append(_result_row(internship, score_pct, _components_dict(values)))
     return results
 
+def score_internship(candidate, internship, **kwargs):
+    """Score a single internship for a candidate (the internship detail view).
+
+    Same arguments as score_internships; returns the one result row.
+    """
+    kwargs.setdefault('engine', 'loop')
+    return score_internships(candidate, [internship], **kwargs)[0]
+
 # compatibility aliases (if other files import old helpers directly)
 location_tier_score = location_similarity
 _get_distance_between_cities = _get_distance_between_cities
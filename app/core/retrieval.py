@@ -0,0 +1,173 @@
+# app/core/retrieval.py
+"""
+Candidate generation for recommendations (stage 1 of 2).
+
+Scoring the whole catalog on every request stops fitting the latency budget
+once the catalog is large. This module keeps inverted indexes over the
+compiled internship features:
+
+- skill (vocabulary id) -> rows
+- sector -> rows
+- city -> rows
+
+and pulls a bounded pool for a CandidateContext: rows reached through the
+candidate's skills (expanded with the fuzzy/token equivalences from
+`skill_index`), sector interests and cities within scoring distance, ranked by
+a cheap partial score (the same skill coverage / location / sector channels the
+full scorer uses). Liked and bookmarked internships are always included. The
+full `get_recommendations` scorer then re-ranks the pool (stage 2).
+
+`pool_size` is the recall knob: `scripts/benchmark_retrieval.py` measures
+recall@10 of the two-stage result against exhaustive scoring.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from app.core.ml_model import _location_similarity_normalized
+from app.core.skill_index import skill_vocabulary
+
+
+DEFAULT_POOL_SIZE = 2000
+
+
+class RetrievalIndex:
+    """Inverted indexes over one catalog of InternshipFeatures."""
+
+    def __init__(self, features: Sequence[Any]):
+        self.features = list(features)
+        self.vocabulary_version = skill_vocabulary.version
+        skill_vocabulary.add_many(s for f in self.features for s in f.skills)
+
+        self.skill_postings: Dict[int, List[int]] = {}
+        self.sector_postings: Dict[str, List[int]] = {}
+        self.city_postings: Dict[str, List[int]] = {}
+        self.rows_by_key: Dict[Any, List[int]] = {}
+        self.skill_counts: List[int] = []
+        # candidate city -> {catalog city: loc_sim} (bounded memo)
+        self._loc_cache: Dict[str, Dict[str, float]] = {}
+
+        ids = skill_vocabulary.ids
+        for row, f in enumerate(self.features):
+            for s in f.skills:
+                self.skill_postings.setdefault(ids[s], []).append(row)
+            self.skill_counts.append(len(f.skills))
+            if f.sector:
+                self.sector_postings.setdefault(f.sector, []).append(row)
+            if f.city:
+                self.city_postings.setdefault(f.city, []).append(row)
+            try:
+                self.rows_by_key.setdefault(f.key, []).append(row)
+            except TypeError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _skill_coverage(self, skills: Iterable[str]) -> Dict[int, float]:
+        """Exact skill coverage (as in skill_similarity) for every row sharing a matching skill."""
+        matched: Dict[int, int] = {}
+        for skill in {s for s in skills if isinstance(s, str) and s}:
+            hit_rows = set()
+            for term_id in skill_vocabulary.match_ids(skill).tolist():
+                hit_rows.update(self.skill_postings.get(term_id, ()))
+            for row in hit_rows:
+                matched[row] = matched.get(row, 0) + 1
+        counts = self.skill_counts
+        return {row: min(1.0, m / max(1, counts[row])) for row, m in matched.items()}
+
+    def _location_scores(self, cand_city: str) -> Dict[str, float]:
+        cached = self._loc_cache.get(cand_city)
+        if cached is None:
+            cached = {}
+            if cand_city:
+                for city in self.city_postings:
+                    loc_sim = _location_similarity_normalized(cand_city, city)[0]
+                    if loc_sim > 0:
+                        cached[city] = loc_sim
+            if len(self._loc_cache) >= 256:
+                self._loc_cache.clear()
+            self._loc_cache[cand_city] = cached
+        return cached
+
+    def partial_scores(self, ctx) -> Dict[int, float]:
+        """Cheap partial score of every row reachable from the context's signals."""
+        w_skill, w_loc, w_sector, _ = ctx.weights
+        scores: Dict[int, float] = {}
+
+        for row, cov in self._skill_coverage(ctx.skills).items():
+            scores[row] = w_skill * cov
+
+        loc_scores = self._location_scores(ctx.city)
+        for city, rows in self.city_postings.items():
+            value = w_loc * loc_scores.get(city, 0.0) + ctx.location_adjustment(city)[0]
+            if value > 0:
+                for row in rows:
+                    scores[row] = scores.get(row, 0.0) + value
+
+        for sector, rows in self.sector_postings.items():
+            value = (w_sector if sector in ctx.sector_interests else 0.0) + (0.06 if sector in ctx.liked_sectors else 0.0)
+            if value > 0:
+                for row in rows:
+                    scores[row] = scores.get(row, 0.0) + value
+        return scores
+
+    def candidate_rows(self, ctx, pool_size: int = DEFAULT_POOL_SIZE,
+                       always_include: Optional[Iterable[Any]] = None) -> List[int]:
+        """Rows of the candidate pool, in catalog order."""
+        n = len(self.features)
+        if pool_size is None or pool_size <= 0 or n <= pool_size:
+            return list(range(n))
+
+        picked = set()
+        for key in always_include or []:
+            picked.update(self.rows_by_key.get(key, ()))
+
+        scores = self.partial_scores(ctx)
+        budget = max(0, pool_size - len(picked))
+        best = heapq.nlargest(budget, ((s, -row) for row, s in scores.items() if row not in picked))
+        picked.update(-neg_row for _, neg_row in best)
+
+        # Not enough signal to fill the pool: top up in catalog order.
+        if len(picked) < pool_size:
+            for row in range(n):
+                if row not in picked:
+                    picked.add(row)
+                    if len(picked) >= pool_size:
+                        break
+        return sorted(picked)
+
+
+_index_lock = threading.Lock()
+_last_index: Optional[Tuple[Tuple[int, ...], RetrievalIndex]] = None
+
+
+def retrieval_index(features: Sequence[Any]) -> RetrievalIndex:
+    """Index for this catalog, rebuilt only when the compiled catalog changes."""
+    global _last_index
+    token = tuple(map(id, features))
+    cached = _last_index
+    if cached is not None and cached[0] == token and cached[1].vocabulary_version == skill_vocabulary.version:
+        return cached[1]
+    with _index_lock:
+        cached = _last_index
+        if cached is not None and cached[0] == token and cached[1].vocabulary_version == skill_vocabulary.version:
+            return cached[1]
+        index = RetrievalIndex(features)
+        _last_index = (token, index)
+        return index
+
+
+def retrieve_candidates(internships: Sequence[Mapping[str, Any]], ctx, pool_size: int = DEFAULT_POOL_SIZE,
+                        always_include: Optional[Iterable[Any]] = None) -> List[Mapping[str, Any]]:
+    """Bounded candidate pool (a subset of `internships`, same order) for re-ranking."""
+    from app.core.feature_store import feature_store
+
+    internships = list(internships or [])
+    if pool_size is None or pool_size <= 0 or len(internships) <= pool_size:
+        return internships
+    index = retrieval_index(feature_store.features_for(internships))
+    return [internships[row] for row in index.candidate_rows(ctx, pool_size, always_include)]
@@ -0,0 +1,282 @@
+# app/core/similar_internships.py
+"""
+Precomputed "similar internships" neighbor lists.
+
+`/recommendations/by_internship/<id>` used to rank the whole catalog for a
+pseudo-candidate built from the base internship (its skills, sector and
+location) on every call, although the answer only changes with the catalog.
+`SimilarInternshipIndex` keeps the top-K list of every internship, scored the
+same way, so the endpoint is a lookup:
+
+- a full build is one vectorized pass (`batch_scoring.rank_catalog`) per
+  internship over the shared catalog columns;
+- after a catalog change only the lists that can change are recomputed: the
+  added/edited internships' own lists, lists that contained a changed or
+  removed internship, and lists a changed internship now scores into.
+
+Changes are detected through the feature store: an internship whose document
+changed gets a new `InternshipFeatures` record. Lists are also written to the
+`internship_neighbors` collection so a fresh process can answer before its
+first build. Needs NumPy (the vectorized kernel).
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from app.core.batch_scoring import rank_catalog
+from app.core.candidate_context import compile_candidate_context
+from app.core.feature_store import feature_store
+from app.core.ml_model import _score_features, _select_results
+
+try:
+    from pymongo import DeleteMany, UpdateOne
+except Exception:  # pragma: no cover
+    DeleteMany = UpdateOne = None
+
+
+DEFAULT_NEIGHBORS = 10
+# Weights tilted towards skill/sector for the "similarity" use-case
+SIMILARITY_WEIGHTS = {'skill_weight': 0.6, 'loc_weight': 0.15, 'sector_weight': 0.2, 'misc_weight': 0.05}
+# Above this share of changed internships a full rebuild is cheaper than patching
+_FULL_REBUILD_FRACTION = 0.2
+# Similarity ignores company likes, ratings and reputation
+_NO_COMPANY_SIGNALS = ({}, None, {}, {})
+
+
+def pseudo_candidate(internship: Mapping[str, Any]) -> Dict[str, Any]:
+    """The candidate profile an internship's similar internships are ranked for."""
+    return {
+        "skills_possessed": internship.get("skills_required", []),
+        "sector_interests": [str(internship.get("sector", "")).lower()] if internship.get("sector") else [],
+        "location_preference": internship.get("location", ""),
+        # keep other fields empty; ML handles missing gracefully
+    }
+
+
+def similarity_context(internship: Mapping[str, Any]):
+    return compile_candidate_context(pseudo_candidate(internship), **SIMILARITY_WEIGHTS)
+
+
+def _config_neighbors() -> int:
+    try:
+        from app.config import Config
+        return int(getattr(Config, 'SIMILAR_INTERNSHIPS_K', DEFAULT_NEIGHBORS))
+    except Exception:
+        return DEFAULT_NEIGHBORS
+
+
+class _Catalog:
+    """One catalog load with the lookups the builder needs."""
+
+    def __init__(self, internships: Sequence[Mapping[str, Any]], features: Sequence[Any]):
+        self.internships = internships
+        self.features = features
+        self.rows_by_id: Dict[str, List[int]] = {}
+        for row, internship in enumerate(internships):
+            iid = internship.get('internship_id')
+            if iid:
+                self.rows_by_id.setdefault(str(iid), []).append(row)
+        # Neighbor rows get skills from the (last) document with their id; descriptions are
+        # added from the catalog snapshot when the list is served
+        self.by_id = {i.get('internship_id'): i for i in internships}
+        # Every Mongo document has a key (internship_id, else _id); duplicates are kept together
+        self.by_key: Dict[str, Tuple[Any, ...]] = {}
+        for feat in features:
+            if feat.key:
+                self.by_key[feat.key] = self.by_key.get(feat.key, ()) + (feat,)
+
+
+class SimilarInternshipIndex:
+    """Top-K similar internships for every internship of the catalog."""
+
+    def __init__(self, k: Optional[int] = None):
+        self._k = k
+        self._lists: Dict[str, Dict[str, Any]] = {}
+        self._features: Dict[str, Any] = {}
+        self._contexts: Dict[str, Any] = {}
+        self._build_lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self._pending: Optional[Tuple[Any, ...]] = None
+        self._thread: Optional[threading.Thread] = None
+        self.catalog_version: Optional[int] = None
+        self.builds = 0
+        self.updates = 0
+        self.lists_computed = 0
+
+    @property
+    def k(self) -> int:
+        return _config_neighbors() if self._k is None else self._k
+
+    @property
+    def ready(self) -> bool:
+        return self.catalog_version is not None
+
+    def neighbors(self, internship_id: Any) -> Optional[Dict[str, Any]]:
+        """{'internship_id', 'title', 'neighbors'} for an internship, or None if not indexed."""
+        return self._lists.get(str(internship_id))
+
+    def _compute(self, catalog: _Catalog, base_id: str) -> Dict[str, Any]:
+        rows = catalog.rows_by_id[base_id]
+        base = catalog.internships[rows[0]]
+        ctx = self._contexts.get(base_id)
+        if ctx is None:
+            ctx = self._contexts[base_id] = similarity_context(base)
+        scored, components_for = rank_catalog(
+            catalog.internships, catalog.features, ctx, _NO_COMPANY_SIGNALS,
+            limit=self.k, min_score=0.0, dedupe_org=True, exclude_rows=rows,
+        )
+        neighbors = []
+        for r in _select_results(scored, components_for, self.k, 0.0, True):
+            doc = catalog.by_id.get(r.get("internship_id"), {})
+            neighbors.append({
+                **r,
+                "skills_required": doc.get("skills_required", r.get("skills_required", [])),
+            })
+        self.lists_computed += 1
+        return {'internship_id': base_id, 'title': base.get('title'), 'neighbors': neighbors}
+
+    def _can_change(self, entry: Dict[str, Any], changed: List[Any], touched_ids: set) -> bool:
+        """Whether changing/removing `touched_ids` (with new `changed` features) can alter this list."""
+        neighbors = entry['neighbors']
+        if any(n.get('internship_id') in touched_ids for n in neighbors):
+            return True
+        ctx = self._contexts.get(entry['internship_id'])
+        if ctx is None:
+            return True
+        kth = neighbors[-1]['match_score'] if len(neighbors) >= self.k else 0.0
+        for feat in changed:
+            if feat.sort_id == entry['internship_id']:
+                continue  # the base's own duplicates are excluded
+            score_pct, _ = _score_features(ctx, feat, _NO_COMPANY_SIGNALS)
+            if score_pct > 0 and score_pct >= kth:
+                return True
+        return False
+
+    def refresh(self, internships: Sequence[Mapping[str, Any]], features: Optional[Sequence[Any]] = None,
+                version: Optional[int] = None) -> Tuple[List[str], List[str], bool]:
+        """Bring the lists up to date with a catalog load.
+
+        Returns (updated ids, removed ids, whether every list was rebuilt).
+        """
+        internships = list(internships or [])
+        features = list(features) if features is not None else feature_store.features_for(internships)
+        with self._build_lock:
+            catalog = _Catalog(internships, features)
+            # Recompiled (edited) documents get new feature records
+            changed, removed, touched_keys = [], [], 0
+            for key, feats in catalog.by_key.items():
+                old = self._features.get(key, ())
+                if len(old) != len(feats) or any(a is not b for a, b in zip(old, feats)):
+                    changed.extend(feats)
+                    removed.extend(old)
+                    touched_keys += 1
+            for key, old in self._features.items():
+                if key not in catalog.by_key:
+                    removed.extend(old)
+                    touched_keys += 1
+            live_ids = set(catalog.rows_by_id)
+
+            full = not self._lists or touched_keys > _FULL_REBUILD_FRACTION * max(len(catalog.by_key), 1)
+            if full:
+                self._contexts = {}
+                affected = set(live_ids)
+            else:
+                touched_ids = {f.sort_id or None for f in changed} | {f.sort_id or None for f in removed}
+                for feat in changed:
+                    self._contexts.pop(feat.sort_id, None)
+                affected = {f.sort_id for f in changed if f.sort_id in live_ids}
+                for base_id, entry in self._lists.items():
+                    if base_id in live_ids and base_id not in affected and self._can_change(entry, changed, touched_ids):
+                        affected.add(base_id)
+
+            lists = dict(self._lists)
+            for base_id in affected:
+                lists[base_id] = self._compute(catalog, base_id)
+            dropped = [base_id for base_id in lists if base_id not in live_ids]
+            for base_id in dropped:
+                del lists[base_id]
+                self._contexts.pop(base_id, None)
+
+            self._lists = lists
+            self._features = catalog.by_key
+            self.catalog_version = version
+            if full:
+                self.builds += 1
+            else:
+                self.updates += 1
+            return sorted(affected), dropped, full
+
+    def schedule_refresh(self, internships: Sequence[Mapping[str, Any]], features: Sequence[Any],
+                         version: int) -> None:
+        """Refresh in the background after a catalog load (the latest load wins)."""
+        if version == self.catalog_version:
+            return
+        with self._queue_lock:
+            self._pending = (list(internships), list(features), version)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='similar-internships', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        from app.core.database import db_manager
+        from app.utils.logger import app_logger
+
+        while True:
+            with self._queue_lock:
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    self._thread = None
+                    return
+            internships, features, version = pending
+            if version == self.catalog_version:
+                continue
+            try:
+                updated, removed, full = self.refresh(internships, features, version)
+                lists = self._lists
+                save_neighbor_lists(db_manager.current_db(), [lists[i] for i in updated], removed, full=full)
+            except Exception as e:
+                app_logger.warning(f"Could not refresh similar internships: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'lists': len(self._lists),
+            'k': self.k,
+            'catalog_version': self.catalog_version,
+            'builds': self.builds,
+            'updates': self.updates,
+            'lists_computed': self.lists_computed,
+        }
+
+
+def save_neighbor_lists(db, entries: Iterable[Mapping[str, Any]], removed: Iterable[str] = (),
+                        full: bool = False, now: Optional[datetime] = None) -> int:
+    """Upsert neighbor lists into `internship_neighbors`; with full=True drop every other list."""
+    if db is None or UpdateOne is None:
+        return 0
+    now = now or datetime.utcnow()
+    entries = list(entries)
+    ops = [
+        UpdateOne({'internship_id': e['internship_id']}, {'$set': {**e, 'updated_at': now}}, upsert=True)
+        for e in entries
+    ]
+    removed = list(removed)
+    if full:
+        ops.append(DeleteMany({'internship_id': {'$nin': [e['internship_id'] for e in entries]}}))
+    elif removed:
+        ops.append(DeleteMany({'internship_id': {'$in': removed}}))
+    if ops:
+        db['internship_neighbors'].bulk_write(ops, ordered=False)
+    return len(entries)
+
+
+def load_neighbor_list(db, internship_id: Any) -> Optional[Dict[str, Any]]:
+    """Stored neighbor list of one internship (None if missing)."""
+    if db is None:
+        return None
+    return db['internship_neighbors'].find_one({'internship_id': str(internship_id)}, {'_id': 0, 'updated_at': 0})
+
+
+similar_internships = SimilarInternshipIndex()
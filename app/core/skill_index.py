@@ -0,0 +1,257 @@
+# app/core/skill_index.py
+"""
+Interned skill vocabulary and sparse skill-match matrix.
+
+`skill_similarity` decides whether a candidate skill matches an internship skill
+with `fuzz.partial_ratio` and, failing that, a token Jaccard score. Both only
+depend on the two skill strings, so the relation can be computed once per pair
+of *vocabulary* entries instead of once per request:
+
+- every normalized catalog skill (`skills_required` and the canonical side of
+  `skills_synonyms`) gets an integer id; candidate skills outside the
+  vocabulary are matched against it per request and never interned,
+- equivalences between entries are computed in bulk with `process.cdist`
+  (fuzzy) and a token inverted index (Jaccard), and cached per entry,
+- a catalog's skill stacks are stored as a CSR matrix of skill ids, so the
+  coverage of one candidate against every row is a few sparse mat-vec products,
+- engines that score one internship at a time (the loop engine, pruned top-N,
+  similar-list invalidation) use `CandidateSkills`: the candidate's match ids are
+  resolved once and each distinct skill stack is scored once by set lookups.
+
+Results are identical to `ml_model.skill_similarity` with the default threshold.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from app.core.ml_model import _tokenize, skill_similarity
+from app.core.skill_synonyms import skill_synonyms
+
+
+FUZZY_THRESHOLD = 85
+JACCARD_THRESHOLD = 0.5
+# Rows of the fuzzy score matrix computed per cdist call when extending the vocabulary.
+_CDIST_BLOCK = 512
+
+
+class SkillVocabulary:
+    """Thread-safe skill -> id mapping with precomputed match relations.
+
+    `matches(q)` holds the ids of every vocabulary skill `s` for which a
+    candidate skill `q` counts as matched in `skill_similarity`
+    (partial_ratio(q, s) >= 85 or token Jaccard >= 0.5).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.ids: Dict[str, int] = {}
+            self.terms: List[str] = []
+            self._tokens: List[frozenset] = []
+            self._by_token: Dict[str, List[int]] = {}
+            self._matches: List[set] = []
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add_many(self, terms: Iterable[str]) -> None:
+        """Intern new skills and extend the match relation in bulk."""
+        new_terms = []
+        seen = set()
+        for t in terms:
+            if isinstance(t, str) and t and t not in self.ids and t not in seen:
+                seen.add(t)
+                new_terms.append(t)
+        if not new_terms:
+            return
+
+        with self._lock:
+            new_terms = [t for t in new_terms if t not in self.ids]
+            if not new_terms:
+                return
+            start = len(self.terms)
+            for t in new_terms:
+                tid = len(self.terms)
+                self.ids[t] = tid
+                self.terms.append(t)
+                tokens = frozenset(_tokenize(t))
+                self._tokens.append(tokens)
+                for tok in tokens:
+                    self._by_token.setdefault(tok, []).append(tid)
+                self._matches.append(set())
+            self._extend_fuzzy(start)
+            self._extend_token_overlap(start)
+
+    def _extend_fuzzy(self, start: int) -> None:
+        terms = self.terms
+        new = terms[start:]
+        # new skills as queries against the whole vocabulary ...
+        for b in range(0, len(new), _CDIST_BLOCK):
+            block = new[b:b + _CDIST_BLOCK]
+            scores = process.cdist(block, terms, scorer=fuzz.partial_ratio,
+                                   score_cutoff=FUZZY_THRESHOLD, dtype=np.float64, workers=-1)
+            for qi, cj in zip(*np.nonzero(scores >= FUZZY_THRESHOLD)):
+                self._matches[start + b + int(qi)].add(int(cj))
+        # ... and existing skills as queries against the new ones.
+        if start:
+            for b in range(0, start, _CDIST_BLOCK):
+                block = terms[b:min(start, b + _CDIST_BLOCK)]
+                scores = process.cdist(block, new, scorer=fuzz.partial_ratio,
+                                       score_cutoff=FUZZY_THRESHOLD, dtype=np.float64, workers=-1)
+                for qi, cj in zip(*np.nonzero(scores >= FUZZY_THRESHOLD)):
+                    self._matches[b + int(qi)].add(start + int(cj))
+
+    def _extend_token_overlap(self, start: int) -> None:
+        # Jaccard >= 0.5 needs at least one shared token; only those pairs are scored.
+        for tid in range(start, len(self.terms)):
+            a = self._tokens[tid]
+            if not a:
+                continue
+            others = set()
+            for tok in a:
+                others.update(self._by_token.get(tok, ()))
+            for oid in others:
+                b = self._tokens[oid]
+                if len(a & b) / len(a | b) >= JACCARD_THRESHOLD:
+                    self._matches[tid].add(oid)
+                    self._matches[oid].add(tid)
+
+    def id_of(self, term: str) -> Optional[int]:
+        return self.ids.get(term)
+
+    def matches(self, term_id: int) -> np.ndarray:
+        with self._lock:
+            return np.fromiter(self._matches[term_id], dtype=np.int64)
+
+    def match_ids(self, term: str) -> np.ndarray:
+        """Ids of the vocabulary skills `term` matches; unknown terms are scored but not interned."""
+        tid = self.ids.get(term)
+        if tid is not None:
+            return self.matches(tid)
+        # Candidate skills missing from the catalog stay per-request, so the vocabulary
+        # only ever grows with catalog and synonym skills
+        tokens = frozenset(_tokenize(term))
+        with self._lock:
+            terms = list(self.terms)
+            ids = set()
+            for tok in tokens:
+                for oid in self._by_token.get(tok, ()):
+                    b = self._tokens[oid]
+                    if len(tokens & b) / len(tokens | b) >= JACCARD_THRESHOLD:
+                        ids.add(oid)
+        if terms:
+            scores = process.cdist([term], terms, scorer=fuzz.partial_ratio,
+                                   score_cutoff=FUZZY_THRESHOLD, dtype=np.float64, workers=-1)
+            ids.update(np.nonzero(scores[0] >= FUZZY_THRESHOLD)[0].tolist())
+        return np.fromiter(ids, dtype=np.int64, count=len(ids))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'terms': len(self.terms),
+            'pairs': sum(len(m) for m in self._matches),
+            'version': self.version,
+        }
+
+
+class SkillMatrix:
+    """CSR matrix of vocabulary ids, one row per internship skill stack."""
+
+    def __init__(self, rows: Sequence[Sequence[str]], vocabulary: SkillVocabulary):
+        vocabulary.add_many(s for row in rows for s in row)
+        self.vocabulary = vocabulary
+        self.version = vocabulary.version
+        self.n_rows = len(rows)
+
+        lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+        self.row_len = lengths.astype(np.float64)
+        self.indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (vocabulary.ids[s] for row in rows for s in row), dtype=np.int64, count=int(self.indptr[-1])
+        )
+        # Row of every stored entry (for per-row reductions via bincount).
+        self.entry_rows = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+
+    def coverage(self, candidate_skills: Iterable[str]) -> np.ndarray:
+        """Share of each row's skills covered by the candidate (same as skill_similarity)."""
+        matched = np.zeros(self.n_rows, dtype=np.float64)
+        if not self.n_rows or not len(self.indices):
+            return matched
+
+        vocab = self.vocabulary
+        for skill in {s for s in candidate_skills if isinstance(s, str) and s}:
+            ids = vocab.match_ids(skill)
+            mask = np.zeros(len(vocab), dtype=np.float64)
+            mask[ids] = 1.0
+            hits = np.bincount(self.entry_rows, weights=mask[self.indices], minlength=self.n_rows)
+            matched += hits > 0
+
+        cov = np.minimum(1.0, matched / np.maximum(1.0, self.row_len))
+        cov[self.row_len == 0] = 0.0
+        return cov
+
+
+class CandidateSkills:
+    """One candidate's skills resolved against the vocabulary, for scoring stacks one by one.
+
+    `coverage(stack)` equals `skill_similarity(skills, stack)` and costs a few set
+    lookups. The candidate's match ids are re-resolved when a stack holds a skill
+    interned after they were (or the vocabulary was reset).
+    """
+
+    def __init__(self, skills: Iterable[str], vocabulary: SkillVocabulary):
+        self.skills = tuple(sorted({s for s in skills if isinstance(s, str) and s}))
+        self.vocabulary = vocabulary
+        # (vocabulary version, vocabulary size, match id set of every candidate skill)
+        self._matches: Optional[tuple] = None
+
+    def _match_sets(self, stack: Sequence[str]) -> Optional[tuple]:
+        vocab = self.vocabulary
+        ids = [vocab.ids.get(s) for s in stack]
+        if None in ids:
+            vocab.add_many(stack)
+            ids = [vocab.ids.get(s) for s in stack]
+            if None in ids:
+                return None  # the vocabulary was reset meanwhile
+        state = self._matches
+        if state is None or state[0] != vocab.version or max(ids) >= state[1]:
+            size = len(vocab)
+            state = self._matches = (
+                vocab.version, size, [frozenset(vocab.match_ids(s).tolist()) for s in self.skills]
+            )
+        return ids, state[2]
+
+    def coverage(self, stack: Sequence[str]) -> float:
+        if not stack:
+            return 0.0
+        resolved = self._match_sets(stack)
+        if resolved is None:
+            return skill_similarity(self.skills, stack)
+        ids, match_sets = resolved
+        matched = sum(1 for m in match_sets if any(i in m for i in ids))
+        return min(1.0, matched / len(stack))
+
+
+def _seed_terms() -> List[str]:
+    return sorted({v for v in skill_synonyms.mapping().values() if v})
+
+
+skill_vocabulary = SkillVocabulary()
+# Canonical skills of a refreshed synonym map are likely to show up soon.
+skill_synonyms.subscribe(lambda version: skill_vocabulary.add_many(_seed_terms()))
+
+
+def warm_skill_vocabulary(skill_lists: Iterable[Iterable[str]]) -> None:
+    """Intern normalized skills ahead of time (e.g. after a catalog or profile load)."""
+    skill_vocabulary.add_many(_seed_terms())
+    skill_vocabulary.add_many(s for skills in skill_lists or [] for s in skills or [])
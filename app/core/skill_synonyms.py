@@ -0,0 +1,186 @@
+# app/core/skill_synonyms.py
+"""
+Lazily loaded, refreshable skill synonym map (alias -> canonical).
+
+The map used to be loaded from the `skills_synonyms` collection when
+`ml_model` was imported, which tied worker boot to Atlas latency and required
+a restart to pick up edits. `SkillSynonymStore` instead:
+
+- loads on first use,
+- after `ttl` seconds, checks a cheap version stamp of the collection in a
+  background thread and reloads only when it changed (readers keep using the
+  current map meanwhile),
+- swaps the new map in atomically (a single reference assignment),
+- stores the transitive closure of alias chains (a -> b -> c becomes a -> c).
+
+Subscribers (the feature store, compiled candidate contexts, the skill
+vocabulary) are notified after each swap so nothing keeps skills normalized
+with an old map.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_TTL = 300
+# Retry sooner when the collection could not be read.
+_FAILED_TTL = 30
+
+
+def synonym_closure(pairs: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """alias -> final canonical, following chains (a chain that loops stops before repeating a term)."""
+    direct: Dict[str, str] = {}
+    for alias, canonical in pairs:
+        alias = str(alias or '').strip().lower()
+        canonical = str(canonical or '').strip().lower()
+        if alias and canonical:
+            direct[alias] = canonical
+
+    closed: Dict[str, str] = {}
+    for alias, target in direct.items():
+        seen = {alias}
+        while target in direct and target not in seen:
+            seen.add(target)
+            target = direct[target]
+        if target != alias:
+            closed[alias] = target
+    return closed
+
+
+def _database():
+    # No reconnect attempt here: the request path must not wait on a down cluster.
+    from app.core.database import db_manager
+
+    db = db_manager.current_db()
+    if db is None:
+        raise RuntimeError('database unavailable')
+    return db
+
+
+def _load_rows() -> List[Mapping[str, Any]]:
+    db = _database()
+    return list(db['skills_synonyms'].find({}, {'_id': 0, 'alias': 1, 'canonical': 1}))
+
+
+def _version_stamp() -> Tuple[Any, ...]:
+    """Cheap change marker: document count, newest _id and newest updated_at."""
+    coll = _database()['skills_synonyms']
+    newest = coll.find_one({}, {'_id': 1}, sort=[('_id', -1)])
+    updated = coll.find_one({'updated_at': {'$exists': True}}, {'updated_at': 1}, sort=[('updated_at', -1)])
+    return (
+        coll.estimated_document_count(),
+        newest.get('_id') if newest else None,
+        updated.get('updated_at') if updated else None,
+    )
+
+
+def _configured_ttl() -> float:
+    try:
+        from app.config import Config
+        return float(getattr(Config, 'SKILL_SYNONYMS_TTL', DEFAULT_TTL))
+    except Exception:
+        return float(DEFAULT_TTL)
+
+
+class SkillSynonymStore:
+    """Thread-safe alias -> canonical map with lazy load and background refresh."""
+
+    def __init__(self, loader: Callable[[], Iterable[Mapping[str, Any]]] = _load_rows,
+                 stamp: Optional[Callable[[], Any]] = _version_stamp,
+                 ttl: Optional[float] = None):
+        self._loader = loader
+        self._stamp = stamp
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._subscribers: List[Callable[[int], None]] = []
+        # (mapping, stamp, expires_at) - replaced as a whole on every swap
+        self._state: Optional[Tuple[Dict[str, str], Any, float]] = None
+        self.version = 0
+        self.loads = 0
+        self.failures = 0
+
+    @property
+    def ttl(self) -> float:
+        return _configured_ttl() if self._ttl is None else self._ttl
+
+    def mapping(self) -> Dict[str, str]:
+        """Current alias -> canonical map (do not mutate)."""
+        state = self._state
+        if state is None:
+            with self._lock:
+                if self._state is None:
+                    self.refresh()
+            return self._state[0]
+        if time.monotonic() >= state[2]:
+            self._refresh_in_background()
+        return state[0]
+
+    def get(self, alias: str, default: Optional[str] = None) -> Optional[str]:
+        return self.mapping().get(alias, default)
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """Call `callback(version)` after every swap to a new map."""
+        self._subscribers.append(callback)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload now if the collection changed (or always with force). True if the map was swapped."""
+        with self._lock:
+            state = self._state
+            try:
+                # Stamp first: a change landing during the load is caught by the next check.
+                stamp = self._stamp() if self._stamp is not None else None
+                if state is not None and not force and stamp is not None and stamp == state[1]:
+                    self._state = (state[0], state[1], time.monotonic() + self.ttl)
+                    return False
+                mapping = synonym_closure((row.get('alias'), row.get('canonical')) for row in self._loader() or [])
+            except Exception as e:
+                self.failures += 1
+                print(f"[ERROR] DB load for skills_synonyms failed: {e}")
+                # Keep serving the current map; retry soon.
+                self._state = (state[0] if state else {}, state[1] if state else None,
+                               time.monotonic() + min(self.ttl, _FAILED_TTL))
+                return False
+            self.loads += 1
+            changed = state is None or mapping != state[0]
+            self._state = (mapping, stamp, time.monotonic() + self.ttl)
+            if changed:
+                self.version += 1
+            version = self.version
+        if changed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(version)
+                except Exception as e:
+                    print(f"[ERROR] skill synonym subscriber failed: {e}")
+        return changed
+
+    def _refresh_in_background(self) -> None:
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name='skill-synonyms-refresh', daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        state = self._state
+        return {
+            'loaded': state is not None,
+            'aliases': len(state[0]) if state else 0,
+            'version': self.version,
+            'loads': self.loads,
+            'failures': self.failures,
+        }
+
+
+skill_synonyms = SkillSynonymStore()
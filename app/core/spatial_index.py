@@ -0,0 +1,164 @@
+# app/core/spatial_index.py
+"""
+Lat/lon grid index over city coordinates.
+
+Points are bucketed into square cells of `cell_deg` degrees. A radius query
+only visits the cells overlapping the query's bounding box, and a k-nearest
+query visits rings of cells around the query cell until the k-th best
+distance is inside the area already covered. Surviving points are scored with
+a vectorized Haversine.
+
+Distances returned here are unrounded approximations meant for candidate
+selection; callers that need the exact `distance_matrix.get_distance` value
+(rounded to 0.1 km) re-score the survivors, see `distance_matrix`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+DEFAULT_CELL_DEG = 0.5
+
+
+def haversine_many(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Haversine distances (km) from one point to arrays of points, all in degrees."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(np.maximum(0.0, 1 - a)))
+
+
+class CityGrid:
+    """Grid buckets over named (lat, lon) points; indices follow input order."""
+
+    def __init__(self, points: Iterable[Tuple[str, Tuple[float, float]]], cell_deg: float = DEFAULT_CELL_DEG):
+        self.cell_deg = float(cell_deg)
+        self.names: List[str] = []
+        lats: List[float] = []
+        lons: List[float] = []
+        for name, coord in points:
+            self.names.append(name)
+            lats.append(float(coord[0]))
+            lons.append(float(coord[1]))
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, (la, lo) in enumerate(zip(lats, lons)):
+            buckets.setdefault(self._cell(la, lo), []).append(i)
+        self.cells: Dict[Tuple[int, int], np.ndarray] = {
+            cell: np.asarray(rows, dtype=np.int64) for cell, rows in buckets.items()
+        }
+        if self.cells:
+            ys = [c[0] for c in self.cells]
+            xs = [c[1] for c in self.cells]
+            self._bounds = (min(ys), max(ys), min(xs), max(xs))
+        else:
+            self._bounds = (0, -1, 0, -1)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def _gather(self, cells: Iterable[Tuple[int, int]]) -> np.ndarray:
+        hits = [self.cells[c] for c in cells if c in self.cells]
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(hits))
+
+    def within(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, distances) of points within radius_km, in index order."""
+        if not len(self.names) or radius_km < 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        dlat = radius_km / KM_PER_DEGREE
+        # Longitude span grows towards the poles; use the widest latitude of the box.
+        widest = min(89.9, abs(lat) + dlat)
+        dlon = min(180.0, dlat / max(1e-6, math.cos(math.radians(widest))))
+        y0, x0 = self._cell(lat - dlat, lon - dlon)
+        y1, x1 = self._cell(lat + dlat, lon + dlon)
+        ymin, ymax, xmin, xmax = self._bounds
+        rows = self._gather(
+            (y, x)
+            for y in range(max(y0, ymin), min(y1, ymax) + 1)
+            for x in range(max(x0, xmin), min(x1, xmax) + 1)
+        )
+        dist = haversine_many(lat, lon, self.lats[rows], self.lons[rows])
+        keep = dist <= radius_km
+        return rows[keep], dist[keep]
+
+    def _ring(self, cy: int, cx: int, r: int):
+        if r == 0:
+            yield cy, cx
+            return
+        for x in range(cx - r, cx + r + 1):
+            yield cy - r, x
+            yield cy + r, x
+        for y in range(cy - r + 1, cy + r):
+            yield y, cx - r
+            yield y, cx + r
+
+    def _covered_km(self, lat: float, r: int) -> float:
+        """Lower bound on the distance to any point outside rings 0..r around lat's cell."""
+        if r <= 0:
+            return 0.0
+        span = math.radians(r * self.cell_deg)
+        edge = min(89.9, abs(lat) + (r + 1) * self.cell_deg)
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(math.radians(edge)) * math.sin(span / 2)))
+
+    def nearest(self, lat: float, lon: float, k: int = 1, slack_km: float = 0.0,
+                max_km: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, distances) of the k nearest points, sorted by distance.
+
+        Points within `slack_km` of the k-th distance are included as well (so
+        callers can break near-ties with an exact distance).
+        """
+        n = len(self.names)
+        if not n or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        k = min(k, n)
+        cy, cx = self._cell(lat, lon)
+        ymin, ymax, xmin, xmax = self._bounds
+        max_ring = max(abs(cy - ymin), abs(cy - ymax), abs(cx - xmin), abs(cx - xmax))
+
+        seen: List[np.ndarray] = []
+        count = 0
+        r = 0
+        while True:
+            found = self._gather(self._ring(cy, cx, r))
+            if len(found):
+                seen.append(found)
+                count += len(found)
+            if r >= max_ring:
+                break
+            if count >= k:
+                rows = np.concatenate(seen)
+                dist = haversine_many(lat, lon, self.lats[rows], self.lons[rows])
+                kth = np.partition(dist, k - 1)[k - 1] + slack_km
+                if kth <= self._covered_km(lat, r) or (max_km is not None and max_km <= self._covered_km(lat, r)):
+                    break
+            elif max_km is not None and max_km <= self._covered_km(lat, r):
+                break
+            r += 1
+
+        if not seen:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        rows = np.concatenate(seen)
+        dist = haversine_many(lat, lon, self.lats[rows], self.lons[rows])
+        order = np.lexsort((rows, dist))
+        rows, dist = rows[order], dist[order]
+        limit = dist[min(k, len(dist)) - 1] + slack_km
+        keep = dist <= limit
+        if max_km is not None:
+            keep &= dist <= max_km
+        return rows[keep], dist[keep]
+
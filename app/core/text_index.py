@@ -0,0 +1,288 @@
+# app/core/text_index.py
+"""
+TF-IDF index over internship text (title, description, responsibilities).
+
+The recommender only looks at skills, sector and title; the free text was
+ignored. This module keeps a sparse TF-IDF index of every internship's text
+for two queries:
+
+- `search(text, k)`: free-text search (`/internships/search`);
+- `similar(internship_id, k)`: content neighbours of an internship (the
+  `by=content` channel of `/recommendations/by_internship/<id>`).
+
+Both are cosine top-K queries: the query vector is multiplied with a
+column-compressed (term -> rows) matrix of L2-normalized document vectors,
+which only touches the postings of the query's terms.
+
+Documents are tokenized once and updated one at a time (`upsert`, `remove`,
+or `sync` with a catalog load, which skips unchanged text). Catalog snapshot
+documents are scoring projections without description/responsibilities:
+`sync(..., hydrate=...)` keeps the indexed text of an internship while its
+title and `updated_at` are unchanged and reads full documents only for the
+others. IDF weights and the matrix are rebuilt lazily from the stored term
+counts on the first query after a change, with NumPy only (no SciPy).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+TEXT_FIELDS = ('title', 'description', 'responsibilities')
+SUMMARY_FIELDS = ('internship_id', 'title', 'organization', 'location', 'sector')
+# Text fields a scoring projection leaves out
+_DETAIL_FIELDS = ('description', 'responsibilities')
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our s such t that the their this to
+will with you your we us who what which while within work working using use into across about all also
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stop words ("c++" and "c#" stay whole)."""
+    return [t for t in _TOKEN_RE.findall(str(text or '').lower()) if t not in _STOP_WORDS]
+
+
+def document_text(internship: Mapping[str, Any]) -> Tuple[str, ...]:
+    """The indexed text fields of an internship (list fields are joined)."""
+    parts = []
+    for field in TEXT_FIELDS:
+        value = internship.get(field)
+        if isinstance(value, (list, tuple)):
+            value = ' '.join(str(v) for v in value)
+        parts.append(str(value or ''))
+    return tuple(parts)
+
+
+def _index_key(internship: Mapping[str, Any]) -> str:
+    return str(internship.get('internship_id') or internship.get('_id') or '')
+
+
+def _is_projection(internship: Mapping[str, Any]) -> bool:
+    omitted = getattr(internship, 'omitted_fields', ())
+    return any(f in omitted for f in _DETAIL_FIELDS)
+
+
+def _stamp(internship: Mapping[str, Any]) -> Tuple[Any, Any]:
+    """What a projection still shows of a text change."""
+    return internship.get('title'), internship.get('updated_at')
+
+
+class _Matrix:
+    """Immutable compiled state: CSC postings of normalized TF-IDF weights."""
+
+    __slots__ = ('keys', 'row_of', 'idf', 'indptr', 'rows', 'weights')
+
+    def __init__(self, keys, idf, indptr, rows, weights):
+        self.keys = keys
+        self.row_of = {key: row for row, key in enumerate(keys)}
+        self.idf = idf
+        self.indptr = indptr
+        self.rows = rows
+        self.weights = weights
+
+
+class TextIndex:
+    """Incrementally updatable TF-IDF index with cosine top-K queries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vocab: Dict[str, int] = {}
+        self._df: List[int] = []
+        # key -> (term ids, sublinear tf) of the document
+        self._docs: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._text: Dict[str, Tuple[str, ...]] = {}
+        self._stamps: Dict[str, Tuple[Any, Any]] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._matrix: Optional[_Matrix] = None
+        self.version = 0
+        self.builds = 0
+        # time.monotonic() of the last full catalog sync
+        self.synced_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ----- updates -----
+    def _remove_locked(self, key: str) -> bool:
+        doc = self._docs.pop(key, None)
+        self._text.pop(key, None)
+        self._stamps.pop(key, None)
+        self._summaries.pop(key, None)
+        if doc is None:
+            return False
+        for term in doc[0].tolist():
+            self._df[term] -= 1
+        return True
+
+    def _upsert_locked(self, key: str, internship: Mapping[str, Any], text: Tuple[str, ...]) -> None:
+        self._remove_locked(key)
+        counts = Counter(tokenize(' '.join(text)))
+        term_ids = []
+        for term in counts:
+            tid = self._vocab.get(term)
+            if tid is None:
+                tid = self._vocab[term] = len(self._df)
+                self._df.append(0)
+            self._df[tid] += 1
+            term_ids.append(tid)
+        tf = np.array([1.0 + math.log(c) for c in counts.values()], dtype=np.float64)
+        self._docs[key] = (np.array(term_ids, dtype=np.int64), tf)
+        self._text[key] = text
+        self._stamps[key] = _stamp(internship)
+        self._summaries[key] = {f: internship.get(f) for f in SUMMARY_FIELDS}
+
+    def upsert(self, internship: Mapping[str, Any]) -> bool:
+        """Index (or re-index) one internship; False when its text is unchanged."""
+        key = _index_key(internship)
+        if not key:
+            return False
+        text = document_text(internship)
+        with self._lock:
+            if self._text.get(key) == text and key in self._summaries:
+                self._summaries[key] = {f: internship.get(f) for f in SUMMARY_FIELDS}
+                return False
+            self._upsert_locked(key, internship, text)
+            self._matrix = None
+            self.version += 1
+        return True
+
+    def remove(self, internship_id: Any) -> bool:
+        with self._lock:
+            removed = self._remove_locked(str(internship_id))
+            if removed:
+                self._matrix = None
+                self.version += 1
+        return removed
+
+    def sync(self, internships: Iterable[Mapping[str, Any]],
+             hydrate: Optional[Callable[[List[str]], Iterable[Mapping[str, Any]]]] = None) -> int:
+        """Bring the index in line with a full catalog load; returns documents (re)indexed or removed.
+
+        Projected documents that are new or show a changed title/`updated_at` are
+        indexed from the full documents `hydrate(keys)` returns (one call).
+        """
+        internships = list(internships or [])
+        full: Dict[str, Mapping[str, Any]] = {}
+        if hydrate is not None:
+            with self._lock:
+                missing = [
+                    _index_key(i) for i in internships
+                    if _index_key(i) and _is_projection(i) and self._stamps.get(_index_key(i)) != _stamp(i)
+                ]
+            if missing:
+                full = {_index_key(d): d for d in hydrate(missing)}
+        changed = 0
+        with self._lock:
+            live = set()
+            for internship in internships:
+                key = _index_key(internship)
+                if not key or key in live:
+                    continue
+                live.add(key)
+                internship = full.get(key, internship)
+                if hydrate is not None and _is_projection(internship) and self._stamps.get(key) == _stamp(internship):
+                    self._summaries[key] = {f: internship.get(f) for f in SUMMARY_FIELDS}
+                    continue
+                text = document_text(internship)
+                if self._text.get(key) != text:
+                    self._upsert_locked(key, internship, text)
+                    changed += 1
+                else:
+                    self._summaries[key] = {f: internship.get(f) for f in SUMMARY_FIELDS}
+            for key in [k for k in self._docs if k not in live]:
+                self._remove_locked(key)
+                changed += 1
+            if changed:
+                self._matrix = None
+                self.version += 1
+            self.synced_at = time.monotonic()
+        return changed
+
+    # ----- queries -----
+    def _compiled(self) -> _Matrix:
+        matrix = self._matrix
+        if matrix is not None:
+            return matrix
+        with self._lock:
+            if self._matrix is not None:
+                return self._matrix
+            keys = list(self._docs)
+            n = len(keys)
+            df = np.asarray(self._df, dtype=np.float64)
+            # Smoothed IDF (as scikit-learn): terms in every document still count a little
+            idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+            docs = [self._docs[k] for k in keys]
+            lengths = np.array([len(d[0]) for d in docs], dtype=np.int64)
+            rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+            terms = np.concatenate([d[0] for d in docs]) if n else np.zeros(0, dtype=np.int64)
+            weights = (np.concatenate([d[1] for d in docs]) if n else np.zeros(0)) * idf[terms]
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+            weights = weights / np.where(norms > 0, norms, 1.0)[rows]
+
+            order = np.argsort(terms, kind='stable')
+            indptr = np.zeros(len(df) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(terms, minlength=len(df)), out=indptr[1:])
+            self._matrix = _Matrix(keys, idf, indptr, rows[order], weights[order])
+            self.builds += 1
+            return self._matrix
+
+    def _top_k(self, matrix: _Matrix, term_ids: Sequence[int], query_weights: np.ndarray, k: int,
+               exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        norm = float(np.sqrt(np.dot(query_weights, query_weights)))
+        if not len(matrix.keys) or norm == 0 or k <= 0:
+            return []
+        scores = np.zeros(len(matrix.keys))
+        for tid, qw in zip(term_ids, (query_weights / norm).tolist()):
+            start, end = matrix.indptr[tid], matrix.indptr[tid + 1]
+            # A term appears at most once per document, so the scatter-add has no collisions
+            scores[matrix.rows[start:end]] += qw * matrix.weights[start:end]
+        if exclude in matrix.row_of:
+            scores[matrix.row_of[exclude]] = 0.0
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        # Best first; ties by key for stable output
+        ranked = sorted(hits.tolist(), key=lambda r: (-scores[r], matrix.keys[r]))
+        return [(matrix.keys[r], float(scores[r])) for r in ranked]
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """(internship key, cosine score) of the best matches for free text."""
+        matrix = self._compiled()
+        # Terms the compiled matrix doesn't know cannot match anything
+        terms = [(self._vocab.get(t, -1), c) for t, c in Counter(tokenize(text)).items()]
+        terms = [(tid, c) for tid, c in terms if 0 <= tid < len(matrix.idf)]
+        if not terms:
+            return []
+        term_ids = [tid for tid, _ in terms]
+        tf = np.array([1.0 + math.log(c) for _, c in terms])
+        return self._top_k(matrix, term_ids, tf * matrix.idf[term_ids], k)
+
+    def similar(self, internship_id: Any, k: int = 10) -> List[Tuple[str, float]]:
+        """(internship key, cosine score) of the internships whose text is closest to this one's."""
+        key = str(internship_id)
+        matrix = self._compiled()
+        doc = self._docs.get(key)
+        if doc is None:
+            return []
+        term_ids, tf = doc
+        keep = term_ids < len(matrix.idf)
+        return self._top_k(matrix, term_ids[keep].tolist(), tf[keep] * matrix.idf[term_ids[keep]], k, exclude=key)
+
+    def summary(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._summaries.get(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'documents': len(self._docs), 'terms': len(self._vocab), 'version': self.version, 'builds': self.builds}
+
+
+text_index = TextIndex()
@@ -0,0 +1,353 @@
+"""In-process catalog snapshot (`internships` and `companies`).
+
+Recommendation and company endpoints used to re-read both collections from
+Mongo on every request. `CatalogStore` keeps one immutable `CatalogSnapshot`
+instead, with lookup indexes by internship_id, Mongo `_id` string, company_id
+and normalized organization/company name:
+
+- the first read loads both collections;
+- after `CACHE_TIMEOUT` seconds a background check compares each collection's
+  version stamp (document count, newest `_id`, newest `updated_at`). New
+  documents and documents with a newer `updated_at` are read as a delta and
+  merged into a new snapshot; anything else (deletions, stamps that don't add
+  up) reloads that collection;
+- every `CATALOG_FULL_RELOAD_TTL` seconds both collections are reloaded, which
+  bounds staleness from edits that don't touch `updated_at`.
+
+A new snapshot is built completely before it replaces the current one (a
+single reference swap), so concurrent requests see either the old or the new
+catalog, never a half-built one. Documents are `FrozenDict`s with tuples for
+lists: enrichment code must copy them (`dict(doc)`, `{**doc, ...}`) rather than
+write into the shared catalog.
+
+Internships are scoring projections: the long display fields
+(`INTERNSHIP_DETAIL_FIELDS`) are not loaded. `hydrate_internships()` reads
+them for the documents a response actually returns (one `$in` query); edits
+that only touch those fields are picked up when they bump `updated_at`.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_TTL = 300
+DEFAULT_FULL_RELOAD_TTL = 3600
+# Retry sooner when Mongo could not be read.
+_FAILED_TTL = 30
+COLLECTIONS = ('internships', 'companies')
+# Display-only internship fields left out of the snapshot (read per response)
+INTERNSHIP_DETAIL_FIELDS = ('description', 'responsibilities', 'eligibility')
+
+
+class FrozenDict(dict):
+    """A dict that refuses in-place changes; copies (`dict(d)`, `{**d}`) are ordinary dicts."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("catalog documents are read-only; copy them with dict(doc)")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> Dict[str, Any]:
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class InternshipProjection(FrozenDict):
+    """A snapshot internship loaded without its `omitted_fields` (copies are plain dicts)."""
+
+    __slots__ = ()
+    omitted_fields = INTERNSHIP_DETAIL_FIELDS
+
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of a document: dicts become FrozenDicts and lists tuples."""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def normalized_name(name: Any) -> str:
+    return str(name or '').strip().lower()
+
+
+def _index(docs: Sequence[Mapping[str, Any]], key: Callable[[Mapping[str, Any]], Any]) -> Dict[Any, Tuple[int, ...]]:
+    """key -> rows (catalog order); documents without a key are left out."""
+    rows: Dict[Any, List[int]] = {}
+    for row, doc in enumerate(docs):
+        k = key(doc)
+        if k:
+            rows.setdefault(k, []).append(row)
+    return {k: tuple(v) for k, v in rows.items()}
+
+
+class CatalogSnapshot:
+    """One immutable load of the catalog with its lookup indexes."""
+
+    def __init__(self, internships: Iterable[Mapping[str, Any]] = (), companies: Iterable[Mapping[str, Any]] = (),
+                 stamps: Optional[Mapping[str, Any]] = None, version: int = 0,
+                 full_loaded_at: Optional[float] = None):
+        self.internships: Tuple[FrozenDict, ...] = tuple(freeze(d) for d in internships or ())
+        self.companies: Tuple[FrozenDict, ...] = tuple(freeze(c) for c in companies or ())
+        self.stamps = dict(stamps or {})
+        self.version = version
+        self.full_loaded_at = time.monotonic() if full_loaded_at is None else full_loaded_at
+
+        self._by_internship_id = _index(self.internships, lambda d: str(d.get('internship_id') or ''))
+        self._by_object_id = _index(self.internships, lambda d: str(d.get('_id') or ''))
+        self._by_company_id = _index(self.internships, lambda d: str(d.get('company_id') or ''))
+        self._by_org = _index(self.internships, lambda d: normalized_name(d.get('organization') or d.get('company')))
+        self._companies_by_id = _index(self.companies, lambda c: str(c.get('company_id') or ''))
+        # get_company_by_name compares the lowercased name as stored
+        self._companies_by_name = _index(self.companies, lambda c: str(c.get('name') or '').lower())
+
+    def _internship_rows(self, ids: Iterable[Any], by_object_id: bool) -> List[int]:
+        rows = set()
+        for i in ids or ():
+            rows.update(self._by_internship_id.get(str(i), ()))
+            if by_object_id:
+                rows.update(self._by_object_id.get(str(i), ()))
+        return sorted(rows)
+
+    def internship(self, internship_id: Any) -> Optional[FrozenDict]:
+        """First internship with this internship_id, else with this `_id` string."""
+        rows = self._by_internship_id.get(str(internship_id)) or self._by_object_id.get(str(internship_id))
+        return self.internships[rows[0]] if rows else None
+
+    def find_internships(self, ids: Iterable[Any], by_object_id: bool = False) -> List[FrozenDict]:
+        """Internships whose internship_id (or `_id` string) is in `ids`, in catalog order."""
+        return [self.internships[row] for row in self._internship_rows(ids, by_object_id)]
+
+    def internships_for_company(self, company_id: Any) -> List[FrozenDict]:
+        return [self.internships[row] for row in self._by_company_id.get(str(company_id), ())]
+
+    def internships_for_org(self, name: Any) -> List[FrozenDict]:
+        return [self.internships[row] for row in self._by_org.get(normalized_name(name), ())]
+
+    def company(self, company_id: Any) -> Optional[FrozenDict]:
+        rows = self._companies_by_id.get(str(company_id))
+        return self.companies[rows[0]] if rows else None
+
+    def company_by_name(self, name: Any) -> Optional[FrozenDict]:
+        rows = self._companies_by_name.get(str(name or '').lower())
+        return self.companies[rows[0]] if rows else None
+
+
+def _database():
+    # No reconnect attempt here: the request path must not wait on a down cluster.
+    from app.core.database import db_manager
+
+    db = db_manager.current_db()
+    if db is None:
+        raise RuntimeError('database unavailable')
+    return db
+
+
+def collection_stamp(collection) -> Tuple[int, Any, Any]:
+    """(document count, newest _id, newest updated_at) of a collection."""
+    newest = collection.find_one({}, {'_id': 1}, sort=[('_id', -1)])
+    edited = collection.find_one({'updated_at': {'$exists': True}}, {'updated_at': 1}, sort=[('updated_at', -1)])
+    return (
+        collection.estimated_document_count(),
+        newest.get('_id') if newest else None,
+        edited.get('updated_at') if edited else None,
+    )
+
+
+def _load_documents(collection, name: str, query: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+    if name == 'companies':
+        from app.core.database import convert_object_ids
+        return convert_object_ids(list(collection.find(query or {})))
+    docs = list(collection.find(query or {}, {field: 0 for field in INTERNSHIP_DETAIL_FIELDS}))
+    # Convert ObjectId to string for JSON serialization
+    for doc in docs:
+        if '_id' in doc:
+            doc['_id'] = str(doc['_id'])
+    return [InternshipProjection((k, freeze(v)) for k, v in doc.items()) for doc in docs]
+
+
+def hydrate_internships(internships: Sequence[Mapping[str, Any]],
+                        fields: Sequence[str] = INTERNSHIP_DETAIL_FIELDS) -> List[Dict[str, Any]]:
+    """Plain-dict copies of `internships` with `fields` read from Mongo (one `$in` query on `_id`).
+
+    Documents that already have the fields, or that are no longer in Mongo, are copied as they are.
+    """
+    docs = [dict(i) for i in internships or ()]
+    wanted = {str(d['_id']) for d in docs if d.get('_id') and any(f not in d for f in fields)}
+    if not wanted:
+        return docs
+    from bson import ObjectId
+
+    ids = [ObjectId(i) if ObjectId.is_valid(i) else i for i in wanted]
+    details = {
+        str(d.get('_id')): d
+        for d in _database()['internships'].find({'_id': {'$in': ids}}, {f: 1 for f in fields})
+    }
+    for doc in docs:
+        detail = details.get(str(doc.get('_id')))
+        if detail is not None:
+            doc.update((f, detail[f]) for f in fields if f in detail)
+    return docs
+
+
+def load_changes(collection, name: str, docs: Sequence[Mapping[str, Any]], old_stamp,
+                 new_stamp) -> Optional[List[Any]]:
+    """`docs` with documents added or re-stamped since `old_stamp` merged in; None if that
+    cannot account for `new_stamp` (e.g. deletions) and the collection must be reloaded."""
+    _, newest_id, edited_at = old_stamp
+    clauses = []
+    if newest_id is not None:
+        clauses.append({'_id': {'$gt': newest_id}})
+    if edited_at is not None:
+        clauses.append({'updated_at': {'$gt': edited_at}})
+    if not clauses:
+        return None
+    changed = {str(d.get('_id')): d for d in _load_documents(collection, name, {'$or': clauses})}
+    merged = [changed.pop(str(d.get('_id')), d) for d in docs] + list(changed.values())
+    return merged if len(merged) == new_stamp[0] else None
+
+
+def load_catalog_snapshot(previous: Optional[CatalogSnapshot] = None,
+                          full_reload_ttl: float = DEFAULT_FULL_RELOAD_TTL) -> CatalogSnapshot:
+    """Next snapshot after `previous` (returned as is when nothing changed)."""
+    db = _database()
+    full = previous is None or time.monotonic() - previous.full_loaded_at >= full_reload_ttl
+    stamps, loaded = {}, {}
+    for name in COLLECTIONS:
+        collection = db[name]
+        # Stamp first: a write racing the load shows up as a change at the next check
+        stamps[name] = collection_stamp(collection)
+        if full:
+            loaded[name] = _load_documents(collection, name)
+            continue
+        old_stamp, docs = previous.stamps.get(name), getattr(previous, name)
+        if old_stamp == stamps[name]:
+            loaded[name] = docs
+            continue
+        merged = load_changes(collection, name, docs, old_stamp, stamps[name]) if old_stamp else None
+        loaded[name] = merged if merged is not None else _load_documents(collection, name)
+    if not full and stamps == previous.stamps:
+        return previous
+    return CatalogSnapshot(
+        loaded['internships'], loaded['companies'], stamps,
+        version=(previous.version + 1) if previous is not None else 1,
+        full_loaded_at=None if full else previous.full_loaded_at,
+    )
+
+
+def _config_value(name: str, default: float) -> float:
+    try:
+        from app.config import Config
+        return float(getattr(Config, name, default))
+    except Exception:
+        return float(default)
+
+
+class CatalogStore:
+    """Thread-safe holder of the current CatalogSnapshot."""
+
+    def __init__(self, loader: Callable[..., CatalogSnapshot] = load_catalog_snapshot,
+                 ttl: Optional[float] = None, full_reload_ttl: Optional[float] = None):
+        self._loader = loader
+        self._ttl = ttl
+        self._full_reload_ttl = full_reload_ttl
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        # (snapshot, check_at) - replaced as a whole on every swap
+        self._state: Optional[Tuple[CatalogSnapshot, float]] = None
+        self.checks = 0
+        self.swaps = 0
+        self.failures = 0
+
+    @property
+    def ttl(self) -> float:
+        return _config_value('CACHE_TIMEOUT', DEFAULT_TTL) if self._ttl is None else self._ttl
+
+    @property
+    def full_reload_ttl(self) -> float:
+        if self._full_reload_ttl is None:
+            return _config_value('CATALOG_FULL_RELOAD_TTL', DEFAULT_FULL_RELOAD_TTL)
+        return self._full_reload_ttl
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """The loaded snapshot, or None before the first load (never touches Mongo)."""
+        state = self._state
+        return state[0] if state is not None else None
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog (loads on first use; checks for changes in the background after the TTL)."""
+        state = self._state
+        if state is None:
+            with self._lock:
+                if self._state is None:
+                    self.refresh()
+                state = self._state
+            return state[0] if state is not None else CatalogSnapshot()
+        if time.monotonic() >= state[1]:
+            self._refresh_in_background()
+        return state[0]
+
+    def refresh(self) -> bool:
+        """Check Mongo for changes and swap in a new snapshot if there are any. False on failure."""
+        state = self._state
+        previous = state[0] if state is not None else None
+        try:
+            fresh = self._loader(previous, full_reload_ttl=self.full_reload_ttl)
+        except Exception as e:
+            self.failures += 1
+            from app.utils.logger import app_logger
+            app_logger.warning(f"Could not load the catalog: {e}")
+            if previous is not None:
+                self._state = (previous, time.monotonic() + min(self.ttl, _FAILED_TTL))
+            return False
+        self.checks += 1
+        if fresh is not previous:
+            self.swaps += 1
+        self._state = (fresh, time.monotonic() + self.ttl)
+        return True
+
+    def _refresh_in_background(self) -> None:
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name='catalog-snapshot-refresh', daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self.current()
+        return {
+            'version': snapshot.version if snapshot else None,
+            'internships': len(snapshot.internships) if snapshot else 0,
+            'companies': len(snapshot.companies) if snapshot else 0,
+            'checks': self.checks,
+            'swaps': self.swaps,
+            'failures': self.failures,
+        }
+
+
+catalog_store = CatalogStore()
@@ -20,6 +20,10 @@ except Exception:  # pragma: no cover
         def get_distance(a, b):
             return float('inf')
 
+from app.utils.single_flight import single_flight
+
+_review_flight = single_flight('company_review_score')
+
 
 class CompanyMatchScorer:
     """
@@ -131,6 +135,33 @@ class CompanyMatchScorer:
             return 0.0
         return float(__import__('math').exp(-0.6931471805599453 * d / half_life_km))
 
+    @staticmethod
+    def _location_affinity(city, liked_cities, disliked_cities):
+        """(max_like, max_dislike) distance-decayed closeness (0..1) of `city` to the given cities."""
+        try:
+            from app.core.location_affinity import location_affinity_field
+            return location_affinity_field(liked_cities, disliked_cities).affinity(city)
+        except Exception:
+            pass
+
+        def _closest(cities):
+            best = 0.0
+            for other in cities:
+                if not other:
+                    continue
+                if other == city:
+                    return 1.0
+                try:
+                    dist = get_distance(city, other)
+                    if dist is None:
+                        continue
+                    best = max(best, CompanyMatchScorer._distance_decay(dist, half_life_km=150.0))
+                except Exception:
+                    continue
+            return best
+
+        return _closest(liked_cities), _closest(disliked_cities)
+
     @staticmethod
     def _get_company_location_preference_adjustment(db, candidate_id, company_id):
         """Small +/- adjustment based on internship like/dislike reasons about location.
@@ -194,36 +225,7 @@ class CompanyMatchScorer:
                     disliked_cities.add(city)
 
             # Smooth distance-decay around liked/disliked locations (small nudges)
-            max_like = 0.0
-            max_dislike = 0.0
-
-            for city in liked_cities:
-                if not city:
-                    continue
-                if city == hq_city:
-                    max_like = 1.0
-                    break
-                try:
-                    dist = get_distance(hq_city, city)
-                    if dist is None:
-                        continue
-                    max_like = max(max_like, CompanyMatchScorer._distance_decay(dist, half_life_km=150.0))
-                except Exception:
-                    continue
-
-            for city in disliked_cities:
-                if not city:
-                    continue
-                if city == hq_city:
-                    max_dislike = 1.0
-                    break
-                try:
-                    dist = get_distance(hq_city, city)
-                    if dist is None:
-                        continue
-                    max_dislike = max(max_dislike, CompanyMatchScorer._distance_decay(dist, half_life_km=150.0))
-                except Exception:
-                    continue
+            max_like, max_dislike = CompanyMatchScorer._location_affinity(hq_city, liked_cities, disliked_cities)
 
             # Keep the magnitude the same as before (max +/- 5), just smoother.
             adj = (5.0 * max_like) - (5.0 * max_dislike)
@@ -338,7 +340,8 @@ class CompanyMatchScorer:
                 {'$match': {'company_id': company_id}},
                 {'$group': {'_id': '$company_id', 'average_rating': {'$avg': '$rating'}}}
             ]
-            rows = list(db.company_reviews.aggregate(pipeline))
+            # Same for every candidate: concurrent page loads share one aggregation
+            rows = _review_flight.do(company_id, lambda: list(db.company_reviews.aggregate(pipeline)))
             if not rows:
                 return 50
 
@@ -112,6 +112,13 @@ def rebuild_and_save_company_reputation(db, company_id: str) -> Optional[Dict[st
     except Exception:
         pass
 
+    # Patch this company into the in-memory global signals (counts, reasons, reputation).
+    try:
+        from app.utils.company_signals import company_signals
+        company_signals.apply_interactions(str(company_id), interactions, rec.get("score"))
+    except Exception:
+        pass
+
     return rec
 
 
@@ -119,3 +126,24 @@ def load_company_reputation(db, company_id: str) -> Optional[Dict[str, Any]]:
     if db is None:
         return None
     return db["company_reputation"].find_one({"company_id": str(company_id)})
+
+
+def load_company_reputations(db, company_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Reputation records for many companies in one `$in` query: {company_id: record}."""
+    ids = list(dict.fromkeys(str(c) for c in company_ids or [] if c))
+    if db is None or not ids:
+        return {}
+    records: Dict[str, Dict[str, Any]] = {}
+    for rec in db["company_reputation"].find({"company_id": {"$in": ids}}):
+        # Same record find_one would pick if a company has duplicates.
+        records.setdefault(str(rec.get("company_id")), rec)
+    return records
+
+
+def company_reputation_scores(db, company_ids: Iterable[str]) -> Dict[str, float]:
+    """{company_id: persisted reputation score} for companies that have one."""
+    return {
+        cid: float(rec["score"])
+        for cid, rec in load_company_reputations(db, company_ids).items()
+        if rec.get("score") is not None
+    }
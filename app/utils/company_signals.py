@@ -0,0 +1,456 @@
+"""Global company signals (all users), kept in memory.
+
+Recommendation scoring reads four global per-company signals: like/dislike
+counts, reason-tag histograms, average review rating and persisted reputation.
+The counts and histograms are also keyed by normalized company name, for
+internships that only carry an organization string. Recomputing them with
+aggregations over every interaction on each request made the request cost
+grow with total interaction volume.
+
+`CompanySignalStore` keeps an immutable `CompanySignals` snapshot instead:
+
+- the first read loads it from Mongo (one concurrent round of queries),
+- writes that already recount one company (`rebuild_and_save_company_reputation`,
+  review rating updates) patch that company into a new snapshot; the new
+  snapshot shares every other company's entries with the old one (copy-on-write
+  overlays) and only re-derives the patched company's id and name keys,
+- after `ttl` seconds a background reconcile reloads everything, which also
+  picks up writes made by other worker processes and renamed companies.
+
+Readers get read-only mappings (plain dicts or overlays) and must not mutate them.
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_TTL = 60
+# Retry sooner when Mongo could not be read.
+_FAILED_TTL = 30
+# An overlay is folded into a plain dict once it patches more than this many keys or
+# sqrt(len(base)): a patch copies O(sqrt n) changes, a fold every O(sqrt n) patches costs O(n)
+_OVERLAY_MAX_CHANGES = 64
+_DELETED = object()
+
+
+def with_company_name_keys(stats: Mapping[Any, Any], company_names: Iterable[Tuple[Any, str]]) -> Dict[Any, Any]:
+    """Also expose per-company stats by normalized name, for internships that only
+    have organization/company strings."""
+    keyed = dict(stats)
+    for cid, name in company_names or []:
+        if cid in stats:
+            keyed[name] = stats[cid]
+    return keyed
+
+
+class _Overlay(Mapping):
+    """Read-only view of `base` with a few keys replaced (or `_DELETED`). Neither is mutated."""
+
+    __slots__ = ('_base', '_changes', '_len')
+
+    def __init__(self, base: Mapping, changes: Dict, size: int):
+        self._base = base
+        self._changes = changes
+        self._len = size
+
+    def __getitem__(self, key):
+        if key in self._changes:
+            value = self._changes[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        return self._base[key]
+
+    def __iter__(self) -> Iterator:
+        for key in self._base:
+            if key not in self._changes:
+                yield key
+        for key, value in self._changes.items():
+            if value is not _DELETED:
+                yield key
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def _patched(mapping: Mapping, updates: Mapping) -> Mapping:
+    """`mapping` with `updates` applied (`_DELETED` drops a key), sharing the unchanged entries."""
+    if isinstance(mapping, _Overlay):
+        base, changes = mapping._base, dict(mapping._changes)
+    else:
+        base, changes = mapping, {}
+    size = len(mapping)
+    for key, value in updates.items():
+        size += (value is not _DELETED) - (key in mapping)
+        changes[key] = value
+    if len(changes) <= max(_OVERLAY_MAX_CHANGES, math.isqrt(len(base))):
+        return _Overlay(base, changes, size)
+    merged = dict(base)
+    merged.update(changes)
+    for key in [k for k, v in changes.items() if v is _DELETED]:
+        merged.pop(key, None)
+    return merged
+
+
+def interaction_counts(interactions: Iterable[Mapping[str, Any]]) -> Optional[Dict[str, int]]:
+    """{'like', 'dislike'} counts for one company's interactions (None if it has none)."""
+    counts = None
+    for row in interactions:
+        it = row.get('interaction_type')
+        if not it:
+            continue
+        counts = counts or {'like': 0, 'dislike': 0}
+        if it in counts:
+            counts[it] += 1
+    return counts
+
+
+def reason_counts(interactions: Iterable[Mapping[str, Any]]) -> Optional[Dict[str, Dict[str, int]]]:
+    """{'like': {tag: n}, 'dislike': {...}} for one company's interactions (None without tags)."""
+    counts = None
+    for row in interactions:
+        it = row.get('interaction_type')
+        tags = row.get('reason_tags')
+        if not it or not tags:
+            continue
+        # $unwind treats a scalar as a one-element array
+        for tag in tags if isinstance(tags, list) else [tags]:
+            if not tag:
+                continue
+            counts = counts or {'like': {}, 'dislike': {}}
+            if it in counts:
+                counts[it][tag] = counts[it].get(tag, 0) + 1
+    return counts
+
+
+def load_company_ratings(db) -> Dict[Any, float]:
+    """Average review rating per company: {company_id: rating} (concurrent calls share one aggregation)."""
+    from app.utils.single_flight import single_flight
+
+    return single_flight('company_ratings').do(getattr(db, 'name', None), _aggregate_company_ratings, db)
+
+
+def _aggregate_company_ratings(db) -> Dict[Any, float]:
+    company_ratings = {}
+    pipeline = [{'$group': {'_id': '$company_id', 'average_rating': {'$avg': '$rating'}}}]
+    for result in db['company_reviews'].aggregate(pipeline):
+        cid = result.get('_id')
+        avg_rating = result.get('average_rating')
+        if cid and avg_rating:
+            company_ratings[cid] = round(avg_rating, 2)
+    return company_ratings
+
+
+def load_company_interaction_counts(db) -> Dict[Any, Dict[str, int]]:
+    """Global like/dislike counts per company: {company_id: {'like', 'dislike'}}."""
+    stats = db['company_interactions'].aggregate([
+        {'$group': {
+            '_id': {
+                'company_id': '$company_id',
+                'interaction_type': '$interaction_type'
+            },
+            'count': {'$sum': 1}
+        }}
+    ])
+    tmp = {}
+    for row in stats:
+        key = row.get('_id') or {}
+        cid = key.get('company_id')
+        it = key.get('interaction_type')
+        if not cid or not it:
+            continue
+        tmp.setdefault(cid, {'like': 0, 'dislike': 0})
+        if it == 'like':
+            tmp[cid]['like'] += int(row.get('count') or 0)
+        elif it == 'dislike':
+            tmp[cid]['dislike'] += int(row.get('count') or 0)
+    return tmp
+
+
+def load_company_reason_counts(db) -> Dict[Any, Dict[str, Dict[str, int]]]:
+    """Global reason-tag counts per company: {company_id: {'like': {tag: n}, 'dislike': {...}}}."""
+    rows = db['company_interactions'].aggregate([
+        {'$match': {'reason_tags': {'$exists': True, '$ne': []}}},
+        {'$unwind': '$reason_tags'},
+        {'$group': {
+            '_id': {
+                'company_id': '$company_id',
+                'interaction_type': '$interaction_type',
+                'reason_tag': '$reason_tags'
+            },
+            'count': {'$sum': 1}
+        }}
+    ])
+    tmp_reason = {}
+    for row in rows:
+        key = row.get('_id') or {}
+        cid = key.get('company_id')
+        it = key.get('interaction_type')
+        tag = key.get('reason_tag')
+        if not cid or not it or not tag:
+            continue
+        tmp_reason.setdefault(cid, {'like': {}, 'dislike': {}})
+        if it == 'like':
+            tmp_reason[cid]['like'][tag] = tmp_reason[cid]['like'].get(tag, 0) + int(row.get('count') or 0)
+        elif it == 'dislike':
+            tmp_reason[cid]['dislike'][tag] = tmp_reason[cid]['dislike'].get(tag, 0) + int(row.get('count') or 0)
+    return tmp_reason
+
+
+def load_company_reputation_scores(db) -> Dict[str, float]:
+    """Persisted reputation score of every company: {company_id: score}."""
+    scores: Dict[str, float] = {}
+    for rec in db['company_reputation'].find({}, {'_id': 0, 'company_id': 1, 'score': 1}):
+        cid = str(rec.get('company_id') or '')
+        # First record wins, as with find_one
+        if cid and cid not in scores and rec.get('score') is not None:
+            scores[cid] = float(rec['score'])
+    return scores
+
+
+def load_company_names(db) -> List[Tuple[Any, str]]:
+    """(company_id, normalized name) pairs for every company."""
+    pairs = []
+    for c in db['companies'].find({}, {'company_id': 1, 'name': 1}):
+        name = (c.get('name') or '').strip().lower()
+        if name:
+            pairs.append((c.get('company_id'), name))
+    return pairs
+
+
+class CompanySignals:
+    """One immutable snapshot of the global company signals."""
+
+    def __init__(self, interaction_counts: Mapping = None, reason_counts: Mapping = None,
+                 ratings: Mapping = None, reputation: Mapping = None,
+                 company_names: Sequence[Tuple[Any, str]] = ()):
+        self.interaction_counts: Mapping = dict(interaction_counts or {})
+        self.reason_counts: Mapping = dict(reason_counts or {})
+        self.ratings: Mapping = dict(ratings or {})
+        self.reputation: Mapping = dict(reputation or {})
+        self.company_names = tuple(company_names or ())
+        # What the scorer reads: by company_id and by normalized name
+        self.interaction_stats: Mapping = with_company_name_keys(self.interaction_counts, self.company_names)
+        self.reason_stats: Mapping = with_company_name_keys(self.reason_counts, self.company_names)
+        # Shared (unchanged) by every snapshot patched from this one
+        names_by_id: Dict[Any, List[str]] = {}
+        ids_by_name: Dict[str, List[Any]] = {}
+        for cid, name in self.company_names:
+            names_by_id.setdefault(cid, []).append(name)
+            ids_by_name.setdefault(name, []).append(cid)
+        self._names_by_id = names_by_id
+        self._ids_by_name = ids_by_name
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompanySignals):
+            return NotImplemented
+        if self is other:
+            return True
+        return (self.interaction_counts, self.reason_counts, self.ratings, self.reputation, self.company_names) == (
+            other.interaction_counts, other.reason_counts, other.ratings, other.reputation, other.company_names)
+
+    def reputation_scores(self, company_ids: Iterable[Any]) -> Dict[str, float]:
+        """{company_id: reputation score} for these companies (those that have one)."""
+        scores = {}
+        for cid in company_ids or []:
+            cid = str(cid or '')
+            if cid and cid in self.reputation:
+                scores[cid] = self.reputation[cid]
+        return scores
+
+    def with_company(self, company_id, *, interactions: Optional[Sequence[Mapping[str, Any]]] = None,
+                     reputation: Optional[float] = None, rating: Optional[float] = None,
+                     set_rating: bool = False) -> 'CompanySignals':
+        """New snapshot with one company's counts (from all its interactions), reputation or rating replaced.
+
+        Only that company's entries are written; everything else is shared with this snapshot.
+        """
+        patched = copy.copy(self)
+        if interactions is not None:
+            counts = interaction_counts(interactions)
+            reasons = reason_counts(interactions)
+            patched.interaction_counts = _patched(
+                self.interaction_counts, {company_id: _DELETED if counts is None else counts})
+            patched.reason_counts = _patched(
+                self.reason_counts, {company_id: _DELETED if reasons is None else reasons})
+            patched.interaction_stats = _patched(
+                self.interaction_stats, self._name_keys(patched.interaction_counts, company_id))
+            patched.reason_stats = _patched(
+                self.reason_stats, self._name_keys(patched.reason_counts, company_id))
+        if reputation is not None:
+            patched.reputation = _patched(self.reputation, {str(company_id): float(reputation)})
+        if set_rating:
+            patched.ratings = _patched(self.ratings, {company_id: rating if rating else _DELETED})
+        return patched
+
+    def _name_keys(self, stats: Mapping, company_id) -> Dict[Any, Any]:
+        """The scorer-facing entries of `company_id` and its names, as `with_company_name_keys` resolves them."""
+        entries = {}
+        for key in (company_id, *self._names_by_id.get(company_id, ())):
+            owners = [cid for cid in self._ids_by_name.get(key, ()) if cid in stats]
+            entries[key] = stats[owners[-1]] if owners else stats.get(key, _DELETED)
+        return entries
+
+
+def _database():
+    # No reconnect attempt here: the request path must not wait on a down cluster.
+    from app.core.database import db_manager
+
+    db = db_manager.current_db()
+    if db is None:
+        raise RuntimeError('database unavailable')
+    return db
+
+
+def load_company_signals() -> CompanySignals:
+    """Full snapshot from Mongo (queries run concurrently)."""
+    from app.utils.context_loader import load_concurrently
+
+    db = _database()
+    results, _ = load_concurrently({
+        'interaction_counts': lambda: load_company_interaction_counts(db),
+        'reason_counts': lambda: load_company_reason_counts(db),
+        'ratings': lambda: load_company_ratings(db),
+        'reputation': lambda: load_company_reputation_scores(db),
+        'company_names': lambda: load_company_names(db),
+    }, label='company signals')
+    missing = [name for name, value in results.items() if value is None]
+    if missing:
+        # Never replace a good snapshot with a partial one
+        raise RuntimeError(f"could not load {', '.join(missing)}")
+    return CompanySignals(**results)
+
+
+def _configured_ttl() -> float:
+    try:
+        from app.config import Config
+        return float(getattr(Config, 'COMPANY_SIGNALS_TTL', DEFAULT_TTL))
+    except Exception:
+        return float(DEFAULT_TTL)
+
+
+class CompanySignalStore:
+    """Thread-safe holder of the current CompanySignals snapshot."""
+
+    def __init__(self, loader: Callable[[], CompanySignals] = load_company_signals, ttl: Optional[float] = None):
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        # (snapshot, expires_at) - replaced as a whole on every swap
+        self._state: Optional[Tuple[CompanySignals, float]] = None
+        # Patches applied while a reload is in flight, replayed onto its result
+        self._pending: Optional[List[Callable[[CompanySignals], CompanySignals]]] = None
+        self.loads = 0
+        self.failures = 0
+        self.updates = 0
+        # Bumped whenever the snapshot's contents change
+        self.version = 0
+        # Bumped only by reconciles that find new contents (patches included), so keys built
+        # on it (the recommendation cache) survive individual like/dislike/review patches
+        self.reconciled_version = 0
+        self._patched = False
+
+    @property
+    def ttl(self) -> float:
+        return _configured_ttl() if self._ttl is None else self._ttl
+
+    def snapshot(self) -> CompanySignals:
+        """Current signals (loads on first use; reconciles in the background after the TTL)."""
+        state = self._state
+        if state is None:
+            with self._lock:
+                if self._state is None:
+                    self.reconcile()
+                state = self._state
+            return state[0] if state is not None else CompanySignals()
+        if time.monotonic() >= state[1]:
+            self._reconcile_in_background()
+        return state[0]
+
+    def reconcile(self) -> bool:
+        """Reload everything from Mongo. False (keeping the current snapshot) on failure."""
+        with self._lock:
+            if self._pending is not None:
+                return False  # another reload is in flight
+            self._pending = []
+        try:
+            fresh = self._loader()
+        except Exception as e:
+            self.failures += 1
+            from app.utils.logger import app_logger
+            app_logger.warning(f"Could not load company signals: {e}")
+            with self._lock:
+                self._pending = None
+                current = self._state[0] if self._state else CompanySignals()
+                self._state = (current, time.monotonic() + min(self.ttl, _FAILED_TTL))
+            return False
+        with self._lock:
+            for patch in self._pending:
+                fresh = patch(fresh)
+            self._pending = None
+            if self._state is None or fresh != self._state[0]:
+                self.version += 1
+            if self._state is None or self._patched or fresh != self._state[0]:
+                self.reconciled_version += 1
+            self._patched = False
+            self._state = (fresh, time.monotonic() + self.ttl)
+            self.loads += 1
+        return True
+
+    def _reconcile_in_background(self) -> None:
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.reconcile()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name='company-signals-reconcile', daemon=True).start()
+
+    def _apply(self, patch: Callable[[CompanySignals], CompanySignals]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(patch)
+            if self._state is not None:
+                self._state = (patch(self._state[0]), self._state[1])
+                self.version += 1
+                self._patched = True
+            self.updates += 1
+
+    def apply_interactions(self, company_id, interactions: Sequence[Mapping[str, Any]],
+                           reputation: Optional[float] = None) -> None:
+        """Replace one company's counts with a recount of all its interactions (after a like/dislike/removal)."""
+        interactions = list(interactions or [])
+        self._apply(lambda s: s.with_company(company_id, interactions=interactions, reputation=reputation))
+
+    def apply_rating(self, company_id, rating: Optional[float]) -> None:
+        """Replace one company's average review rating (falsy: the company has no rating)."""
+        self._apply(lambda s: s.with_company(company_id, rating=rating, set_rating=True))
+
+    def stats(self) -> Dict[str, Any]:
+        state = self._state
+        return {
+            'loaded': state is not None,
+            'version': self.version,
+            'reconciled_version': self.reconciled_version,
+            'companies': len(state[0].interaction_counts) if state else 0,
+            'loads': self.loads,
+            'updates': self.updates,
+            'failures': self.failures,
+        }
+
+
+company_signals = CompanySignalStore()
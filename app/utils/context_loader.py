@@ -0,0 +1,94 @@
+"""Concurrent loading of request context (scoring inputs).
+
+A recommendation request needs a handful of independent Mongo reads (the
+candidate, the catalog, interactions, ratings, global stats, ...). Issued one
+after the other, endpoint latency is the sum of their round trips. This module
+runs them on a shared, bounded thread pool (pymongo clients are thread-safe) so
+latency approaches the slowest query instead.
+
+Each query is a zero-argument callable. A query that raises, or that has not
+finished when the batch deadline passes, yields its default value; a timed-out
+query keeps its worker until the driver returns, but its result is dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 10.0
+
+_pool_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _config_value(name: str, default):
+    try:
+        from app.config import Config
+        return type(default)(getattr(Config, name, default))
+    except Exception:
+        return default
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = max(1, _config_value('CONTEXT_LOADER_WORKERS', DEFAULT_WORKERS))
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='context-loader')
+    return _pool
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def load_concurrently(
+    queries: Mapping[str, Callable[[], Any]],
+    defaults: Optional[Mapping[str, Any]] = None,
+    timeout: Optional[float] = None,
+    label: str = 'context',
+) -> Tuple[Dict[str, Any], Dict[str, Optional[float]]]:
+    """Run `queries` concurrently; return ({name: result}, {name: seconds}).
+
+    Failed or timed-out queries get `defaults[name]` (None if absent) and a
+    timing of None. `timeout` bounds the whole batch (Config.CONTEXT_LOADER_TIMEOUT
+    by default). Queries must not submit work to this loader themselves.
+    """
+    from app.utils.logger import app_logger
+
+    defaults = defaults or {}
+    if timeout is None:
+        timeout = _config_value('CONTEXT_LOADER_TIMEOUT', DEFAULT_TIMEOUT)
+
+    started = time.perf_counter()
+    pool = _executor()
+    futures = {name: pool.submit(_timed, fn) for name, fn in queries.items()}
+    wait(futures.values(), timeout=timeout if timeout > 0 else None)
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Optional[float]] = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            app_logger.warning(f"{label} query '{name}' timed out after {timeout:.1f}s")
+            results[name], timings[name] = defaults.get(name), None
+            continue
+        try:
+            results[name], timings[name] = future.result()
+        except Exception as e:
+            app_logger.warning(f"{label} query '{name}' failed: {e}")
+            results[name], timings[name] = defaults.get(name), None
+
+    elapsed = time.perf_counter() - started
+    detail = ', '.join(
+        f"{name}={'-' if t is None else f'{t * 1000:.0f}ms'}" for name, t in timings.items()
+    )
+    app_logger.debug(f"{label} loaded in {elapsed * 1000:.0f}ms ({detail})")
+    return results, timings
@@ -156,6 +156,86 @@ def create_bookmarks_indexes():
         }
 
 
+def create_recommendations_indexes():
+    """Create indexes for the materialized recommendations collection."""
+    try:
+        db_manager = DatabaseManager()
+        db = db_manager.get_db()
+        collection = db.recommendations
+
+        collection.create_index(
+            [("candidate_id", 1), ("internship_id", 1)],
+            unique=True,
+            name="idx_candidate_internship",
+        )
+        app_logger.info("Created recommendations index: candidate_id + internship_id")
+
+        return {
+            'success': True,
+            'message': 'All indexes created successfully'
+        }
+
+    except Exception as e:
+        app_logger.error(f"Error creating recommendations indexes: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def create_internship_neighbors_indexes():
+    """Create indexes for the precomputed similar-internship lists."""
+    try:
+        db_manager = DatabaseManager()
+        db = db_manager.get_db()
+        collection = db.internship_neighbors
+
+        collection.create_index(
+            [("internship_id", 1)],
+            unique=True,
+            name="idx_internship_id",
+        )
+        app_logger.info("Created internship_neighbors index: internship_id")
+
+        return {
+            'success': True,
+            'message': 'All indexes created successfully'
+        }
+
+    except Exception as e:
+        app_logger.error(f"Error creating internship_neighbors indexes: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def create_catalog_indexes():
+    """Create the indexes the catalog snapshot's change checks use (newest updated_at)."""
+    try:
+        db_manager = DatabaseManager()
+        db = db_manager.get_db()
+
+        for name in ('internships', 'companies'):
+            db[name].create_index(
+                [("updated_at", -1)],
+                name="idx_updated_at",
+            )
+            app_logger.info(f"Created {name} index: updated_at")
+
+        return {
+            'success': True,
+            'message': 'All indexes created successfully'
+        }
+
+    except Exception as e:
+        app_logger.error(f"Error creating catalog indexes: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
 def create_all_indexes():
     """
     Create all necessary database indexes
@@ -186,6 +266,24 @@ def create_all_indexes():
         'collection': 'bookmarks',
         'result': result
     })
+
+    result = create_recommendations_indexes()
+    results.append({
+        'collection': 'recommendations',
+        'result': result
+    })
+
+    result = create_internship_neighbors_indexes()
+    results.append({
+        'collection': 'internship_neighbors',
+        'result': result
+    })
+
+    result = create_catalog_indexes()
+    results.append({
+        'collection': 'internships, companies',
+        'result': result
+    })
     
     return results
 
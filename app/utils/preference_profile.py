@@ -10,10 +10,13 @@ every request, while keeping the logic explainable.
 from __future__ import annotations
 
 from collections import Counter
+import copy
 from datetime import datetime
 import re
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
+from app.utils.single_flight import single_flight
+
 
 _STOPWORDS = {
     "intern",
@@ -269,7 +272,18 @@ def rebuild_and_save_personal_preference_profile(db, candidate_id: str) -> Optio
     return profile
 
 
+_profile_flight = single_flight('preference_profile')
+
+
 def load_personal_preference_profile(db, candidate_id: str) -> Optional[Dict[str, Any]]:
+    """The candidate's stored profile; concurrent reads for one candidate share a query.
+
+    Every caller gets its own copy of the shared result, so callers may mutate it.
+    """
     if db is None:
         return None
-    return db["personal_preference_profiles"].find_one({"candidate_id": str(candidate_id)})
+    profile = _profile_flight.do(
+        (getattr(db, "name", None), str(candidate_id)),
+        db["personal_preference_profiles"].find_one, {"candidate_id": str(candidate_id)},
+    )
+    return copy.deepcopy(profile)
@@ -0,0 +1,194 @@
+"""Per-candidate cache of recommendation responses.
+
+Paging between the dashboard and company pages re-requested
+`/api/recommendations/<candidate_id>` with nothing changed, and every request
+recomputed the full ranking. Results are cached under
+
+    (candidate_id, query params, catalog version, company-signals version)
+
+where the catalog version is the catalog snapshot version (the key is built
+after the feature store has synced to that snapshot) plus `feature_store.version`
+(bumped when compiled features are invalidated) and the signals version is
+`company_signals.reconciled_version` (bumped by a reconcile that finds changed
+signals, so other users' likes/dislikes/reviews show up within one reconcile
+interval instead of dropping every entry). Candidate-specific inputs (profile,
+interactions, bookmarks, preference profile) have no cheap version, so writes
+to them call `invalidate_candidate()`; an entry computed before the
+candidate's last invalidation is never served, even if its computation was
+still running when the write happened.
+
+Entries also expire after `ttl` seconds, which bounds staleness from writes made
+by other worker processes or scripts. The LRU is bounded by the approximate
+JSON size of the cached payloads.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300
+# Candidates whose last invalidation time is remembered individually
+_MAX_INVALIDATIONS = 100_000
+
+
+def _config_value(name: str, default):
+    try:
+        from app.config import Config
+        return type(default)(getattr(Config, name, default))
+    except Exception:
+        return default
+
+
+def _payload_size(payload: Any) -> int:
+    try:
+        return len(json.dumps(payload, default=str))
+    except Exception:
+        return 64 * 1024
+
+
+class _Entry:
+    __slots__ = ('payload', 'size', 'tags', 'computed_at', 'expires_at')
+
+    def __init__(self, payload, size, tags, computed_at, expires_at):
+        self.payload = payload
+        self.size = size
+        self.tags = tags
+        self.computed_at = computed_at
+        self.expires_at = expires_at
+
+
+class RecommendationCache:
+    """Thread-safe LRU of response payloads, bounded by size, with per-candidate invalidation."""
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[str, Set[Hashable]] = {}
+        # Logical clock: a computation started at tick t is stale if its candidate was invalidated at >= t
+        self._clock = itertools.count(1)
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._invalidated_floor = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return _config_value('RECOMMENDATION_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES) if self._max_bytes is None else self._max_bytes
+
+    @property
+    def ttl(self) -> float:
+        return _config_value('RECOMMENDATION_CACHE_TTL', float(DEFAULT_TTL)) if self._ttl is None else self._ttl
+
+    def begin(self) -> int:
+        """Tick to pass to `put()`; take it before loading any inputs."""
+        return next(self._clock)
+
+    def _stale(self, entry: _Entry) -> bool:
+        if entry.computed_at <= self._invalidated_floor:
+            return True
+        return any(self._invalidated.get(tag, 0) >= entry.computed_at for tag in entry.tags)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (time.monotonic() >= entry.expires_at or self._stale(entry)):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.payload
+
+    def put(self, key: Hashable, payload: Any, tags: Iterable[Any], started: int) -> bool:
+        """Cache `payload` for the candidate ids in `tags`; False if they changed since `started`."""
+        tags = frozenset(str(t) for t in tags if t)
+        size = _payload_size(payload)
+        if size > self.max_bytes:
+            return False
+        entry = _Entry(payload, size, tags, started, time.monotonic() + self.ttl)
+        with self._lock:
+            if self._stale(entry):
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.bytes += size
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while self.bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def changed_since(self, tags: Iterable[Any], started: int) -> bool:
+        """Whether any of these candidate ids was invalidated at or after tick `started`."""
+        entry = _Entry(None, 0, frozenset(str(t) for t in tags if t), started, 0.0)
+        with self._lock:
+            return self._stale(entry)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def invalidate_candidate(self, candidate_id: Any) -> None:
+        """Drop a candidate's cached results after a write to their profile, interactions or bookmarks."""
+        tag = str(candidate_id or '')
+        if not tag:
+            return
+        with self._lock:
+            self._invalidated[tag] = next(self._clock)
+            self._invalidated.move_to_end(tag)
+            while len(self._invalidated) > _MAX_INVALIDATIONS:
+                _, tick = self._invalidated.popitem(last=False)
+                self._invalidated_floor = max(self._invalidated_floor, tick)
+            for key in list(self._by_tag.get(tag, ())):
+                self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self.bytes = 0
+            self._invalidated.clear()
+            self._invalidated_floor = next(self._clock)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+recommendation_cache = RecommendationCache()
+
+
+def invalidate_candidate(candidate_id: Any) -> None:
+    """Invalidate cached recommendations after a write that affects this candidate."""
+    recommendation_cache.invalidate_candidate(candidate_id)
@@ -0,0 +1,149 @@
+"""Materialized recommendation scores (`recommendations` collection).
+
+`CompanyMatchScorer._get_avg_internship_scores` averages the candidate's
+`match_score` over a company's internships from `db.recommendations`. This
+module keeps that collection populated: one row per (candidate_id,
+internship_id) with the score the recommender gives the internship, written
+with a single unordered `bulk_write` per candidate (upserts plus removal of
+rows for internships that left the catalog).
+
+Rows are refreshed
+- in the background after profile and interaction writes
+  (`schedule_materialization`, coalesced per candidate), and
+- for every candidate by `scripts/materialize_recommendations.py` (scheduled).
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+try:
+    from pymongo import DeleteMany, UpdateOne
+except Exception:  # pragma: no cover
+    DeleteMany = UpdateOne = None
+
+
+def build_recommendation_rows(candidate_id: str, recommendations: Iterable[Mapping[str, Any]],
+                              now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """One row per scored internship (first score wins if an id repeats)."""
+    now = now or datetime.utcnow()
+    rows: Dict[str, Dict[str, Any]] = {}
+    for rec in recommendations or []:
+        iid = rec.get('internship_id')
+        score = rec.get('match_score')
+        if not iid or score is None or str(iid) in rows:
+            continue
+        rows[str(iid)] = {
+            'candidate_id': str(candidate_id),
+            'internship_id': str(iid),
+            'match_score': round(float(score), 2),
+            'updated_at': now,
+        }
+    return list(rows.values())
+
+
+def save_recommendation_rows(db, candidate_id: str, rows: List[Dict[str, Any]]) -> int:
+    """Upsert a candidate's rows and drop the ones no longer scored; returns rows written."""
+    if db is None or UpdateOne is None:
+        return 0
+    candidate_id = str(candidate_id)
+    ops = [
+        UpdateOne({'candidate_id': candidate_id, 'internship_id': row['internship_id']}, {'$set': row}, upsert=True)
+        for row in rows
+    ]
+    ops.append(DeleteMany({'candidate_id': candidate_id, 'internship_id': {'$nin': [r['internship_id'] for r in rows]}}))
+    db['recommendations'].bulk_write(ops, ordered=False)
+    return len(rows)
+
+
+def materialize_candidate(db, candidate_id: str, internships: Optional[List[Mapping[str, Any]]] = None) -> int:
+    """Score the whole catalog for one candidate and persist the scores."""
+    from app.api.recommendations import load_recommendation_inputs, ml_get_recommendations, rank_candidate_internships
+
+    if db is None or ml_get_recommendations is None:
+        return 0
+    inputs = load_recommendation_inputs(candidate_id, internships=internships)
+    if not inputs.get('candidate') or not inputs.get('internships'):
+        return 0
+    recs = rank_candidate_internships(candidate_id, inputs, top_n=None, min_score=0.0, dedupe_org=False, retrieve=False)
+    return save_recommendation_rows(db, candidate_id, build_recommendation_rows(candidate_id, recs))
+
+
+def materialize_all(db) -> Dict[str, int]:
+    """Refresh rows for every candidate with a profile (the catalog is loaded once)."""
+    from app.api.recommendations import load_all_internships
+    from app.utils.logger import app_logger
+
+    result = {'candidates': 0, 'rows': 0, 'failed': 0}
+    if db is None:
+        return result
+    internships = load_all_internships()
+    if not internships:
+        return result
+    candidate_ids = db['profiles'].distinct('candidate_id')
+    for candidate_id in candidate_ids:
+        if not candidate_id:
+            continue
+        try:
+            result['rows'] += materialize_candidate(db, str(candidate_id), internships=internships)
+            result['candidates'] += 1
+        except Exception as e:
+            result['failed'] += 1
+            app_logger.warning(f"Could not materialize recommendations for {candidate_id}: {e}")
+    return result
+
+
+class _MaterializationQueue:
+    """Single background worker; a candidate queued several times is scored once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending: Dict[str, None] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, candidate_id: str) -> None:
+        with self._lock:
+            self._pending[str(candidate_id)] = None
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='recommendation-materializer', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _next(self) -> Optional[str]:
+        with self._lock:
+            if not self._pending:
+                self._wake.clear()
+                return None
+            candidate_id = next(iter(self._pending))
+            del self._pending[candidate_id]
+            return candidate_id
+
+    def _run(self) -> None:
+        from app.core.database import db_manager
+        from app.utils.logger import app_logger
+
+        while True:
+            candidate_id = self._next()
+            if candidate_id is None:
+                if not self._wake.wait(60):
+                    with self._lock:
+                        if not self._pending:
+                            self._thread = None
+                            return
+                continue
+            try:
+                materialize_candidate(db_manager.current_db(), candidate_id)
+            except Exception as e:
+                app_logger.warning(f"Could not materialize recommendations for {candidate_id}: {e}")
+
+
+_queue = _MaterializationQueue()
+
+
+def schedule_materialization(candidate_id: Any) -> None:
+    """Refresh a candidate's materialized scores in the background (after a profile/interaction write)."""
+    if candidate_id:
+        _queue.schedule(str(candidate_id))
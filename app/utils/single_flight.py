@@ -0,0 +1,98 @@
+"""Single-flight coalescing of concurrent identical loads.
+
+Under gunicorn `-k gthread` several threads of a worker often miss the same
+data at the same moment: the catalog sync after a snapshot swap, global
+company ratings, or a candidate's preference profile and recommendations when
+the SPA fires parallel calls. `SingleFlight.do(key, fn)` runs `fn` once per key
+at a time; callers that arrive while it is running wait for that execution
+and get its result (or its exception) instead of starting their own.
+
+Nothing is cached: a call made after the execution finished runs `fn` again.
+Callers of one execution share the returned object and must not mutate it.
+Groups are registered by name; `single_flight_stats()` reports executions and
+coalesced callers per group (`/api/admin/db-stats`).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution."""
+
+    def __init__(self, name: str = ''):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """fn(*args, **kwargs), or the result of the call with this key already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn(*args, **kwargs)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.executions + self.coalesced
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'coalesced_rate': round(self.coalesced / calls, 4) if calls else 0.0,
+            'errors': self.errors,
+            'in_flight': len(self._calls),
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def single_flight(name: str) -> SingleFlight:
+    """The process-wide group with this name (created on first use)."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.stats() for name, group in sorted(groups.items())}
@@ -0,0 +1,111 @@
+"""
+Benchmark two-stage retrieval against exhaustive scoring.
+
+Builds a synthetic catalog by perturbing data/internships.json (skills, city,
+sector, organization), then for random candidates compares:
+- exhaustive: get_recommendations over the whole catalog
+- two-stage: retrieve_candidates(pool_size) + get_recommendations on the pool
+
+and reports recall@10 (overlap of the two top-10 id sets) and latency for a
+range of pool sizes. Use it to size RETRIEVAL_POOL_SIZE for a catalog.
+
+Usage:
+    python scripts/benchmark_retrieval.py --catalog 20000 --candidates 30 --pools 500,1000,2000,5000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.candidate_context import compile_candidate_context  # noqa: E402
+from app.core.city_coords import CITY_COORDINATES  # noqa: E402
+from app.core.feature_store import feature_store  # noqa: E402
+from app.core.ml_model import get_recommendations  # noqa: E402
+from app.core.retrieval import retrieve_candidates  # noqa: E402
+
+
+def build_catalog(size, rng):
+    base = json.load(open(os.path.join(ROOT, "data", "internships.json"), encoding="utf-8"))
+    skills = sorted({s for i in base for s in i.get("skills_required", [])})
+    sectors = sorted({i.get("sector") for i in base if i.get("sector")})
+    orgs = sorted({i.get("organization") for i in base if i.get("organization")})
+    cities = list(CITY_COORDINATES.keys())[:400]
+
+    catalog = []
+    for n in range(size):
+        doc = dict(rng.choice(base))
+        doc["internship_id"] = f"BENCH_{n:06d}"
+        doc["organization"] = f"{rng.choice(orgs)} {rng.randint(1, size // 20 + 1)}"
+        doc["location"] = rng.choice(cities)
+        doc["sector"] = rng.choice(sectors)
+        doc["skills_required"] = rng.sample(skills, rng.randint(1, 6))
+        doc["stipend"] = rng.choice([None, 5000, 10000, 15000, 25000])
+        catalog.append(doc)
+    return catalog, skills, sectors, cities
+
+
+def random_candidate(rng, skills, sectors, cities):
+    return {
+        "skills_possessed": rng.sample(skills, rng.randint(1, 6)),
+        "sector_interests": [s.lower() for s in rng.sample(sectors, rng.randint(0, 2))],
+        "location_preference": rng.choice(cities + [""]),
+        "first_generation": rng.random() < 0.3,
+    }
+
+
+def top_ids(recs):
+    return [r["internship_id"] for r in recs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--catalog", type=int, default=20000)
+    parser.add_argument("--candidates", type=int, default=30)
+    parser.add_argument("--pools", default="500,1000,2000,5000")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--engine", default="vectorized")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    catalog, skills, sectors, cities = build_catalog(args.catalog, rng)
+    features_by_id = {f.key: f for f in feature_store.sync(catalog)}
+    pools = [int(p) for p in args.pools.split(",") if p.strip()]
+
+    recall = {p: [] for p in pools}
+    timings = {p: [] for p in pools}
+    exhaustive_ms = []
+
+    for _ in range(args.candidates):
+        candidate = random_candidate(rng, skills, sectors, cities)
+        ctx = compile_candidate_context(candidate, features_by_id)
+
+        t0 = time.perf_counter()
+        truth = top_ids(get_recommendations(candidate, catalog, top_n=args.k, engine=args.engine, context=ctx))
+        exhaustive_ms.append((time.perf_counter() - t0) * 1000)
+
+        for pool_size in pools:
+            t0 = time.perf_counter()
+            pool = retrieve_candidates(catalog, ctx, pool_size)
+            got = top_ids(get_recommendations(candidate, pool, top_n=args.k, engine=args.engine, context=ctx))
+            timings[pool_size].append((time.perf_counter() - t0) * 1000)
+            recall[pool_size].append(len(set(got) & set(truth)) / max(1, len(truth)))
+
+    print(f"catalog={args.catalog} candidates={args.candidates} k={args.k} engine={args.engine}")
+    print(f"exhaustive        p50={statistics.median(exhaustive_ms):8.1f} ms")
+    for pool_size in pools:
+        print(
+            f"pool={pool_size:<7d}  recall@{args.k}={statistics.mean(recall[pool_size]):.3f}"
+            f"  min={min(recall[pool_size]):.2f}  p50={statistics.median(timings[pool_size]):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
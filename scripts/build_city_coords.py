@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Build backend/city_coords.py from data/cities.in.json
+Build app/core/city_coords.bin (and backend/city_coords.py) from data/cities.in.json
 
 Input JSON format (array of objects):
 [
@@ -8,15 +8,21 @@ Input JSON format (array of objects):
   {"city": "Navi Mumbai", "lat": 19.0330, "lon": 73.0297}
 ]
 
-Output: backend/city_coords.py module with CITY_COORDINATES and DISPLAY_NAMES.
+Output:
+- app/core/city_coords.bin: compact binary store (lat/lon arrays, name table,
+  alias table) that app/core/city_coords.py memory-maps, see app/core/city_store.py
+- backend/city_coords.py module with CITY_COORDINATES, DISPLAY_NAMES and
+  CITY_NAME_ALIASES (normalized alias -> city key), for inspection.
 """
 import json
 import os
+import sys
 from typing import Dict, Tuple, List
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(ROOT, 'data', 'cities.in.json')
 OUT_PATH = os.path.join(ROOT, 'backend', 'city_coords.py')
+BIN_PATH = os.path.join(ROOT, 'app', 'core', 'city_coords.bin')
 
 
 def normalize_key(name: str) -> str:
@@ -49,6 +55,25 @@ def load_cities() -> List[dict]:
     return cleaned
 
 
+def alias_map(rows: List[dict]) -> Dict[str, str]:
+    """Normalized alias -> city key (first city claiming an alias wins; keys are never aliases)."""
+    claimed = {r['key'] for r in rows}
+    aliases = {}
+    for r in rows:
+        for alias in r['aliases']:
+            alias_key = normalize_key(alias)
+            if alias_key and alias_key not in claimed:
+                claimed.add(alias_key)
+                aliases[alias_key] = r['key']
+    return aliases
+
+
+def write_binary(rows: List[dict]) -> None:
+    sys.path.insert(0, ROOT)
+    from app.core.city_store import write_city_store
+    write_city_store(BIN_PATH, rows, alias_map(rows))
+
+
 def write_module(rows: List[dict]) -> None:
     header = (
         '"""\n'
@@ -68,12 +93,21 @@ def write_module(rows: List[dict]) -> None:
         disp_lines.append(f"    {r['key']!r}: {r['city']!r},")
     disp_lines.append("}\n")
 
+    # CITY_NAME_ALIASES maps normalized alias -> key
+    alias_lines = ["CITY_NAME_ALIASES: dict[str, str] = {"]
+    for alias_key, key in alias_map(rows).items():
+        alias_lines.append(f"    {alias_key!r}: {key!r},")
+    alias_lines.append("}\n")
+
     util = (
         "def get_all_display_cities_sorted() -> list[str]:\n"
         "    return sorted(DISPLAY_NAMES.values())\n"
     )
 
-    content = header + "\n".join(coord_lines) + "\n" + "\n".join(disp_lines) + "\n" + util + "\n"
+    content = (
+        header + "\n".join(coord_lines) + "\n" + "\n".join(disp_lines) + "\n"
+        + "\n".join(alias_lines) + "\n" + util + "\n"
+    )
     os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
     with open(OUT_PATH, 'w', encoding='utf-8') as f:
         f.write(content)
@@ -83,8 +117,9 @@ def main():
     rows = load_cities()
     if not rows:
         raise SystemExit('No valid cities found in data/cities.in.json')
+    write_binary(rows)
     write_module(rows)
-    print(f"Wrote {len(rows)} cities to {OUT_PATH}")
+    print(f"Wrote {len(rows)} cities to {BIN_PATH} and {OUT_PATH}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Build data/city_distances.npy from the city store (app/core/city_coords.bin)
+
+Each city in CITY_COORDINATES gets an integer index (its position in the store)
+and the pairwise distance matrix is written as a .npy file that
+app/core/distance_matrix.py memory-maps read-only.
+
+Cells are uint16 tenths of a kilometer: get_distance rounds to 0.1 km, so this
+is exact, and half the size of float32 (3000 cities ~ 18 MB).
+
+Output:
+  data/city_distances.npy   N x N uint16 matrix
+  data/city_distances.json  {"cities": [...]} index (row order)
+
+Run after scripts/build_city_coords.py (the app ignores a stale matrix).
+"""
+import json
+import os
+import sys
+from typing import List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.city_coords import CITY_COORDINATES  # noqa: E402
+from app.core.distance_matrix import DISTANCE_INDEX_PATH, DISTANCE_MATRIX_PATH, DISTANCE_SCALE, haversine_km  # noqa: E402
+
+
+def build_matrix(cities: List[str]) -> np.ndarray:
+    coords = [CITY_COORDINATES[c] for c in cities]
+    n = len(coords)
+    matrix = np.zeros((n, n), dtype=np.uint16)
+    limit = np.iinfo(np.uint16).max
+    for i in range(n):
+        a = coords[i]
+        row = [int(round(haversine_km(a, coords[j]) * DISTANCE_SCALE)) for j in range(i + 1, n)]
+        if row and max(row) > limit:
+            raise SystemExit(f'Distance from {cities[i]!r} does not fit in uint16 tenths of a km')
+        matrix[i, i + 1:] = row
+    # Haversine is symmetric; mirror the upper triangle.
+    return matrix + matrix.T
+
+
+def write_files(cities: List[str], matrix: np.ndarray) -> None:
+    os.makedirs(os.path.dirname(DISTANCE_MATRIX_PATH), exist_ok=True)
+    tmp_path = DISTANCE_MATRIX_PATH + '.tmp.npy'
+    np.save(tmp_path, matrix)
+    # Replace atomically so running workers never map a half-written file.
+    os.replace(tmp_path, DISTANCE_MATRIX_PATH)
+    with open(DISTANCE_INDEX_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'cities': cities, 'unit_km': 1 / DISTANCE_SCALE}, f)
+
+
+def main():
+    cities = list(CITY_COORDINATES)
+    if not cities:
+        raise SystemExit('CITY_COORDINATES is empty')
+    matrix = build_matrix(cities)
+    write_files(cities, matrix)
+    print(f"Wrote {len(cities)}x{len(cities)} distance matrix to {DISTANCE_MATRIX_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Rebuild the precomputed similar-internship lists (`internship_neighbors`).
+
+The API keeps the lists up to date in the background after each catalog load,
+recomputing only the lists an added/edited/removed internship can affect. Run
+this after bulk catalog imports, or to seed the collection for new processes.
+
+Usage: python scripts/build_similar_internships.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.database import db_manager  # noqa: E402
+from app.core.feature_store import feature_store  # noqa: E402
+from app.core.similar_internships import save_neighbor_lists, similar_internships  # noqa: E402
+from app.utils.db_indexes import create_internship_neighbors_indexes  # noqa: E402
+
+
+def main():
+    db = db_manager.get_db()
+    if db is None:
+        raise SystemExit('Database unavailable')
+    create_internship_neighbors_indexes()
+    start = time.perf_counter()
+    internships = list(db['internships'].find({}))
+    for internship in internships:
+        internship['_id'] = str(internship['_id'])
+    features = feature_store.sync(internships)
+    updated, _, _ = similar_internships.refresh(internships, features, feature_store.version)
+    lists = [similar_internships.neighbors(i) for i in updated]
+    save_neighbor_lists(db, lists, full=True)
+    print(f"Built {len(lists)} similar-internship lists for {len(internships)} internships "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Refresh the materialized `recommendations` collection for every candidate.
+
+Each candidate's full catalog ranking is written as (candidate_id, internship_id,
+match_score) rows, which CompanyMatchScorer averages per company. Profile and
+interaction writes refresh a single candidate in the background; run this on a
+schedule (see render.yaml) to pick up catalog changes for everyone.
+
+Usage: python scripts/materialize_recommendations.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.database import db_manager  # noqa: E402
+from app.utils.db_indexes import create_recommendations_indexes  # noqa: E402
+from app.utils.recommendation_materializer import materialize_all  # noqa: E402
+
+
+def main():
+    db = db_manager.get_db()
+    if db is None:
+        raise SystemExit('Database unavailable')
+    create_recommendations_indexes()
+    start = time.perf_counter()
+    result = materialize_all(db)
+    print(f"Materialized {result['rows']} rows for {result['candidates']} candidates "
+          f"({result['failed']} failed) in {time.perf_counter() - start:.1f}s")
+    if result['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
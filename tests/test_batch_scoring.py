@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+from app.core.ml_model import get_recommendations
+
+
+def _catalog():
+    return [
+        {"internship_id": "I1", "title": "Junior Data Intern", "organization": "OrgA", "company_id": "C1",
+         "location": "Mumbai", "sector": "Data", "skills_required": ["Python", "SQL"], "stipend": 15000,
+         "duration": "3 months", "is_beginner_friendly": True},
+        {"internship_id": "I2", "title": "Senior ML Intern", "organization": "OrgB", "company_id": "C2",
+         "location": "Pune", "sector": "Technology", "skills_required": ["Python", "Machine Learning", "Docker"],
+         "stipend": 25000, "duration": 6, "description": "mentorship provided"},
+        {"internship_id": "I3", "title": "Marketing Intern", "organization": "OrgC",
+         "location": "Remote", "sector": "Marketing", "skills_required": ["Communication"], "stipend": 5000},
+        {"internship_id": "I4", "title": "Data Analyst Intern", "organization": "OrgA", "company_id": "C1",
+         "location": "Thane", "sector": "Data", "skills_required": ["Excel", "SQL"], "stipend": 10000},
+        {"internship_id": "I5", "title": "Backend Intern", "organization": "OrgD",
+         "location": "Delhi", "sector": "Technology", "skills_required": ["Java", "SQL", "Git"]},
+    ]
+
+
+def test_vectorized_engine_matches_loop_engine():
+    candidate = {
+        "skills_possessed": ["python", "sql"],
+        "sector_interests": ["data"],
+        "location_preference": "Mumbai",
+        "education_level": "junior",
+        "first_generation": True,
+    }
+    kwargs = dict(
+        top_n=None,
+        dedupe_org=False,
+        company_ratings={"C1": 4.7, "C2": 2.5},
+        company_interaction_stats={"C1": {"like": 5, "dislike": 1}, "orgc": {"like": 0, "dislike": 3}},
+        company_reason_stats={"C2": {"like": {}, "dislike": {"Toxic environment": 2}}},
+        company_reputation={"C1": 80.0},
+        internship_interactions={
+            "I3": {"type": "dislike", "reason_tags": ["Low stipend", "Not interested in sector"]},
+            "I2": {"type": "like", "reason_tags": ["Great location", "Skills match well"]},
+        },
+        preference_profile={"strength": 0.5, "work_type": [("onsite", 1.0)], "seniority": [("junior", 1.0)]},
+    )
+
+    loop = get_recommendations(candidate, _catalog(), engine="loop", **kwargs)
+    vectorized = get_recommendations(candidate, _catalog(), engine="vectorized", **kwargs)
+
+    assert [r["internship_id"] for r in loop] == [r["internship_id"] for r in vectorized]
+    assert loop == vectorized
+
+
+def test_vectorized_engine_applies_top_n_and_org_dedupe():
+    candidate = {"skills_possessed": ["sql"], "location_preference": "Mumbai"}
+    recs = get_recommendations(candidate, _catalog(), top_n=2, engine="vectorized")
+
+    assert len(recs) == 2
+    assert len({r["organization"] for r in recs}) == 2
+    assert recs[0]["match_score"] >= recs[1]["match_score"]
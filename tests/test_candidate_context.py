@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+from app.core.candidate_context import CandidateContextCache, compile_candidate_context
+from app.core.feature_store import compile_internship_features, feature_store
+from app.core.ml_model import get_recommendations
+
+
+CATALOG = [
+    {"internship_id": "I1", "title": "Data Intern", "organization": "OrgA", "location": "Mumbai",
+     "sector": "Data", "skills_required": ["Python", "SQL"], "stipend": 15000},
+    {"internship_id": "I2", "title": "Junior Marketing Intern", "organization": "OrgB", "location": "Pune",
+     "sector": "Marketing", "skills_required": ["Communication"], "stipend": 5000},
+    {"internship_id": "I3", "title": "ML Intern", "organization": "OrgC", "location": "Thane",
+     "sector": "Data", "skills_required": ["Python", "Machine Learning"], "stipend": 20000},
+]
+CANDIDATE = {"skills_possessed": ["Python"], "sector_interests": ["data"], "location_preference": "Mumbai"}
+INTERACTIONS = {
+    "I1": {"type": "like", "reason_tags": ["Great location", "Good stipend"]},
+    "I2": {"type": "dislike", "reason_tags": ["Not interested in sector", "Low stipend"]},
+}
+
+
+def _features_by_id():
+    return {f.key: f for f in feature_store.features_for(CATALOG)}
+
+
+def test_compiled_context_gives_same_results_as_raw_inputs():
+    ctx = compile_candidate_context(CANDIDATE, _features_by_id(), INTERACTIONS)
+
+    assert ctx.liked_locations == ("mumbai",)
+    assert ctx.disliked_sectors == frozenset({"marketing"})
+    assert ctx.low_stipend == 5000
+    assert ctx.interactions["I2"] == (0.0, 0.30)
+    assert ctx.location_adjustment("thāne")[0] > 0  # near the liked Mumbai ("Thane" resolves to the accented key)
+
+    raw = get_recommendations(CANDIDATE, CATALOG, top_n=None, internship_interactions=INTERACTIONS)
+    compiled = get_recommendations(None, CATALOG, top_n=None, context=ctx)
+    assert raw == compiled
+
+
+def test_context_cache_recompiles_on_new_candidate_version():
+    cache = CandidateContextCache(maxsize=2)
+    first = cache.get_or_compile("C1", CANDIDATE, _features_by_id(), INTERACTIONS)
+    assert cache.get_or_compile("C1", dict(CANDIDATE), _features_by_id(), dict(INTERACTIONS)) is first
+
+    changed = dict(INTERACTIONS, I3={"type": "like", "reason_tags": []})
+    second = cache.get_or_compile("C1", CANDIDATE, _features_by_id(), changed)
+    assert second is not first
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2}
+
+
+def test_context_cache_recompiles_when_an_interacted_internship_changes():
+    cache = CandidateContextCache()
+    features = _features_by_id()
+    first = cache.get_or_compile("C1", CANDIDATE, features, INTERACTIONS)
+
+    moved = dict(CATALOG[0], location="Delhi")
+    features["I1"] = feature_store.get(moved)
+    assert cache.get_or_compile("C1", CANDIDATE, features, INTERACTIONS).liked_locations == ("delhi",)
+
+    # Records are compared by value, not identity
+    second = cache.get_or_compile("C1", CANDIDATE, features, INTERACTIONS)
+    features["I1"] = compile_internship_features(moved)
+    assert cache.get_or_compile("C1", CANDIDATE, features, INTERACTIONS) is second
+    # An interacted internship leaving the catalog is a change too
+    del features["I2"]
+    assert cache.get_or_compile("C1", CANDIDATE, features, INTERACTIONS) is not second
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+import json
+
+import pytest
+
+from app.utils import catalog_snapshot
+from app.utils.catalog_snapshot import CatalogSnapshot, CatalogStore, load_catalog_snapshot
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the snapshot loader."""
+
+    def __init__(self, docs):
+        self.docs = [dict(d) for d in docs]
+        self.queries = []
+
+    def _matches(self, doc, query):
+        if '$or' in query:
+            return any(self._matches(doc, q) for q in query['$or'])
+        for field, cond in query.items():
+            if '$exists' in cond and (field in doc) != cond['$exists']:
+                return False
+            if '$gt' in cond and not (field in doc and doc[field] > cond['$gt']):
+                return False
+            # The snapshot holds string ids; the fake's ids are ints, not ObjectIds
+            if '$in' in cond and str(doc.get(field)) not in map(str, cond['$in']):
+                return False
+        return True
+
+    def find(self, query=None, projection=None):
+        self.queries.append(query or {})
+        docs = [dict(d) for d in self.docs if self._matches(d, query or {})]
+        if projection and 0 in projection.values():
+            return [{k: v for k, v in d.items() if k not in projection} for d in docs]
+        if projection:
+            return [{k: v for k, v in d.items() if k == '_id' or k in projection} for d in docs]
+        return docs
+
+    def find_one(self, query, projection=None, sort=None):
+        docs = [d for d in self.docs if self._matches(d, query)]
+        if sort:
+            field, direction = sort[0]
+            docs.sort(key=lambda d: d[field], reverse=direction < 0)
+        return dict(docs[0]) if docs else None
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+
+def _db(monkeypatch):
+    db = {
+        'internships': FakeCollection([
+            {'_id': 1, 'internship_id': 'I1', 'organization': ' OrgA ', 'company_id': 'C1', 'skills_required': ['Python']},
+            {'_id': 2, 'internship_id': 'I2', 'organization': 'OrgB', 'updated_at': 5, 'description': 'Long text'},
+        ]),
+        'companies': FakeCollection([{'_id': 9, 'company_id': 'C1', 'name': 'OrgA', 'internship_ids': ['I2', 'I1']}]),
+    }
+    monkeypatch.setattr(catalog_snapshot, '_database', lambda: db)
+    return db
+
+
+def test_snapshot_documents_are_read_only_and_indexed(monkeypatch):
+    _db(monkeypatch)
+    snap = load_catalog_snapshot()
+
+    doc = snap.internship('I1')
+    with pytest.raises(TypeError):
+        doc['match_score'] = 1
+    with pytest.raises(TypeError):
+        doc.update(title='x')
+    assert doc['skills_required'] == ('Python',)
+    assert {**doc, 'match_score': 1}['match_score'] == 1
+    assert json.loads(json.dumps(doc))['skills_required'] == ['Python']
+
+    assert snap.internship('2')['internship_id'] == 'I2'
+    company = snap.company_by_name('orga')
+    assert company['company_id'] == 'C1' and snap.company('C1') is company
+    # Catalog order, not the order of the ids asked for
+    assert [i['internship_id'] for i in snap.find_internships(company['internship_ids'])] == ['I1', 'I2']
+    assert [i['internship_id'] for i in snap.internships_for_org('orga')] == ['I1']
+    assert [i['internship_id'] for i in snap.internships_for_company('C1')] == ['I1']
+
+
+def test_refresh_merges_new_and_restamped_documents(monkeypatch):
+    db = _db(monkeypatch)
+    first = load_catalog_snapshot()
+    assert load_catalog_snapshot(first) is first
+
+    interns = db['internships']
+    interns.docs[1] = {'_id': 2, 'internship_id': 'I2', 'organization': 'OrgB', 'title': 'New', 'updated_at': 6}
+    interns.docs.append({'_id': 3, 'internship_id': 'I3'})
+    interns.queries.clear()
+    second = load_catalog_snapshot(first)
+
+    assert second.version == first.version + 1
+    assert [i.get('title') for i in second.internships] == [None, 'New', None]
+    # Only the delta was read, and the unchanged companies were reused
+    assert interns.queries == [{'$or': [{'_id': {'$gt': 2}}, {'updated_at': {'$gt': 5}}]}]
+    assert second.companies[0] is first.companies[0]
+    assert second.internships[0] is first.internships[0]
+    assert first.internship('I2').get('title') is None
+
+    # A deletion doesn't add up as a delta: the collection is reloaded
+    del interns.docs[0]
+    third = load_catalog_snapshot(second)
+    assert [i['internship_id'] for i in third.internships] == ['I2', 'I3']
+
+
+def test_snapshot_loads_projections_and_hydrates_returned_documents(monkeypatch):
+    db = _db(monkeypatch)
+    snap = load_catalog_snapshot()
+
+    doc = snap.internship('I2')
+    assert 'description' not in doc and 'description' in doc.omitted_fields
+
+    interns = db['internships']
+    interns.queries.clear()
+    hydrated = catalog_snapshot.hydrate_internships([doc, snap.internship('I1')])
+    assert [d.get('description') for d in hydrated] == ['Long text', None]
+    assert len(interns.queries) == 1 and sorted(interns.queries[0]['_id']['$in']) == ['1', '2']
+    # Hydrated copies are plain, full documents; the snapshot is untouched
+    assert not hasattr(hydrated[0], 'omitted_fields')
+    assert 'description' not in snap.internship('I2')
+
+
+def test_store_keeps_the_last_snapshot_when_a_check_fails():
+    snaps = iter([CatalogSnapshot([{'internship_id': 'I1'}], version=1)])
+
+    def loader(previous, full_reload_ttl):
+        return next(snaps)
+
+    store = CatalogStore(loader=loader, ttl=300)
+    assert store.current() is None
+    first = store.snapshot()
+    assert store.snapshot() is first
+
+    assert store.refresh() is False  # loader exhausted -> error
+    assert store.current() is first
+    assert store.stats()['failures'] == 1
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+from app.core.city_coords import CITY_COORDINATES, DISPLAY_NAMES
+from app.core.city_store import CityStore, write_city_store
+
+
+def test_city_store_round_trip(tmp_path):
+    rows = [
+        {"key": "mumbai", "city": "Mumbai", "lat": 19.07283, "lon": 72.88261},
+        {"key": "thāne", "city": "Thāne", "lat": 19.19704, "lon": 72.96355},
+    ]
+    path = str(tmp_path / "cities.bin")
+    write_city_store(path, rows, {"bombay": "mumbai", "ghost": "atlantis"})
+
+    store = CityStore(path)
+    assert store.names == ["mumbai", "thāne"]
+    assert store.coordinates(store.index["thāne"]) == (19.19704, 72.96355)
+    assert store.display_name(1) == "Thāne"
+    assert store.aliases() == {"bombay": "mumbai"}
+
+
+def test_city_coordinates_mapping_interface():
+    assert len(CITY_COORDINATES) == 3000
+    assert CITY_COORDINATES["mumbai"] == (19.07283, 72.88261)
+    assert CITY_COORDINATES.get("atlantis") is None
+    assert "pune" in CITY_COORDINATES and "atlantis" not in CITY_COORDINATES
+    assert next(iter(CITY_COORDINATES)) == "mumbai"
+    assert DISPLAY_NAMES["delhi"] == "Delhi"
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from app.utils.company_reputation import build_company_reputation_record
+from app.utils.company_reputation import build_company_reputation_record, company_reputation_scores
 
 
 def test_company_reputation_score_moves_with_likes_dislikes_and_reasons():
@@ -18,3 +18,31 @@ def test_company_reputation_score_moves_with_likes_dislikes_and_reasons():
 
     # Net is still positive (2 likes vs 1 dislike) so should be above neutral.
     assert rec["score"] > 50
+
+
+class _Collection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        wanted = set(query["company_id"]["$in"])
+        return [d for d in self.docs if d["company_id"] in wanted]
+
+
+def test_company_reputation_scores_use_one_in_query():
+    coll = _Collection([
+        {"company_id": "c1", "score": 70.0},
+        {"company_id": "c2", "score": None},
+        {"company_id": "c1", "score": 10.0},
+        {"company_id": "c3", "score": 40},
+    ])
+    db = {"company_reputation": coll}
+
+    scores = company_reputation_scores(db, ["c1", "c2", "c1", None, "c3", "c4"])
+
+    assert scores == {"c1": 70.0, "c3": 40.0}
+    assert coll.queries == [{"company_id": {"$in": ["c1", "c2", "c3", "c4"]}}]
+    assert company_reputation_scores(db, [None, ""]) == {}
+    assert len(coll.queries) == 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import threading
+
+from app.utils.company_signals import CompanySignals, CompanySignalStore
+
+
+INTERACTIONS = [
+    {"company_id": "c1", "interaction_type": "like", "reason_tags": ["Great company culture", "Excellent benefits"]},
+    {"company_id": "c1", "interaction_type": "like", "reason_tags": ["Great company culture"]},
+    {"company_id": "c1", "interaction_type": "dislike", "reason_tags": []},
+]
+
+
+def test_company_patch_recounts_counts_reasons_and_name_keys():
+    signals = CompanySignals(
+        interaction_counts={"c2": {"like": 0, "dislike": 4}},
+        ratings={"c1": 3.5},
+        company_names=[("c1", "acme"), ("c2", "globex")],
+    )
+    patched = signals.with_company("c1", interactions=INTERACTIONS, reputation=71.2)
+
+    assert patched.interaction_stats["c1"] == {"like": 2, "dislike": 1}
+    assert patched.interaction_stats["acme"] == {"like": 2, "dislike": 1}
+    assert patched.reason_stats["acme"] == {"like": {"Great company culture": 2, "Excellent benefits": 1}, "dislike": {}}
+    assert patched.reputation_scores(["c1", "c2", None]) == {"c1": 71.2}
+    # The old snapshot is untouched
+    assert "c1" not in signals.interaction_stats
+
+    removed = patched.with_company("c1", interactions=[]).with_company("c1", rating=0.0, set_rating=True)
+    assert "c1" not in removed.interaction_stats and "acme" not in removed.interaction_stats
+    assert "c1" not in removed.reason_stats
+    assert removed.ratings == {}
+    assert removed.interaction_stats["globex"] == {"like": 0, "dislike": 4}
+
+
+def test_company_patches_match_a_rebuild_and_share_other_companies():
+    names = [("c1", "acme"), ("c2", "acme"), ("c3", "c1"), ("c4", "initech")]
+    counts = {f"c{i}": {"like": i, "dislike": 0} for i in range(2, 5)}
+    signals = CompanySignals(interaction_counts=counts, company_names=names)
+
+    patched = signals
+    for company_id, interactions in [("c1", INTERACTIONS), ("c2", []), ("c3", INTERACTIONS[:1]), ("c1", [])]:
+        patched = patched.with_company(company_id, interactions=interactions)
+        counts = dict(patched.interaction_counts)
+        rebuilt = CompanySignals(interaction_counts=counts, reason_counts=patched.reason_counts, company_names=names)
+        assert dict(patched.interaction_stats) == rebuilt.interaction_stats
+        assert dict(patched.reason_stats) == rebuilt.reason_stats
+        assert len(patched.interaction_stats) == len(rebuilt.interaction_stats)
+
+    assert patched.interaction_stats["initech"] is signals.interaction_stats["initech"]
+    assert patched == CompanySignals(interaction_counts=counts, reason_counts=dict(patched.reason_counts),
+                                     company_names=names)
+
+
+def test_store_replays_writes_made_during_a_reconcile():
+    loading = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        loading.set()
+        release.wait(5)
+        # Read from Mongo before the write below landed
+        return CompanySignals(interaction_counts={"c1": {"like": 1, "dislike": 0}})
+
+    store = CompanySignalStore(loader=lambda: CompanySignals(), ttl=60)
+    assert store.snapshot().interaction_stats == {}
+
+    store._loader = loader
+    worker = threading.Thread(target=store.reconcile)
+    worker.start()
+    loading.wait(5)
+    store.apply_interactions("c1", INTERACTIONS, reputation=60.0)
+    store.apply_rating("c1", 4.25)
+    release.set()
+    worker.join(5)
+
+    snap = store.snapshot()
+    assert snap.interaction_stats["c1"] == {"like": 2, "dislike": 1}
+    assert snap.ratings == {"c1": 4.25}
+    assert snap.reputation == {"c1": 60.0}
+    assert store.stats()["loads"] == 2
+
+
+def test_store_keeps_snapshot_when_reload_fails():
+    store = CompanySignalStore(loader=lambda: CompanySignals(ratings={"c1": 4.0}), ttl=60)
+    assert store.snapshot().ratings == {"c1": 4.0}
+
+    def broken():
+        raise RuntimeError("down")
+
+    store._loader = broken
+    assert store.reconcile() is False
+    assert store.snapshot().ratings == {"c1": 4.0}
+    assert store.stats()["failures"] == 1
+
+
+def test_reconciled_version_moves_only_on_reconcile():
+    store = CompanySignalStore(loader=lambda: CompanySignals(), ttl=60)
+    store.snapshot()
+    settled = store.reconciled_version
+
+    store.apply_rating("c1", 4.0)
+    assert store.snapshot().ratings == {"c1": 4.0}
+    assert store.reconciled_version == settled
+
+    # The reload agrees with the patched snapshot, but entries keyed before the patch are stale
+    store._loader = lambda: CompanySignals(ratings={"c1": 4.0})
+    store.reconcile()
+    assert store.reconciled_version == settled + 1
+    store.reconcile()
+    assert store.reconciled_version == settled + 1
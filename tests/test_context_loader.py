@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import time
+
+from app.utils.context_loader import load_concurrently
+
+
+def _sleep_then(value, seconds=0.2):
+    def run():
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_queries_run_concurrently_with_timings():
+    start = time.perf_counter()
+    results, timings = load_concurrently({"a": _sleep_then(1), "b": _sleep_then(2), "c": _sleep_then(3)})
+    elapsed = time.perf_counter() - start
+
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert elapsed < 0.5
+    assert all(t is not None and t >= 0.15 for t in timings.values())
+
+
+def test_failed_and_timed_out_queries_use_defaults():
+    def boom():
+        raise RuntimeError("down")
+
+    results, timings = load_concurrently(
+        {"ok": lambda: "x", "bad": boom, "slow": _sleep_then("late", 1.0)},
+        defaults={"bad": {}, "slow": []},
+        timeout=0.2,
+    )
+    assert results == {"ok": "x", "bad": {}, "slow": []}
+    assert timings["bad"] is None and timings["slow"] is None
+    assert timings["ok"] is not None
@@ -23,4 +23,48 @@ def test_distance_sanity_delhi_jaipur():
 
 
 def test_normalization_aliases():
-    assert normalize_city_name("Bombay") in ("mumbai",)
\ No newline at end of file
+    assert normalize_city_name("Bombay") in ("mumbai",)
+
+def test_matrix_lookup_matches_haversine():
+    from app.core import distance_matrix
+
+    for a, b in [("mumbai", "pune"), ("delhi", "jaipur"), ("chennai", "kolkata")]:
+        assert get_distance(a, b) == distance_matrix.haversine_km(CITY_COORDINATES[a], CITY_COORDINATES[b])
+        assert get_distance(a, b) == get_distance(b, a)
+
+
+def test_stale_matrix_falls_back_to_haversine(tmp_path, monkeypatch):
+    import json
+
+    import numpy as np
+
+    from app.core import distance_matrix
+
+    matrix_path = tmp_path / "city_distances.npy"
+    np.save(matrix_path, np.zeros((2, 2), dtype=np.uint16))
+    (tmp_path / "city_distances.json").write_text(json.dumps({"cities": ["mumbai", "pune"]}))
+    monkeypatch.setattr(distance_matrix, "DISTANCE_MATRIX_PATH", str(matrix_path))
+    monkeypatch.setattr(distance_matrix, "DISTANCE_INDEX_PATH", str(tmp_path / "city_distances.json"))
+    monkeypatch.setattr(distance_matrix, "_matrix_loaded", False)
+    monkeypatch.setattr(distance_matrix, "_matrix", None)
+    monkeypatch.setattr(distance_matrix, "CITY_INDEX", {})
+
+    assert distance_matrix._load_distance_matrix() is None
+    assert get_distance("Mumbai", "Pune") == distance_matrix.haversine_km(CITY_COORDINATES["mumbai"], CITY_COORDINATES["pune"])
+
+
+def test_accent_folded_and_alias_resolution():
+    assert normalize_city_name("Thane") == normalize_city_name("thāne") == "thāne"
+    assert normalize_city_name("Rajkot") == "rājkot"
+    assert normalize_city_name("Gurgaon") == normalize_city_name("Gurugram") == "gurugram"
+    assert normalize_city_name("New Delhi") == "delhi"
+    assert get_distance("Thane", "Mumbai") < 50
+
+
+def test_fuzzy_city_resolver():
+    from app.core.distance_matrix import resolve_city_name
+
+    assert resolve_city_name("Hydrabad") == "hyderabad"
+    assert resolve_city_name("Banglore") == "bengaluru"
+    assert resolve_city_name("Pune") == "pune"
+    assert resolve_city_name("Atlantis") is None
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+from app.core.feature_store import InternshipFeatureStore, compile_internship_features
+from app.utils.catalog_snapshot import InternshipProjection
+
+
+def test_compile_internship_features_derives_scoring_fields():
+    f = compile_internship_features({
+        "internship_id": "I1",
+        "title": "Junior Data Intern",
+        "organization": "OrgA",
+        "location": "Bombay, Maharashtra",
+        "sector": " Data ",
+        "skills_required": ["Python", ["SQL", "python"]],
+        "description": "Mentorship from senior analysts",
+        "duration": "3 months",
+        "stipend": 12000,
+    })
+
+    assert f.key == "I1"
+    assert f.org == "orga"
+    assert f.company_key == "OrgA"
+    assert f.skills == ("python", "sql")
+    assert f.city == "mumbai"
+    assert f.sector == "data"
+    assert f.duration_bucket == "medium"
+    assert f.complexity == "basic"
+    assert f.learning is True
+    assert f.work_type == "onsite"
+    assert f.seniority == "junior"
+
+
+def test_feature_store_recompiles_only_changed_internships():
+    store = InternshipFeatureStore()
+    doc = {"internship_id": "I1", "location": "Pune", "skills_required": ["Python"]}
+
+    first = store.get(doc)
+    assert store.get(dict(doc)) is first
+
+    changed = dict(doc, location="Delhi")
+    assert store.get(changed).city == "delhi"
+    assert store.compiled == 2
+
+    store.sync([])
+    assert store.stats()["records"] == 0
+
+
+
+def test_sync_of_projection_hydrates_only_new_or_changed_internships():
+    full = {"internship_id": "I1", "skills_required": ["Python"], "description": "Mentorship", "updated_at": 1}
+    projection = InternshipProjection((k, v) for k, v in full.items() if k != "description")
+    hydrated = []
+
+    def hydrate(keys):
+        hydrated.append(list(keys))
+        return [full]
+
+    store = InternshipFeatureStore()
+    store.sync([projection], hydrate=hydrate)
+    assert hydrated == [["I1"]]
+    assert store.get(projection).learning is True
+
+    store.sync([projection], hydrate=hydrate)
+    assert hydrated == [["I1"]] and store.compiled == 1
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import math
+
+import pytest
+
+from app.core.distance_matrix import get_distance
+from app.core.location_affinity import LocationAffinityField, location_affinity_field
+
+
+def _decay(d):
+    # The field is computed with np.exp, which may differ from math.exp in the last bit
+    return pytest.approx(math.exp(-0.6931471805599453 * d / 150.0), rel=1e-15)
+
+
+def test_field_is_max_decay_to_nearest_liked_city():
+    field = LocationAffinityField(["mumbai", "delhi"], ["pune"])
+
+    like, dislike = field.affinity("thāne")
+    assert like == _decay(min(get_distance("mumbai", "thāne"), get_distance("delhi", "thāne")))
+    assert dislike == _decay(get_distance("pune", "thāne"))
+    assert field.affinity("mumbai")[0] == 1.0
+    assert field.affinity("") == (0.0, 0.0)
+
+
+def test_unknown_cities_are_1000_km_away():
+    field = LocationAffinityField(["remote"], [])
+
+    assert field.affinity("remote") == (1.0, 0.0)
+    assert field.affinity("pune") == (_decay(1000.0), 0.0)
+    assert LocationAffinityField([], []).affinity("pune") == (0.0, 0.0)
+
+
+def test_fields_are_shared_per_location_set():
+    assert location_affinity_field(["pune", "mumbai"], []) is location_affinity_field(["mumbai", "pune"], [])
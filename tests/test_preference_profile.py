@@ -1,6 +1,26 @@
 #!/usr/bin/env python3
 
-from app.utils.preference_profile import build_personal_preference_profile
+import threading
+
+from app.utils import preference_profile
+from app.utils.preference_profile import build_personal_preference_profile, load_personal_preference_profile
+
+
+class _SlowProfiles:
+    def __init__(self, release):
+        self.release = release
+        self.queries = 0
+
+    def find_one(self, query):
+        self.queries += 1
+        self.release.wait(5)
+        return {"candidate_id": query["candidate_id"], "work_type": {"remote": 1.0}}
+
+
+class _Db(dict):
+    def __init__(self, name, release):
+        super().__init__(personal_preference_profiles=_SlowProfiles(release))
+        self.name = name
 
 
 def test_preference_profile_learns_work_type_and_seniority():
@@ -47,3 +67,28 @@ def test_preference_profile_learns_work_type_and_seniority():
     pref_skills = dict(profile["skills"]["preferred"])
     assert "python" in pref_skills
     assert "sql" in pref_skills
+
+
+def test_concurrent_profile_loads_share_a_query_per_database_and_get_copies():
+    release = threading.Event()
+    dbs = [_Db("a", release), _Db("b", release)]
+    coalesced = preference_profile._profile_flight.coalesced
+    results = []
+    threads = [
+        threading.Thread(target=lambda db=db: results.append((db.name, load_personal_preference_profile(db, "c1"))))
+        for db in dbs + dbs
+    ]
+    for t in threads:
+        t.start()
+    while preference_profile._profile_flight.coalesced < coalesced + 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    # One query per database, not one shared across databases
+    assert [db["personal_preference_profiles"].queries for db in dbs] == [1, 1]
+    profiles = [p for _, p in results]
+    assert len(profiles) == 4 and all(p == profiles[0] for p in profiles)
+    profiles[0]["work_type"]["remote"] = 0.0
+    assert all(p["work_type"]["remote"] == 1.0 for p in profiles[1:])
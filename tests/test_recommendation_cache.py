@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+from app.utils.recommendation_cache import RecommendationCache
+
+
+def _payload(n):
+    return {"candidate_id": "c1", "recommendations": [{"internship_id": f"i{i}", "match_score": 50.0} for i in range(n)]}
+
+
+def test_hits_misses_and_candidate_invalidation():
+    cache = RecommendationCache(max_bytes=1_000_000, ttl=60)
+    key = ("c1", 10, 0.0, True, 1, 1)
+    assert cache.get(key) is None
+
+    started = cache.begin()
+    assert cache.put(key, _payload(3), tags=("c1", "oid-1"), started=started)
+    assert cache.get(key)["recommendations"][0]["internship_id"] == "i0"
+
+    # Invalidation through any of the candidate's ids drops the entry
+    cache.invalidate_candidate("oid-1")
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_result_computed_across_a_write_is_not_cached():
+    cache = RecommendationCache(max_bytes=1_000_000, ttl=60)
+    key = ("c1", 10, 0.0, True, 1, 1)
+    started = cache.begin()
+    cache.invalidate_candidate("c1")  # write lands while the ranking is computed
+    assert cache.put(key, _payload(3), tags=("c1",), started=started) is False
+    assert cache.get(key) is None
+
+    assert cache.put(key, _payload(3), tags=("c1",), started=cache.begin())
+    assert cache.get(key) is not None
+
+
+def test_lru_is_bounded_by_payload_size():
+    one = len(str(_payload(20)))
+    cache = RecommendationCache(max_bytes=int(one * 2.5), ttl=60)
+    for c in ("a", "b", "c"):
+        cache.put((c,), _payload(20), tags=(c,), started=cache.begin())
+    stats = cache.stats()
+    assert stats["bytes"] <= cache.max_bytes
+    assert stats["evictions"] >= 1
+    assert cache.get(("c",)) is not None
+
+
+def test_expired_entries_are_recomputed():
+    cache = RecommendationCache(max_bytes=1_000_000, ttl=0)
+    cache.put(("c1",), _payload(1), tags=("c1",), started=cache.begin())
+    assert cache.get(("c1",)) is None
+
+
+def test_changed_since_reports_invalidations_after_a_tick():
+    cache = RecommendationCache(max_bytes=1024, ttl=60)
+    started = cache.begin()
+    assert not cache.changed_since(['c1', 'CAND_1'], started)
+
+    cache.invalidate_candidate('CAND_1')
+    assert cache.changed_since(['c1', 'CAND_1'], started)
+    assert not cache.changed_since(['c2'], started)
+    assert not cache.changed_since(['CAND_1'], cache.begin())
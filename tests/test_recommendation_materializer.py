@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+from pymongo import DeleteMany, UpdateOne
+
+from app.utils.recommendation_materializer import build_recommendation_rows, save_recommendation_rows
+
+
+class _Collection:
+    def __init__(self):
+        self.calls = []
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append((ops, ordered))
+
+
+def test_rows_are_upserted_in_one_bulk_write_and_stale_rows_removed():
+    recs = [
+        {"internship_id": "i1", "match_score": 81.234},
+        {"internship_id": "i2", "match_score": 40},
+        {"internship_id": "i1", "match_score": 10.0},  # duplicate id: first score wins
+        {"internship_id": None, "match_score": 99.0},
+    ]
+    rows = build_recommendation_rows("c1", recs)
+    assert [(r["internship_id"], r["match_score"]) for r in rows] == [("i1", 81.23), ("i2", 40.0)]
+
+    coll = _Collection()
+    assert save_recommendation_rows({"recommendations": coll}, "c1", rows) == 2
+    (ops, ordered), = coll.calls
+    assert ordered is False
+    assert ops[0] == UpdateOne({"candidate_id": "c1", "internship_id": "i1"}, {"$set": rows[0]}, upsert=True)
+    assert ops[-1] == DeleteMany({"candidate_id": "c1", "internship_id": {"$nin": ["i1", "i2"]}})
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+from app.core.candidate_context import compile_candidate_context
+from app.core.feature_store import feature_store
+from app.core.retrieval import RetrievalIndex, retrieve_candidates
+
+
+def _catalog():
+    docs = []
+    for n in range(40):
+        docs.append({
+            "internship_id": f"R{n:03d}",
+            "title": "Intern",
+            "organization": f"Org{n}",
+            "location": "Mumbai" if n % 4 == 0 else "Kolkata",
+            "sector": "Data" if n % 5 == 0 else "Finance",
+            "skills_required": ["Python", "SQL"] if n % 3 == 0 else ["Excel"],
+        })
+    return docs
+
+
+def test_pool_is_bounded_and_prefers_matching_rows():
+    catalog = _catalog()
+    features = feature_store.features_for(catalog)
+    ctx = compile_candidate_context({"skills_possessed": ["python"], "location_preference": "Mumbai"},
+                                    {f.key: f for f in features})
+
+    rows = RetrievalIndex(features).candidate_rows(ctx, pool_size=10, always_include=["R001"])
+
+    assert len(rows) == 10
+    assert rows == sorted(rows)
+    assert 1 in rows  # always included even without matching signals
+    # Mumbai + python rows (n % 12 == 0) carry the highest partial scores
+    assert {0, 12, 24, 36} <= set(rows)
+
+
+def test_small_catalog_is_returned_unchanged():
+    catalog = _catalog()
+    ctx = compile_candidate_context({"skills_possessed": ["python"]})
+    assert retrieve_candidates(catalog, ctx, pool_size=100) == catalog
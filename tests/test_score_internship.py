@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from app.core.feature_store import feature_store
+from app.core.ml_model import get_recommendations, score_internship, score_internships
+
+
+CATALOG = [
+    {"internship_id": "I1", "title": "Junior Data Intern", "organization": "OrgA", "company_id": "C1",
+     "location": "Mumbai", "sector": "Data", "skills_required": ["Python", "SQL"], "stipend": 15000},
+    {"internship_id": "I2", "title": "Senior ML Intern", "organization": "OrgB", "company_id": "C2",
+     "location": "Pune", "sector": "Technology", "skills_required": ["Python", "Docker"], "stipend": 25000},
+    {"internship_id": "I3", "title": "Marketing Intern", "organization": "OrgC",
+     "location": "Remote", "sector": "Marketing", "skills_required": ["Communication"], "stipend": 5000},
+]
+
+
+CANDIDATE = {"skills_possessed": ["python", "sql"], "sector_interests": ["data"], "location_preference": "Mumbai"}
+
+
+def _kwargs():
+    return dict(
+        company_ratings={"C1": 4.5},
+        company_interaction_stats={"C2": {"like": 0, "dislike": 3}},
+        company_reputation={"C1": 75.0},
+        internship_interactions={
+            "I2": {"type": "like", "reason_tags": ["Skills match well"]},
+            "I3": {"type": "dislike", "reason_tags": ["Low stipend"]},
+        },
+    )
+
+
+def test_single_internship_score_matches_its_ranked_row():
+    candidate, kwargs = CANDIDATE, _kwargs()
+    ranked = get_recommendations(candidate, CATALOG, top_n=None, min_score=0.0, dedupe_org=False, **kwargs)
+    interacted = {doc["internship_id"]: feature_store.get(doc) for doc in CATALOG[1:]}
+
+    for row in ranked:
+        target = next(doc for doc in CATALOG if doc["internship_id"] == row["internship_id"])
+        assert score_internship(candidate, target, interacted_features=interacted, **kwargs) == row
+
+
+def test_batch_scores_keep_request_order_on_both_engines():
+    interacted = {doc["internship_id"]: feature_store.get(doc) for doc in CATALOG[1:]}
+    targets = [CATALOG[2], CATALOG[0], CATALOG[1]]
+    expected = [score_internship(CANDIDATE, doc, interacted_features=interacted, **_kwargs()) for doc in targets]
+
+    for engine in ("loop", "vectorized"):
+        rows = score_internships(CANDIDATE, targets, interacted_features=interacted, engine=engine, **_kwargs())
+        assert rows == expected
+    assert [row["internship_id"] for row in expected] == ["I3", "I1", "I2"]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+from app.core.feature_store import feature_store
+from app.core.ml_model import get_recommendations
+from app.core.similar_internships import (
+    SIMILARITY_WEIGHTS, SimilarInternshipIndex, pseudo_candidate, similarity_context,
+)
+
+
+def _catalog():
+    cities = ["Mumbai", "Pune", "Delhi", "Bangalore", "Remote"]
+    sectors = ["Data", "Technology", "Marketing"]
+    skills = [["Python", "SQL"], ["Python", "Docker"], ["Excel", "SQL"], ["Communication"], ["Java", "Git"]]
+    return [
+        {"internship_id": f"I{n}", "_id": f"oid{n}", "title": f"Intern {n}", "organization": f"Org{n % 7}",
+         "location": cities[n % 5], "sector": sectors[n % 3], "skills_required": skills[(n * 3) % 5]}
+        for n in range(40)
+    ]
+
+
+def _ranked(base, internships, k):
+    pool = [i for i in internships if i["internship_id"] != base["internship_id"]]
+    recs = get_recommendations(pseudo_candidate(base), pool, top_n=k, context=similarity_context(base),
+                               **SIMILARITY_WEIGHTS)
+    return [(r["internship_id"], r["match_score"]) for r in recs]
+
+
+def _lists(index, internships):
+    return {i["internship_id"]: [(n["internship_id"], n["match_score"]) for n in index.neighbors(i["internship_id"])["neighbors"]]
+            for i in internships}
+
+
+def test_neighbor_lists_match_on_demand_ranking():
+    catalog = _catalog()
+    index = SimilarInternshipIndex(k=5)
+    index.refresh(catalog, feature_store.sync(catalog), version=1)
+
+    for base in catalog:
+        assert _lists(index, [base])[base["internship_id"]] == _ranked(base, catalog, 5)
+    assert index.neighbors("I3")["title"] == "Intern 3"
+
+
+def test_edit_recomputes_only_affected_lists():
+    catalog = _catalog()
+    index = SimilarInternshipIndex(k=5)
+    index.refresh(catalog, feature_store.sync(catalog), version=1)
+
+    edited = [dict(i) for i in catalog if i["internship_id"] != "I39"]
+    edited[4] = {**edited[4], "location": "Delhi", "skills_required": ["Python", "SQL", "Docker"]}
+    features = feature_store.sync(edited)
+    updated, removed, full = index.refresh(edited, features, version=2)
+
+    rebuilt = SimilarInternshipIndex(k=5)
+    rebuilt.refresh(edited, features, version=2)
+    assert not full and removed == ["I39"]
+    assert "I4" in updated and len(updated) < len(edited)
+    assert _lists(index, edited) == _lists(rebuilt, edited)
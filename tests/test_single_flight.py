@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import threading
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(group, key, fn, callers):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight('test')
+    release = threading.Event()
+    runs = []
+
+    def load():
+        runs.append(1)
+        release.wait(5)
+        return {'value': len(runs)}
+
+    threads, results, errors = _run_concurrently(group, 'k', load, 5)
+    while group.coalesced < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(runs) == 1 and not errors
+    assert all(r is results[0] for r in results)
+    assert group.stats()['executions'] == 1 and group.stats()['coalesced'] == 4
+    assert group.stats()['in_flight'] == 0
+
+    # Nothing is cached once the execution is over
+    assert group.do('k', lambda: 'again') == 'again'
+    assert group.do('other', lambda: 'other') == 'other'
+
+
+def test_waiters_get_the_leaders_exception():
+    group = SingleFlight('test')
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError('db down')
+
+    threads, results, errors = _run_concurrently(group, 'k', fail, 3)
+    while group.coalesced < 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert not results and len(errors) == 3
+    assert group.stats()['errors'] == 1
+    with pytest.raises(ValueError):
+        group.do('k', lambda: (_ for _ in ()).throw(ValueError('next call runs again')))
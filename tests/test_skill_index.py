@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+from app.core.ml_model import skill_similarity
+from app.core.skill_index import CandidateSkills, SkillMatrix, SkillVocabulary
+
+
+def test_skill_matrix_coverage_matches_skill_similarity():
+    rows = [
+        ("python", "sql"),
+        ("machine learning", "deep learning", "tensorflow"),
+        ("react.js", "node.js", "javascript"),
+        ("excel",),
+        (),
+    ]
+    vocab = SkillVocabulary()
+    matrix = SkillMatrix(rows, vocab)
+    size = len(vocab)
+
+    for cand in ({"python"}, {"react", "sql"}, {"learning", "excel", "java"}, set()):
+        coverage = matrix.coverage(cand).tolist()
+        assert coverage == [skill_similarity(cand, list(r)) for r in rows]
+    # Candidate skills are matched per call, never interned
+    assert len(vocab) == size
+
+
+def test_candidate_skills_coverage_matches_skill_similarity():
+    vocab = SkillVocabulary()
+    vocab.add_many(["python", "sql"])
+    cand = {"react", "sql", "learning", "pythonic"}
+    skills = CandidateSkills(cand, vocab)
+
+    # Later stacks bring skills the vocabulary has not seen yet
+    for stack in [("python", "sql"), ("react.js", "node.js"), ("deep learning", "sql", "sql"), ()]:
+        assert skills.coverage(stack) == skill_similarity(cand, list(stack))
+    assert "pythonic" not in vocab.ids
+
+
+def test_vocabulary_extends_relations_for_new_terms():
+    vocab = SkillVocabulary()
+    vocab.add_many(["mysql", "data analysis"])
+    vocab.add_many(["sql", "data analytics"])
+
+    sql = vocab.id_of("sql")
+    assert vocab.id_of("mysql") in set(vocab.matches(sql).tolist())
+    # token overlap ("data") is symmetric
+    assert vocab.id_of("data analytics") in set(vocab.matches(vocab.id_of("data analysis")).tolist())
+    assert len(vocab) == 4
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import time
+
+from app.core.skill_synonyms import SkillSynonymStore, synonym_closure
+
+
+def test_synonym_closure_follows_chains():
+    closed = synonym_closure([("js", "javascript"), ("javascript", "ecmascript"), ("ml", "machine learning"),
+                              ("a", "b"), ("b", "a"), ("Py ", " Python")])
+    assert closed["js"] == "ecmascript"
+    assert closed["javascript"] == "ecmascript"
+    assert closed["ml"] == "machine learning"
+    assert closed["py"] == "python"
+    assert "a" not in closed and "b" not in closed
+
+
+def test_store_loads_lazily_and_swaps_on_new_stamp():
+    rows = [{"alias": "js", "canonical": "javascript"}]
+    stamp = [1]
+    calls = []
+    store = SkillSynonymStore(loader=lambda: list(rows), stamp=lambda: stamp[0], ttl=60)
+    store.subscribe(calls.append)
+    assert store.stats()["loaded"] is False
+
+    assert store.get("js") == "javascript"
+    assert calls == [1]
+
+    assert store.refresh() is False  # same stamp: no reload
+    assert store.loads == 1
+
+    rows.append({"alias": "py", "canonical": "python"})
+    stamp[0] = 2
+    assert store.refresh() is True
+    assert store.mapping() == {"js": "javascript", "py": "python"}
+    assert calls == [1, 2]
+
+
+def test_store_refreshes_in_background_after_ttl():
+    rows = [{"alias": "js", "canonical": "javascript"}]
+    store = SkillSynonymStore(loader=lambda: list(rows), stamp=None, ttl=0)
+    assert store.get("js") == "javascript"
+
+    rows[0] = {"alias": "js", "canonical": "ecmascript"}
+    store.mapping()  # expired: kicks off a refresh, keeps serving the old map
+    for _ in range(100):
+        if store.get("js") == "ecmascript":
+            break
+        time.sleep(0.01)
+    assert store.get("js") == "ecmascript"
+
+
+def test_failed_load_keeps_serving_previous_map():
+    rows = [{"alias": "js", "canonical": "javascript"}]
+
+    def loader():
+        if rows is None:
+            raise RuntimeError("down")
+        return rows
+
+    store = SkillSynonymStore(loader=loader, stamp=None, ttl=60)
+    assert store.get("js") == "javascript"
+    rows = None
+    assert store.refresh(force=True) is False
+    assert store.get("js") == "javascript"
+    assert store.failures == 1
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+from app.core.city_coords import CITY_COORDINATES
+from app.core.distance_matrix import get_distance, get_k_nearest_cities, get_nearby_cities
+from app.core.ml_model import find_nearest_city
+from app.core.spatial_index import CityGrid
+
+
+def _linear_nearby(city, max_distance):
+    pairs = [(other, get_distance(city, other)) for other in CITY_COORDINATES if other != city]
+    return sorted([p for p in pairs if p[1] <= max_distance], key=lambda x: x[1])
+
+
+def test_grid_radius_query_matches_linear_scan():
+    for city in ["pune", "delhi", "jaipur", "kochi"]:
+        for radius in [0.0, 30.0, 150.0]:
+            assert get_nearby_cities(city, radius) == _linear_nearby(city, radius)
+
+
+def test_k_nearest_cities():
+    nearest = get_k_nearest_cities("Mumbai", 5)
+    assert len(nearest) == 5
+    assert nearest == _linear_nearby("mumbai", float("inf"))[:5]
+    assert get_k_nearest_cities("Mumbai", 5, max_distance=nearest[2][1]) == nearest[:3]
+    assert get_k_nearest_cities("Atlantis", 5) == []
+
+
+def test_grid_nearest_visits_rings_until_covered():
+    grid = CityGrid([("a", (19.0, 72.8)), ("b", (18.5, 73.8)), ("c", (28.6, 77.2))], cell_deg=0.5)
+    rows, dist = grid.nearest(19.1, 72.9, k=2)
+    assert [grid.names[r] for r in rows] == ["a", "b"]
+    assert dist[0] < dist[1]
+
+
+def test_find_nearest_city_uses_distance_fallback():
+    cities = [{"name": "Delhi"}, {"name": "Pune"}, {"name": "Atlantis"}]
+    assert find_nearest_city("Khadki", cities) == ("Pune", round(get_distance("khadki", "pune"), 2))
+    assert find_nearest_city("Bombay", [{"name": "Mumbai"}]) == ("Mumbai", 0.0)
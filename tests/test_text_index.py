@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import math
+from collections import Counter
+
+from app.core.text_index import TextIndex, tokenize
+
+
+DOCS = [
+    {"internship_id": "I1", "title": "Machine Learning Intern", "description": "Train machine learning models in Python."},
+    {"internship_id": "I2", "title": "Data Analyst Intern", "description": "SQL dashboards and Python reports.",
+     "responsibilities": ["Build dashboards", "Clean data"]},
+    {"internship_id": "I3", "title": "Marketing Intern", "description": "Social media campaigns and content."},
+    {"internship_id": "I4", "title": "C++ Developer Intern", "description": "Low latency C++ services."},
+]
+
+
+def _dense_cosines(docs, query):
+    """Reference TF-IDF cosine (sublinear tf, smoothed idf) computed with plain dicts."""
+    bags = [Counter(tokenize(" ".join(str(d.get(f) or "") if not isinstance(d.get(f), list) else " ".join(d[f])
+                                      for f in ("title", "description", "responsibilities")))) for d in docs]
+    n = len(bags)
+    df = Counter(t for bag in bags for t in bag)
+    idf = {t: math.log((1 + n) / (1 + c)) + 1 for t, c in df.items()}
+
+    def vec(bag):
+        v = {t: (1 + math.log(c)) * idf[t] for t, c in bag.items() if t in idf}
+        norm = math.sqrt(sum(x * x for x in v.values())) or 1.0
+        return {t: x / norm for t, x in v.items()}
+
+    q = vec(Counter(tokenize(query)))
+    return {d["internship_id"]: sum(w * vec(bag).get(t, 0.0) for t, w in q.items()) for d, bag in zip(docs, bags)}
+
+
+def test_search_matches_dense_tfidf_cosine():
+    index = TextIndex()
+    assert index.sync(DOCS) == 4
+    expected = _dense_cosines(DOCS, "python machine learning")
+    results = index.search("python machine learning", k=3)
+
+    assert [key for key, _ in results] == ["I1", "I2"]
+    for key, score in results:
+        assert math.isclose(score, expected[key])
+    assert index.search("c++ services")[0][0] == "I4"
+    assert index.search("unknownword") == []
+
+
+def test_incremental_updates_match_a_fresh_build():
+    index = TextIndex()
+    index.sync(DOCS)
+    index.search("python")  # compile once before updating
+    edited = {**DOCS[2], "description": "Python automation for marketing data."}
+    assert index.upsert(edited) is True
+    assert index.upsert(edited) is False
+    assert index.remove("I4") is True
+
+    fresh = TextIndex()
+    fresh.sync([DOCS[0], DOCS[1], edited])
+    for query in ("python data", "marketing", "c++"):
+        assert index.search(query) == fresh.search(query)
+    assert index.similar("I3") == fresh.similar("I3")
+    assert "I3" not in [key for key, _ in index.similar("I3")]
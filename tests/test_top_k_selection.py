@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+from app.core.ml_model import get_recommendations
+
+
+def _internship(iid, org, skills):
+    return {"internship_id": iid, "title": "Intern", "organization": org, "location": "", "sector": "",
+            "skills_required": skills}
+
+
+def test_top_k_keeps_tie_break_and_org_dedupe():
+    catalog = [
+        _internship("I9", "OrgA", ["python"]),        # 100% skill fit
+        _internship("I3", "OrgB", ["python"]),        # same score, lower id
+        _internship("I1", "OrgA", ["python", "go"]),  # same org as I9, lower score
+        _internship("I2", "OrgC", ["python", "go"]),
+        _internship("I5", "OrgD", ["excel"]),         # 0 score
+    ]
+    candidate = {"skills_possessed": ["python"]}
+
+    for engine in ("loop", "vectorized"):
+        recs = get_recommendations(candidate, catalog, top_n=3, engine=engine)
+        assert [r["internship_id"] for r in recs] == ["I3", "I9", "I2"]
+
+        recs = get_recommendations(candidate, catalog, top_n=10, dedupe_org=False, engine=engine)
+        assert [r["internship_id"] for r in recs] == ["I3", "I9", "I1", "I2"]
+
+        recs = get_recommendations(candidate, catalog, top_n=None, min_score=40.0, engine=engine)
+        assert [r["internship_id"] for r in recs] == ["I3", "I9"]
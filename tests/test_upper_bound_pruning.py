@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import random
+
+from app.core import ml_model
+
+
+SKILLS = ["Python", "SQL", "Java", "Excel", "React", "Docker", "Marketing", "Figma", "Statistics", "Git"]
+CITIES = ["Mumbai", "Thane", "Pune", "Delhi", "Kolkata", "Chennai", ""]
+
+
+def _catalog(n=300, seed=3):
+    rng = random.Random(seed)
+    return [{
+        "internship_id": f"P{i:04d}",
+        "title": rng.choice(["Data Intern", "Junior Developer", "Marketing Intern"]),
+        "organization": f"Org{rng.randint(0, 60)}",
+        "location": rng.choice(CITIES),
+        "sector": rng.choice(["Data", "Technology", "Marketing"]),
+        "skills_required": rng.sample(SKILLS, rng.randint(1, 5)),
+        "is_beginner_friendly": rng.random() < 0.3,
+    } for i in range(n)]
+
+
+def test_pruned_top_n_matches_exhaustive_ranking(monkeypatch):
+    catalog = _catalog()
+    candidate = {"skills_possessed": ["python", "sql"], "sector_interests": ["data"],
+                 "location_preference": "Mumbai", "first_generation": True}
+
+    calls = []
+    original = ml_model._score_features
+
+    def counting(ctx, feat, signals):
+        calls.append(feat.key)
+        return original(ctx, feat, signals)
+
+    monkeypatch.setattr(ml_model, "_score_features", counting)
+
+    for dedupe in (True, False):
+        exhaustive = ml_model.get_recommendations(candidate, catalog, top_n=None, dedupe_org=dedupe, engine="loop")
+        calls.clear()
+        top = ml_model.get_recommendations(candidate, catalog, top_n=10, dedupe_org=dedupe, engine="loop")
+
+        assert top == exhaustive[:10]
+        assert len(calls) < len(catalog)